@@ -1,7 +1,7 @@
 import configparser
 from pathlib import Path
 from re import Pattern
-from typing import List
+from typing import List, Literal
 
 from environs import Env
 from pydantic import BaseModel, ConfigDict
@@ -15,8 +15,48 @@ class Config(BaseModel):
     )
 
     MAX_LABELS: int
+    EMBEDDING_INDEX_M: int
+    EMBEDDING_INDEX_EF_CONSTRUCTION: int
+    EMBEDDING_INDEX_PRECISION: Literal["full", "half", "binary"]
     ALLOWED_MIME_TYPES: List[str]
     MIME_TYPE_REGEX: Pattern[str] = r"(?i)^image/[a-z0-9\-+.]+$"
+    UPLOAD_CHUNK_SIZE: int
+
+    PAGE_SIZE: int
+    MAX_PAGE_SIZE: int
+    COLLECTION_PREVIEW_SIZE: int
+    BULK_MAX_SIZE: int
+
+    STORAGE_ROOT: Path
+    STORAGE_BACKEND: Literal["local", "sharded"]
+
+    DOWNLOAD_OFFLOAD: Literal["none", "x-accel-redirect", "x-sendfile"]
+    DOWNLOAD_OFFLOAD_PREFIX: str
+
+    JOB_BATCH_SIZE: int
+    JOB_MAX_ATTEMPTS: int
+    JOB_RETRY_DELAY: int
+    JOB_POLL_INTERVAL: float
+    JOB_STALE_TIMEOUT: int
+
+    NEAR_DUPLICATE_MAX_DISTANCE: int
+    SIMILAR_DEFAULT_LIMIT: int
+    SIMILAR_MAX_LIMIT: int
+    SIMILAR_EF_SEARCH: int
+    SIMILAR_RERANK_FACTOR: int
+    SIMILAR_BACKEND: Literal["pgvector", "numpy"]
+    EMBEDDING_INDEX_PATH: Path
+
+    EMBEDDING_ENABLED: bool
+    EMBEDDING_MODEL_PATH: Path
+    EMBEDDING_INPUT_SIZE: int
+    EMBEDDING_MAX_WAIT: float
+    EMBEDDING_THREADS: int
+
+    CACHE_BACKEND: str
+    CACHE_LOCATION: str
+    LABEL_FACETS_CACHE_TIMEOUT: int
+    SHARED_COLLECTIONS_CACHE_TIMEOUT: int
 
     SECRET_KEY: str
     ALLOWED_HOSTS: List[str]
@@ -32,7 +72,40 @@ def load_config(cfg_path: Path, env_path: Path = Path(".env")) -> Config:
 
     return Config(
         MAX_LABELS=parser.getint("models.image", "MAX_LABELS"),
+        EMBEDDING_INDEX_M=parser.getint("models.image_fingerprint", "EMBEDDING_INDEX_M"),
+        EMBEDDING_INDEX_EF_CONSTRUCTION=parser.getint("models.image_fingerprint", "EMBEDDING_INDEX_EF_CONSTRUCTION"),
+        EMBEDDING_INDEX_PRECISION=parser.get("models.image_fingerprint", "EMBEDDING_INDEX_PRECISION"),
         ALLOWED_MIME_TYPES=parser.get("upload", "ALLOWED_MIME_TYPES").split(","),
+        UPLOAD_CHUNK_SIZE=parser.getint("upload", "CHUNK_SIZE"),
+        PAGE_SIZE=parser.getint("api", "PAGE_SIZE"),
+        MAX_PAGE_SIZE=parser.getint("api", "MAX_PAGE_SIZE"),
+        COLLECTION_PREVIEW_SIZE=parser.getint("api", "COLLECTION_PREVIEW_SIZE"),
+        BULK_MAX_SIZE=parser.getint("api", "BULK_MAX_SIZE"),
+        STORAGE_ROOT=Path(parser.get("storage", "ROOT")),
+        STORAGE_BACKEND=parser.get("storage", "BACKEND"),
+        DOWNLOAD_OFFLOAD=parser.get("download", "OFFLOAD"),
+        DOWNLOAD_OFFLOAD_PREFIX=parser.get("download", "OFFLOAD_PREFIX"),
+        JOB_BATCH_SIZE=parser.getint("jobs", "BATCH_SIZE"),
+        JOB_MAX_ATTEMPTS=parser.getint("jobs", "MAX_ATTEMPTS"),
+        JOB_RETRY_DELAY=parser.getint("jobs", "RETRY_DELAY"),
+        JOB_POLL_INTERVAL=parser.getfloat("jobs", "POLL_INTERVAL"),
+        JOB_STALE_TIMEOUT=parser.getint("jobs", "STALE_TIMEOUT"),
+        NEAR_DUPLICATE_MAX_DISTANCE=parser.getint("search", "NEAR_DUPLICATE_MAX_DISTANCE"),
+        SIMILAR_DEFAULT_LIMIT=parser.getint("search", "SIMILAR_DEFAULT_LIMIT"),
+        SIMILAR_MAX_LIMIT=parser.getint("search", "SIMILAR_MAX_LIMIT"),
+        SIMILAR_EF_SEARCH=parser.getint("search", "SIMILAR_EF_SEARCH"),
+        SIMILAR_RERANK_FACTOR=parser.getint("search", "SIMILAR_RERANK_FACTOR"),
+        SIMILAR_BACKEND=parser.get("search", "SIMILAR_BACKEND"),
+        EMBEDDING_INDEX_PATH=Path(parser.get("search", "EMBEDDING_INDEX_PATH")),
+        EMBEDDING_ENABLED=parser.getboolean("embeddings", "ENABLED"),
+        EMBEDDING_MODEL_PATH=Path(parser.get("embeddings", "MODEL_PATH")),
+        EMBEDDING_INPUT_SIZE=parser.getint("embeddings", "INPUT_SIZE"),
+        EMBEDDING_MAX_WAIT=parser.getfloat("embeddings", "MAX_WAIT"),
+        EMBEDDING_THREADS=parser.getint("embeddings", "THREADS"),
+        CACHE_BACKEND=parser.get("cache", "BACKEND"),
+        CACHE_LOCATION=parser.get("cache", "LOCATION"),
+        LABEL_FACETS_CACHE_TIMEOUT=parser.getint("cache", "LABEL_FACETS_TIMEOUT"),
+        SHARED_COLLECTIONS_CACHE_TIMEOUT=parser.getint("cache", "SHARED_COLLECTIONS_TIMEOUT"),
         SECRET_KEY=env.str("SECRET_KEY"),
         ALLOWED_HOSTS=env.list("ALLOWED_HOSTS"),
         DB_URL=env.str("DB_URL")
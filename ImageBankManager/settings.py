@@ -60,6 +60,8 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.IsAuthenticatedOrReadOnly',
     ],
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
+    'DEFAULT_PAGINATION_CLASS': 'api.pagination.KeysetPagination',
+    'PAGE_SIZE': config.PAGE_SIZE,
 }
 
 SPECTACULAR_SETTINGS = {
@@ -74,9 +76,12 @@ SPECTACULAR_SETTINGS = {
 
 AUTHENTICATION_BACKENDS = [
   'django.contrib.auth.backends.ModelBackend',
-  'guardian.backends.ObjectPermissionBackend',
+  'api.services.permissions.backends.CollectionPermissionBackend',
 ]
 
+# Guardian's check looks for its own backend by path; CollectionPermissionBackend subclasses it.
+SILENCED_SYSTEM_CHECKS = ["guardian.W001"]
+
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -157,6 +162,27 @@ USE_TZ = True
 
 STATIC_URL = 'static/'
 
+# Uploaded image storage
+
+MEDIA_ROOT = BASE_DIR / config.STORAGE_ROOT
+
+# Memory-mapped embedding index used by the numpy similarity backend
+
+EMBEDDING_INDEX_PATH = BASE_DIR / config.EMBEDDING_INDEX_PATH
+
+# ONNX model computing image embeddings
+
+EMBEDDING_MODEL_PATH = BASE_DIR / config.EMBEDDING_MODEL_PATH
+
+# Cache
+
+CACHES = {
+    "default": {
+        "BACKEND": config.CACHE_BACKEND,
+        "LOCATION": config.CACHE_LOCATION,
+    }
+}
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
@@ -1,3 +1,56 @@
 from django.contrib import admin
+from django.contrib.auth.admin import UserAdmin
 
-# Register your models here.
+from api.models import Collection, Image, ImageDuplicate, ImageFingerprint, Job, UploadSession, User
+
+
+@admin.register(User)
+class ApiUserAdmin(UserAdmin):
+    list_display = ["username", "email", "full_name", "is_staff", "created_at"]
+    fieldsets = UserAdmin.fieldsets + (
+        ("Profile", {"fields": ["full_name"]}),
+    )
+
+
+@admin.register(Collection)
+class CollectionAdmin(admin.ModelAdmin):
+    list_display = ["__str__", "is_default", "created_at"]
+    list_select_related = ["owner"]
+    search_fields = ["name", "owner__username"]
+    raw_id_fields = ["owner"]
+
+
+@admin.register(Image)
+class ImageAdmin(admin.ModelAdmin):
+    list_display = ["__str__", "collection", "mime_type", "size_bytes", "created_at"]
+    list_select_related = ["owner", "collection__owner"]
+    search_fields = ["filename", "owner__username"]
+    raw_id_fields = ["owner", "collection"]
+
+
+@admin.register(ImageFingerprint)
+class ImageFingerprintAdmin(admin.ModelAdmin):
+    list_display = ["__str__", "sha256", "phash"]
+    list_select_related = ["image__owner"]
+    raw_id_fields = ["image"]
+    exclude = ["embedding"]
+
+
+@admin.register(ImageDuplicate)
+class ImageDuplicateAdmin(admin.ModelAdmin):
+    list_display = ["__str__", "created_at"]
+    list_select_related = ["original_image__owner"]
+    raw_id_fields = ["image", "original_image"]
+
+
+@admin.register(UploadSession)
+class UploadSessionAdmin(admin.ModelAdmin):
+    list_display = ["__str__", "collection", "created_at"]
+    list_select_related = ["owner", "collection__owner"]
+    raw_id_fields = ["owner", "collection"]
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ["__str__", "kind", "status", "attempts", "run_after"]
+    list_filter = ["kind", "status"]
@@ -0,0 +1 @@
+from .label_filter import LabelFilter
@@ -0,0 +1,52 @@
+from typing import Any, Dict, List
+
+from django.db.models import QuerySet
+from rest_framework.filters import BaseFilterBackend
+from rest_framework.request import Request
+
+
+class LabelFilter(BaseFilterBackend):
+    # labels=a,b keeps items carrying every listed label (labels @> '{a,b}'),
+    # labels_any=a,b keeps items carrying at least one of them (labels && '{a,b}').
+    # Both operators are served by the GIN index on labels.
+    all_param = "labels"
+    any_param = "labels_any"
+
+    @staticmethod
+    def _parse(request: Request, param: str) -> List[str]:
+        return [
+            label.strip()
+            for value in request.query_params.getlist(param)
+            for label in value.split(",")
+            if label.strip()
+        ]
+
+    def is_active(self, request: Request) -> bool:
+        return bool(self._parse(request, self.all_param) or self._parse(request, self.any_param))
+
+    def filter_queryset(self, request: Request, queryset: QuerySet, view: Any) -> QuerySet:
+        if labels := self._parse(request, self.all_param):
+            queryset = queryset.filter(labels__contains=labels)
+
+        if labels := self._parse(request, self.any_param):
+            queryset = queryset.filter(labels__overlap=labels)
+
+        return queryset
+
+    def get_schema_operation_parameters(self, view: Any) -> List[Dict[str, Any]]:
+        return [
+            {
+                "name": self.all_param,
+                "required": False,
+                "in": "query",
+                "description": "Comma-separated labels that must all be present.",
+                "schema": {"type": "string"},
+            },
+            {
+                "name": self.any_param,
+                "required": False,
+                "in": "query",
+                "description": "Comma-separated labels of which at least one must be present.",
+                "schema": {"type": "string"},
+            },
+        ]
@@ -0,0 +1,161 @@
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Deque, Iterator, List, Optional, Tuple
+
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from ImageBankManager.config import config
+from api.models import Image, ImageFingerprint
+from api.services.fingerprints.backfill import BackfillResult, fingerprint_files
+from api.services.storage import get_storage
+
+Checkpoint = Tuple[datetime, str]
+
+
+class Command(BaseCommand):
+    help = "Computes fingerprints for every image that does not have one yet, in parallel worker processes."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count() or 1,
+            help="Number of worker processes. Defaults to the number of CPU cores.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Number of images sent to a worker at once and written with one bulk insert.",
+        )
+        parser.add_argument(
+            "--max-in-flight",
+            type=int,
+            default=None,
+            help="Maximum number of batches queued or running at once, bounding memory. Defaults to twice the workers.",
+        )
+        parser.add_argument(
+            "--checkpoint",
+            type=Path,
+            default=None,
+            help="File recording the last (created_at, id) written, never past an image that failed. "
+                 "Resumes from it when it exists.",
+        )
+
+    def handle(self, *args, **options):
+        checkpoint_path: Optional[Path] = options["checkpoint"]
+        max_in_flight = options["max_in_flight"] or 2 * options["workers"]
+
+        checkpoint = self._read_checkpoint(checkpoint_path)
+        if checkpoint:
+            self.stdout.write(f"Resuming after {checkpoint[0].isoformat()} / {checkpoint[1]}.")
+
+        storage = get_storage()
+        in_flight: Deque[Tuple[Future, List[Checkpoint]]] = deque()
+        self.checkpoint_held = False
+        written = failed = 0
+        started = time.monotonic()
+
+        with ProcessPoolExecutor(max_workers=options["workers"]) as executor:
+            for batch in self._batches(checkpoint, options["batch_size"]):
+                if len(in_flight) >= max_in_flight:
+                    batch_written, batch_failed = self._drain(in_flight.popleft(), checkpoint_path)
+                    written += batch_written
+                    failed += batch_failed
+                    self._report(written, failed, started)
+
+                items = [
+                    (str(image_id), blob_id or stored_filename)
+                    for image_id, blob_id, stored_filename, _ in batch
+                ]
+                keys = [(created_at, str(image_id)) for image_id, _, _, created_at in batch]
+
+                future = executor.submit(fingerprint_files, storage, items, config.UPLOAD_CHUNK_SIZE)
+                in_flight.append((future, keys))
+
+            while in_flight:
+                batch_written, batch_failed = self._drain(in_flight.popleft(), checkpoint_path)
+                written += batch_written
+                failed += batch_failed
+                self._report(written, failed, started)
+
+        self.stdout.write(self.style.SUCCESS(f"Done: {written} fingerprints written, {failed} images failed."))
+
+    def _batches(self, checkpoint: Optional[Checkpoint], batch_size: int) -> Iterator[List[tuple]]:
+        images = (
+            Image.objects
+            .filter(fingerprint__isnull=True)
+            .order_by("created_at", "id")
+            .values_list("id", "blob_id", "stored_filename", "created_at")
+        )
+
+        while True:
+            page = images
+            if checkpoint:
+                created_at, image_id = checkpoint
+                page = page.filter(Q(created_at__gt=created_at) | Q(created_at=created_at, id__gt=image_id))
+
+            batch = list(page[:batch_size])
+            if not batch:
+                return
+
+            yield batch
+
+            last_id, _, _, last_created_at = batch[-1]
+            checkpoint = (last_created_at, str(last_id))
+
+    def _drain(self, entry: Tuple[Future, List[Checkpoint]], checkpoint_path: Optional[Path]) -> Tuple[int, int]:
+        future, keys = entry
+        results: List[BackfillResult] = future.result()
+
+        # Failed images get no row, so the next run selects them again.
+        fingerprints = [
+            ImageFingerprint(image_id=image_id, sha256=sha256, phash=phash)
+            for image_id, sha256, phash, error in results
+            if error is None
+        ]
+        for fingerprint in fingerprints:
+            fingerprint.set_phash_bands()
+        ImageFingerprint.objects.bulk_create(fingerprints, ignore_conflicts=True)
+
+        for image_id, _, _, error in results:
+            if error is not None:
+                self.stderr.write(f"Image {image_id}: {error}")
+
+        # Batches are drained in order, so once an image fails the checkpoint stays before it for the rest of the
+        # run and a resumed run selects it again.
+        if not self.checkpoint_held:
+            failed_at = next((index for index, (*_, error) in enumerate(results) if error is not None), len(keys))
+            if failed_at:
+                self._write_checkpoint(checkpoint_path, keys[failed_at - 1])
+            self.checkpoint_held = failed_at < len(keys)
+
+        return len(fingerprints), sum(error is not None for *_, error in results)
+
+    def _report(self, written: int, failed: int, started: float) -> None:
+        elapsed = time.monotonic() - started
+        self.stdout.write(f"{written} written, {failed} failed, {written / elapsed if elapsed else 0:.1f} images/s")
+
+    @staticmethod
+    def _read_checkpoint(path: Optional[Path]) -> Optional[Checkpoint]:
+        if path is None or not path.exists():
+            return None
+
+        data = json.loads(path.read_text())
+        return datetime.fromisoformat(data["created_at"]), data["id"]
+
+    @staticmethod
+    def _write_checkpoint(path: Optional[Path], checkpoint: Checkpoint) -> None:
+        if path is None:
+            return
+
+        created_at, image_id = checkpoint
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps({"created_at": created_at.isoformat(), "id": image_id}))
+        os.replace(tmp_path, path)
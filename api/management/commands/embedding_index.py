@@ -0,0 +1,56 @@
+from typing import Iterator, List, Tuple
+
+from django.core.management.base import BaseCommand
+
+from api.models import ImageFingerprint
+from api.services.embeddings import get_embedding_index
+
+
+class Command(BaseCommand):
+    help = "Maintains the memory-mapped embedding index used by the numpy similarity backend."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "action",
+            choices=["rebuild", "compact", "stats"],
+            help="rebuild: rewrite the index from the database; compact: drop deleted and superseded vectors; "
+                 "stats: print record counts.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=2000,
+            help="Number of embeddings read from the database at a time when rebuilding.",
+        )
+
+    def handle(self, *args, **options):
+        index = get_embedding_index()
+
+        if options["action"] == "rebuild":
+            index.rebuild(self._batches(options["batch_size"]))
+
+        elif options["action"] == "compact":
+            index.compact()
+
+        stats = ", ".join(f"{key}={value}" for key, value in index.stats().items())
+        self.stdout.write(f"{index.path}: {stats}")
+
+    @staticmethod
+    def _batches(batch_size: int) -> Iterator[List[Tuple]]:
+        embeddings = (
+            ImageFingerprint.objects
+            .filter(embedding__isnull=False)
+            .values_list("image_id", "embedding")
+            .iterator(chunk_size=batch_size)
+        )
+
+        batch = []
+        for item in embeddings:
+            batch.append(item)
+
+            if len(batch) == batch_size:
+                yield batch
+                batch = []
+
+        if batch:
+            yield batch
@@ -0,0 +1,22 @@
+from django.contrib.contenttypes.models import ContentType
+from django.core.management.base import BaseCommand
+from guardian.utils import get_group_obj_perms_model, get_user_obj_perms_model
+
+from api.models import Image
+
+
+class Command(BaseCommand):
+    help = (
+        "Deletes object permission rows stored on individual images. Image permissions are inherited from "
+        "their collection, so these rows are never consulted."
+    )
+
+    def handle(self, *args, **options):
+        content_type = ContentType.objects.get_for_model(Image)
+
+        deleted = 0
+        for model in [get_user_obj_perms_model(), get_group_obj_perms_model()]:
+            count, _ = model.objects.filter(content_type=content_type).delete()
+            deleted += count
+
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} image permission rows."))
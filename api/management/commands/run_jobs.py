@@ -0,0 +1,69 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from ImageBankManager.config import config
+from api.services.jobs.handlers import JOB_HANDLERS
+from api.services.jobs.queue import prune_done, queue_depth
+from api.services.jobs.worker import run_once
+
+
+class Command(BaseCommand):
+    help = "Processes queued background jobs, such as fingerprint computation."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--kind",
+            action="append",
+            choices=sorted(JOB_HANDLERS),
+            help="Only process jobs of this kind. May be repeated. Defaults to every kind.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=config.JOB_BATCH_SIZE,
+            help="Maximum number of jobs of one kind processed together.",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Process every job that is currently due, including partial batches, and exit.",
+        )
+        parser.add_argument(
+            "--stats",
+            action="store_true",
+            help="Print queue depth per kind and exit.",
+        )
+        parser.add_argument(
+            "--prune-done-older-than",
+            type=int,
+            metavar="SECONDS",
+            help="Delete jobs that finished more than SECONDS ago and exit.",
+        )
+
+    def handle(self, *args, **options):
+        kinds = options["kind"] or sorted(JOB_HANDLERS)
+
+        if options["stats"]:
+            for kind in kinds:
+                depth = ", ".join(f"{key}={value}" for key, value in queue_depth(kind).items())
+                self.stdout.write(f"{kind}: {depth}")
+            return
+
+        if options["prune_done_older_than"] is not None:
+            deleted = prune_done(timedelta(seconds=options["prune_done_older_than"]))
+            self.stdout.write(f"Deleted {deleted} finished jobs.")
+            return
+
+        while True:
+            processed = run_once(kinds, options["batch_size"], drain=options["once"])
+
+            if processed:
+                self.stdout.write(f"Processed {processed} jobs.")
+                continue
+
+            if options["once"]:
+                return
+
+            time.sleep(config.JOB_POLL_INTERVAL)
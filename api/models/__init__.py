@@ -1,3 +1,8 @@
 from .user import User
 from .collection import Collection
+from .stored_blob import StoredBlob
 from .image import Image
+from .image_fingerprint import ImageFingerprint
+from .image_duplicate import ImageDuplicate
+from .upload_session import UploadSession, UploadPart
+from .job import Job
@@ -1,11 +1,34 @@
 from typing import TYPE_CHECKING
 
+from django.contrib.postgres.expressions import ArraySubquery
+from django.contrib.postgres.indexes import GinIndex
 from django.core.exceptions import ValidationError
 from django.db import models
+from django.db.models.functions import Coalesce
 
+from ImageBankManager.config import config
 from api.models.abstract import HasLabels, HasOwner, HasUUID, TimeStampedModel
 
 
+class CollectionQuerySet(models.QuerySet):
+    def with_image_stats(self) -> "CollectionQuerySet":
+        from api.models.image import Image
+
+        images = Image.objects.filter(collection=models.OuterRef("pk")).order_by()
+
+        return self.annotate(
+            image_count=Coalesce(
+                models.Subquery(
+                    images.values("collection").annotate(count=models.Count("*")).values("count")
+                ),
+                0,
+            ),
+            recent_image_ids=ArraySubquery(
+                images.order_by("-created_at", "-id").values("id")[:config.COLLECTION_PREVIEW_SIZE]
+            ),
+        )
+
+
 class Collection(HasUUID, HasOwner, HasLabels, TimeStampedModel):
     name = models.CharField(
         max_length=64,
@@ -18,12 +41,25 @@ class Collection(HasUUID, HasOwner, HasLabels, TimeStampedModel):
         help_text="Indicates whether this is the user default selection. Managed by the system."
     )
 
+    objects = CollectionQuerySet.as_manager()
+
     if TYPE_CHECKING:
         from api.models.image import Image
         from django.db.models.fields.related_descriptors import RelatedManager
         images: RelatedManager[Image]
 
     class Meta:
+        indexes = [
+            models.Index(
+                fields=["created_at", "id"],
+                name="collection_created_at_id_idx"
+            ),
+            GinIndex(
+                fields=["labels"],
+                name="collection_labels_gin_idx"
+            ),
+        ]
+
         constraints = [
             models.UniqueConstraint(
                 fields=["owner"],
@@ -1,5 +1,7 @@
 import re
+import uuid
 
+from django.contrib.postgres.indexes import GinIndex
 from django.core.exceptions import ValidationError
 from django.db import models
 
@@ -23,6 +25,16 @@ class Image(HasUUID, HasOwner, HasLabels, TimeStampedModel):
         help_text="Internal filename used for storage. Managed by the system."
     )
 
+    blob = models.ForeignKey(
+        "StoredBlob",
+        on_delete=models.PROTECT,
+        null=True,
+        blank=True,
+        editable=False,
+        related_name="images",
+        help_text="Deduplicated content of this image. Managed by the system."
+    )
+
     filename = models.CharField(
         max_length=256,
         help_text="Original filename provided by the user at upload time."
@@ -37,23 +49,60 @@ class Image(HasUUID, HasOwner, HasLabels, TimeStampedModel):
         help_text="Size of the file in bytes."
     )
 
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["created_at", "id"],
+                name="image_created_at_id_idx"
+            ),
+            models.Index(
+                fields=["collection", "created_at", "id"],
+                name="image_collection_created_idx"
+            ),
+            GinIndex(
+                fields=["labels"],
+                name="image_labels_gin_idx"
+            ),
+        ]
+
     def __str__(self):
         return f"{self.filename} ({self.owner.username})"
 
+    @property
+    def storage_name(self) -> str:
+        # Images uploaded before content-addressed storage keep their per-image file.
+        return self.blob_id or self.stored_filename
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+
+        # Lets signal handlers tell which collection and labels the row had before it was changed.
+        instance._loaded_collection_id = instance.__dict__.get("collection_id")
+        instance._loaded_labels = list(instance.__dict__.get("labels") or [])
+
+        return instance
+
     def clean(self):
         self.mime_type = self.mime_type.lower()
         super().clean()
 
     def save(self, *args, **kwargs):
-        self.owner = self.collection.owner
-
+        self.set_managed_fields()
         self.full_clean()
 
-        ext = self.mime_type.removeprefix("image/")
-        self.stored_filename = f"{self.id}.{ext}"
-
         super().save(*args, **kwargs)
 
+    def set_managed_fields(self) -> None:
+        # Also called directly by bulk writes, which bypass save().
+        self.owner_id = self.collection.owner_id
+        self.stored_filename = self.build_stored_filename(self.id, self.mime_type)
+
+    @staticmethod
+    def build_stored_filename(image_id: uuid.UUID, mime_type: str) -> str:
+        ext = mime_type.lower().removeprefix("image/")
+        return f"{image_id}.{ext}"
+
     def _validate_mime_type(self):
         if not re.match(config.MIME_TYPE_REGEX, self.mime_type):
             raise ValidationError({"mime_type": "Invalid mime type format."})
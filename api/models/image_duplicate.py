@@ -27,4 +27,4 @@ class ImageDuplicate(TimeStampedModel):
         original_image: Image
 
     def __str__(self):
-        return f"Duplicate of {self.original_image} (image {self.image.id})"
+        return f"Duplicate of {self.original_image} (image {self.image_id})"
@@ -1,10 +1,50 @@
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any, List, Optional
 
+from django.contrib.postgres.indexes import OpClass
 from django.db import models
-from pgvector.django import VectorField
+from django.db.models.functions import Cast
+from pgvector.django import BitField, HalfVectorField, HnswIndex, VectorField
 
+from ImageBankManager.config import config
 from api.models.abstract import TimeStampedModel
 
+PHASH_BANDS = 4
+PHASH_BAND_BITS = 16
+PHASH_BAND_FIELDS = [f"phash_band_{index}" for index in range(PHASH_BANDS)]
+
+EMBEDDING_DIMENSIONS = 512
+
+
+class BinaryQuantize(models.Func):
+    function = "binary_quantize"
+    output_field = BitField(length=EMBEDDING_DIMENSIONS)
+
+
+def quantize_embedding(expression: Any, precision: str) -> Any:
+    # Queries must repeat this exact expression for PostgreSQL to use the quantized index.
+    if precision == "half":
+        return Cast(expression, HalfVectorField(dimensions=EMBEDDING_DIMENSIONS))
+
+    if precision == "binary":
+        return Cast(BinaryQuantize(expression), BitField(length=EMBEDDING_DIMENSIONS))
+
+    return expression
+
+
+def build_embedding_index(precision: str) -> HnswIndex:
+    options = {
+        "m": config.EMBEDDING_INDEX_M,
+        "ef_construction": config.EMBEDDING_INDEX_EF_CONSTRUCTION,
+        "name": "fingerprint_embedding_hnsw_idx",
+    }
+
+    if precision == "full":
+        return HnswIndex(fields=["embedding"], opclasses=["vector_cosine_ops"], **options)
+
+    # Quantized indexes hold a reduced copy of every vector while the column keeps full precision for re-ranking.
+    opclass = "halfvec_cosine_ops" if precision == "half" else "bit_hamming_ops"
+    return HnswIndex(OpClass(quantize_embedding(models.F("embedding"), precision), name=opclass), **options)
+
 
 class ImageFingerprint(TimeStampedModel):
     image = models.OneToOneField(
@@ -22,18 +62,82 @@ class ImageFingerprint(TimeStampedModel):
     )
 
     phash = models.BigIntegerField(
+        null=True,
         db_index=True,
-        help_text="Perceptual hash of the image, used for similarity comparison."
+        help_text="Perceptual hash of the image, used for similarity comparison. Computed after upload."
+    )
+
+    # Multi-index hashing: two hashes within Hamming distance r agree to within r // PHASH_BANDS bits on at least
+    # one band, so near-duplicate candidates can be found through ordinary B-tree lookups on the bands.
+    phash_band_0 = models.IntegerField(
+        null=True,
+        db_index=True,
+        editable=False,
+        help_text="Bits 63-48 of the perceptual hash. Managed by the system."
+    )
+
+    phash_band_1 = models.IntegerField(
+        null=True,
+        db_index=True,
+        editable=False,
+        help_text="Bits 47-32 of the perceptual hash. Managed by the system."
+    )
+
+    phash_band_2 = models.IntegerField(
+        null=True,
+        db_index=True,
+        editable=False,
+        help_text="Bits 31-16 of the perceptual hash. Managed by the system."
+    )
+
+    phash_band_3 = models.IntegerField(
+        null=True,
+        db_index=True,
+        editable=False,
+        help_text="Bits 15-0 of the perceptual hash. Managed by the system."
     )
 
     embedding = VectorField(
-        dimensions=512,
-        help_text="512-dimensional vector embedding representing the image features for similarity search."
+        dimensions=EMBEDDING_DIMENSIONS,
+        null=True,
+        help_text="512-dimensional vector embedding representing the image features for similarity search. "
+                  "Computed after upload."
     )
 
     if TYPE_CHECKING:
         from api.models.image import Image
         image: Image
 
+    class Meta:
+        indexes = [
+            build_embedding_index(config.EMBEDDING_INDEX_PRECISION),
+        ]
+
     def __str__(self):
-        return f"Fingerprint for {self.image.id} ({self.image})"
+        return f"Fingerprint for {self.image_id} ({self.image})"
+
+    @property
+    def phash_bands(self) -> List[Optional[int]]:
+        return [getattr(self, field) for field in PHASH_BAND_FIELDS]
+
+    def save(self, *args, **kwargs):
+        self.set_phash_bands()
+        super().save(*args, **kwargs)
+
+    def set_phash_bands(self) -> None:
+        # Bulk writes bypass save(), so they must call this themselves.
+        for field, band in zip(PHASH_BAND_FIELDS, self.split_phash(self.phash)):
+            setattr(self, field, band)
+
+    @staticmethod
+    def split_phash(phash: Optional[int]) -> List[Optional[int]]:
+        if phash is None:
+            return [None] * PHASH_BANDS
+
+        unsigned = phash & (2 ** (PHASH_BANDS * PHASH_BAND_BITS) - 1)
+        mask = 2 ** PHASH_BAND_BITS - 1
+
+        return [
+            (unsigned >> (PHASH_BAND_BITS * (PHASH_BANDS - 1 - index))) & mask
+            for index in range(PHASH_BANDS)
+        ]
@@ -0,0 +1,67 @@
+from django.db import models
+from django.utils import timezone
+
+from api.models.abstract import HasUUID, TimeStampedModel
+
+
+class Job(HasUUID, TimeStampedModel):
+    class Status(models.TextChoices):
+        PENDING = "pending"
+        RUNNING = "running"
+        DONE = "done"
+        FAILED = "failed"
+
+    kind = models.CharField(
+        max_length=64,
+        help_text="Name of the handler that processes this job."
+    )
+
+    payload = models.JSONField(
+        default=dict,
+        blank=True,
+        help_text="Handler-specific arguments of the job."
+    )
+
+    status = models.CharField(
+        max_length=16,
+        choices=Status.choices,
+        default=Status.PENDING,
+        help_text="Processing state of the job. Managed by the system."
+    )
+
+    attempts = models.PositiveIntegerField(
+        default=0,
+        help_text="Number of times a worker has picked up this job. Managed by the system."
+    )
+
+    run_after = models.DateTimeField(
+        default=timezone.now,
+        help_text="Earliest time at which the job may run. Pushed back after failed attempts."
+    )
+
+    locked_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="Timestamp when a worker claimed the job. Managed by the system."
+    )
+
+    last_error = models.TextField(
+        blank=True,
+        help_text="Error raised by the most recent failed attempt."
+    )
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["kind", "run_after"],
+                condition=models.Q(status="pending"),
+                name="job_pending_queue_idx"
+            ),
+            models.Index(
+                fields=["status"],
+                name="job_status_idx"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} job {self.id} ({self.status})"
@@ -0,0 +1,34 @@
+from typing import TYPE_CHECKING
+
+from django.db import models
+
+from api.models.abstract import TimeStampedModel
+
+
+class StoredBlob(TimeStampedModel):
+    sha256 = models.CharField(
+        max_length=64,
+        primary_key=True,
+        help_text="SHA-256 hash of the content. Also the name of the content in storage."
+    )
+
+    size_bytes = models.BigIntegerField(
+        help_text="Size of the content in bytes."
+    )
+
+    ref_count = models.PositiveIntegerField(
+        default=0,
+        help_text="Number of images referencing this content. Managed by the system."
+    )
+
+    if TYPE_CHECKING:
+        from api.models.image import Image
+        from django.db.models.fields.related_descriptors import RelatedManager
+        images: RelatedManager[Image]
+
+    @property
+    def storage_name(self) -> str:
+        return self.sha256
+
+    def __str__(self):
+        return f"{self.sha256} ({self.ref_count} references)"
@@ -0,0 +1,78 @@
+from typing import TYPE_CHECKING
+
+from django.core.validators import MaxValueValidator, MinValueValidator
+from django.db import models
+
+from api.models.abstract import HasLabels, HasOwner, HasUUID, TimeStampedModel
+
+
+class UploadSession(HasUUID, HasOwner, HasLabels, TimeStampedModel):
+    collection = models.ForeignKey(
+        "Collection",
+        on_delete=models.CASCADE,
+        related_name="upload_sessions",
+        help_text="Collection to which the uploaded image will belong."
+    )
+
+    filename = models.CharField(
+        max_length=256,
+        help_text="Original filename provided by the user at upload time."
+    )
+
+    mime_type = models.CharField(
+        max_length=100,
+        help_text="MIME type of the file."
+    )
+
+    if TYPE_CHECKING:
+        from api.models.collection import Collection
+        from django.db.models.fields.related_descriptors import RelatedManager
+        collection: Collection
+        parts: RelatedManager["UploadPart"]
+
+    def __str__(self):
+        return f"Upload of {self.filename} ({self.owner.username})"
+
+    def save(self, *args, **kwargs):
+        self.full_clean()
+        super().save(*args, **kwargs)
+
+
+class UploadPart(TimeStampedModel):
+    MAX_PARTS = 10000
+
+    session = models.ForeignKey(
+        "UploadSession",
+        on_delete=models.CASCADE,
+        related_name="parts",
+        help_text="Upload session to which this part belongs."
+    )
+
+    number = models.PositiveIntegerField(
+        validators=[MinValueValidator(1), MaxValueValidator(MAX_PARTS)],
+        help_text="1-based position of this part in the assembled file."
+    )
+
+    size_bytes = models.BigIntegerField(
+        help_text="Size of the part in bytes."
+    )
+
+    sha256 = models.CharField(
+        max_length=64,
+        help_text="SHA-256 hash of the part content."
+    )
+
+    if TYPE_CHECKING:
+        session: UploadSession
+
+    class Meta:
+        ordering = ["number"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["session", "number"],
+                name="unique_part_number_per_upload_session"
+            )
+        ]
+
+    def __str__(self):
+        return f"Part {self.number} of {self.session_id}"
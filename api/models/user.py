@@ -17,5 +17,13 @@ class User(AbstractUser, HasUUID, TimeStampedModel):
         images: RelatedManager[Image]
         collections: RelatedManager[Collection]
 
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            models.Index(
+                fields=["created_at", "id"],
+                name="user_created_at_id_idx"
+            ),
+        ]
+
     def __str__(self):
         return self.username
@@ -0,0 +1,179 @@
+import base64
+import binascii
+import json
+from collections import OrderedDict
+from typing import Any, List, Optional, Tuple
+
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured, ValidationError
+from django.db.models import Model, Q, QuerySet
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+from ImageBankManager.config import config
+
+# (field name, descending)
+OrderingKey = List[Tuple[str, bool]]
+
+
+class KeysetPagination(BasePagination):
+    # Pages by the values of the queryset's ordering fields, with the primary key appended as a tiebreaker,
+    # instead of by offset: every page is a range scan starting right after the previous page's last row.
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+    default_page_size = api_settings.PAGE_SIZE
+    max_page_size = config.MAX_PAGE_SIZE
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset: QuerySet, request: Request, view: Any = None) -> List[Model]:
+        self.request = request
+        self.page_size = self._get_page_size(request)
+        self.model = queryset.model
+        self.ordering = self._get_ordering(queryset, view)
+
+        position, reverse = self._decode_cursor(request)
+        if position is not None:
+            queryset = queryset.filter(self._after(position, reverse))
+
+        order_by = [f"{'-' if descending != reverse else ''}{name}" for name, descending in self.ordering]
+        page = list(queryset.order_by(*order_by)[:self.page_size + 1])
+
+        has_more = len(page) > self.page_size
+        page = page[:self.page_size]
+        if reverse:
+            page.reverse()
+
+        # Walking backwards always leaves a later page; walking forwards past a cursor always leaves an earlier one.
+        has_next, has_previous = (True, has_more) if reverse else (has_more, position is not None)
+
+        self.next_position = self._position(page[-1]) if page and has_next else None
+        self.previous_position = self._position(page[0]) if page and has_previous else None
+
+        return page
+
+    def get_paginated_response(self, data: Any) -> Response:
+        return Response(OrderedDict([
+            ("next", self.get_next_link()),
+            ("previous", self.get_previous_link()),
+            ("results", data),
+        ]))
+
+    def get_paginated_response_schema(self, schema: dict) -> dict:
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view: Any) -> List[dict]:
+        return [
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": "The pagination cursor value.",
+                "schema": {"type": "string"},
+            },
+            {
+                "name": self.page_size_query_param,
+                "required": False,
+                "in": "query",
+                "description": f"Number of results to return per page (at most {self.max_page_size}).",
+                "schema": {"type": "integer"},
+            },
+        ]
+
+    def get_next_link(self) -> Optional[str]:
+        return self._link(self.next_position, reverse=False)
+
+    def get_previous_link(self) -> Optional[str]:
+        return self._link(self.previous_position, reverse=True)
+
+    def _get_page_size(self, request: Request) -> int:
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+
+        except (KeyError, ValueError):
+            return self.default_page_size
+
+        return min(max(page_size, 1), self.max_page_size)
+
+    @staticmethod
+    def _get_ordering(queryset: QuerySet, view: Any) -> OrderingKey:
+        ordering = list(queryset.query.order_by or getattr(view, "ordering", None) or [])
+
+        if not all(isinstance(field, str) and "__" not in field for field in ordering):
+            raise ImproperlyConfigured("KeysetPagination only supports ordering by plain field or annotation names.")
+
+        key = [(field.lstrip("-"), field.startswith("-")) for field in ordering]
+
+        if not any(name in ("pk", queryset.model._meta.pk.name) for name, _ in key):
+            key.append(("pk", key[-1][1] if key else True))
+
+        return key
+
+    def _after(self, position: List[Any], reverse: bool) -> Q:
+        # Rows strictly after the position in ordering order: (a, b, c) > (x, y, z) expanded as
+        # a > x OR (a = x AND b > y) OR (a = x AND b = y AND c > z), each comparison following its field's direction.
+        condition = Q()
+
+        for index, (name, descending) in enumerate(self.ordering):
+            lookup = "lt" if descending != reverse else "gt"
+            equal = {prior: value for (prior, _), value in zip(self.ordering[:index], position)}
+            condition |= Q(**equal, **{f"{name}__{lookup}": position[index]})
+
+        # Redundant with the expansion, but gives the planner an index range bound on the leading field.
+        first, descending = self.ordering[0]
+        return condition & Q(**{f"{first}__{'lte' if descending != reverse else 'gte'}": position[0]})
+
+    def _position(self, instance: Model) -> List[Any]:
+        return [getattr(instance, name) for name, _ in self.ordering]
+
+    def _link(self, position: Optional[List[Any]], reverse: bool) -> Optional[str]:
+        if position is None:
+            return None
+
+        payload = json.dumps({
+            "o": [f"{'-' if descending else ''}{name}" for name, descending in self.ordering],
+            "p": [value.isoformat() if hasattr(value, "isoformat") else value for value in position],
+            "r": reverse,
+        }, default=str)
+
+        cursor = base64.urlsafe_b64encode(payload.encode()).decode()
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def _decode_cursor(self, request: Request) -> Tuple[Optional[List[Any]], bool]:
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(encoded.encode()))
+            ordering = [f"{'-' if descending else ''}{name}" for name, descending in self.ordering]
+
+            if payload["o"] != ordering or len(payload["p"]) != len(self.ordering):
+                raise ValueError("Cursor belongs to a different ordering.")
+
+            position = [self._to_python(name, value) for (name, _), value in zip(self.ordering, payload["p"])]
+            return position, bool(payload["r"])
+
+        except (binascii.Error, json.JSONDecodeError, KeyError, TypeError, ValueError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def _to_python(self, name: str, value: Any) -> Any:
+        try:
+            field = self.model._meta.pk if name == "pk" else self.model._meta.get_field(name)
+
+        except FieldDoesNotExist:
+            # Annotations, such as search distances, are plain JSON numbers.
+            return value
+
+        return field.to_python(value)
@@ -1,3 +1,17 @@
 from .user import UserSerializer
 from .collection import CollectionSerializer
-from .image import ImageSerializer
+from .image import (
+    ImageSerializer,
+    ImageUploadSerializer,
+    BulkImageUpdateSerializer,
+    BulkImageDeleteSerializer,
+    NearDuplicateSerializer,
+    NearDuplicateQuerySerializer,
+    SimilarImageSerializer,
+    SimilarImageQuerySerializer,
+    LabelFacetSerializer,
+    LabelFacetQuerySerializer,
+    LabelOperationSerializer,
+    LabelOperationResultSerializer,
+)
+from .upload_session import UploadSessionSerializer, UploadPartSerializer
@@ -1,14 +1,18 @@
+import uuid
+from typing import List
+
 from rest_framework import serializers
 
+from ImageBankManager.config import config
 from api.models.collection import Collection
 from api.serializers.mixins import LabelValidationMixin
 
 
 class CollectionSerializer(LabelValidationMixin, serializers.ModelSerializer):
-    images = serializers.PrimaryKeyRelatedField(
-        many=True,
-        read_only=True
-    )
+    # Read from the annotations of Collection.objects.with_image_stats(); instances loaded without them,
+    # such as the one just created, fall back to querying.
+    image_count = serializers.SerializerMethodField()
+    recent_images = serializers.SerializerMethodField()
 
     class Meta:
         model = Collection
@@ -18,7 +22,8 @@ class CollectionSerializer(LabelValidationMixin, serializers.ModelSerializer):
             "is_default",
             "owner",
             "labels",
-            "images",
+            "image_count",
+            "recent_images",
             "created_at",
             "updated_at",
         ]
@@ -26,7 +31,22 @@ class CollectionSerializer(LabelValidationMixin, serializers.ModelSerializer):
         read_only_fields = [
             "id",
             "is_default",
-            "images",
             "created_at",
             "updated_at"
         ]
+
+    def get_image_count(self, collection: Collection) -> int:
+        if hasattr(collection, "image_count"):
+            return collection.image_count
+
+        return collection.images.count()
+
+    def get_recent_images(self, collection: Collection) -> List[uuid.UUID]:
+        if hasattr(collection, "recent_image_ids"):
+            return collection.recent_image_ids
+
+        return list(
+            collection.images
+            .order_by("-created_at", "-id")
+            .values_list("id", flat=True)[:config.COLLECTION_PREVIEW_SIZE]
+        )
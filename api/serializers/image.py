@@ -1,15 +1,127 @@
-import re
+from typing import Any, Dict, Iterable, List, Optional
 
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import models, transaction
+from django.utils import timezone
 from rest_framework import serializers
 
 from ImageBankManager.config import config
+
 from api.models.image import Image
-from api.serializers.mixins import LabelValidationMixin
+from api.serializers.mixins import LabelValidationMixin, MimeTypeValidationMixin, WritableCollectionMixin
+from api.services.labels.facets import invalidate_label_facets
+from api.services.labels.operations import OPERATIONS
+
+
+def _parse_pk(model: type[models.Model], value: Any) -> Optional[Any]:
+    try:
+        return model._meta.pk.to_python(value)
+
+    except (DjangoValidationError, TypeError):
+        return None
+
+
+class BulkPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    # Once prefetch() has run, ids are resolved from a single in_bulk lookup instead of one query per item.
+    prefetched: Optional[Dict[Any, models.Model]] = None
+
+    def prefetch(self, values: Iterable[Any]) -> None:
+        queryset = self.get_queryset()
+        pks = {_parse_pk(queryset.model, value) for value in values} - {None}
+
+        self.prefetched = queryset.in_bulk(pks)
+
+    def to_internal_value(self, data: Any) -> models.Model:
+        if self.prefetched is None:
+            return super().to_internal_value(data)
+
+        instance = self.prefetched.get(_parse_pk(self.get_queryset().model, data))
+        if instance is None:
+            self.fail("does_not_exist", pk_value=data)
+
+        return instance
+
+
+class BulkImageListSerializer(serializers.ListSerializer):
+    # Updates take the queryset of images that may be changed as their instance; each item names its image by id.
+
+    def to_internal_value(self, data: Any) -> List[Dict[str, Any]]:
+        # Oversized payloads are rejected by the base class before any lookups run.
+        if isinstance(data, list) and (self.max_length is None or len(data) <= self.max_length):
+            items = [item for item in data if isinstance(item, dict)]
+
+            if "collection" in self.child.fields:
+                self.child.fields["collection"].prefetch(item["collection"] for item in items if "collection" in item)
+
+            if self.instance is not None:
+                pks = [pk for pk in (_parse_pk(Image, item.get("id")) for item in items) if pk is not None]
+                if len(pks) != len(set(pks)):
+                    raise serializers.ValidationError("Each image may only appear once.")
+
+                self.instances = self.instance.in_bulk(set(pks))
+
+        return super().to_internal_value(data)
+
+    def run_child_validation(self, data: Any) -> Dict[str, Any]:
+        if self.instance is not None:
+            pk = _parse_pk(Image, data.get("id")) if isinstance(data, dict) else None
+            self.child.instance = self.instances.get(pk)
+            if self.child.instance is None:
+                raise serializers.ValidationError({"id": ["Image not found."]})
+
+        return super().run_child_validation(data)
+
+    def create(self, validated_data: List[Dict[str, Any]]) -> List[Image]:
+        images = [Image(**attrs) for attrs in validated_data]
+        for image in images:
+            image.set_managed_fields()
+
+        with transaction.atomic():
+            Image.objects.bulk_create(images)
+            invalidate_label_facets({image.collection_id for image in images if image.labels})
+
+        return images
+
+    def update(self, instance: models.QuerySet, validated_data: List[Dict[str, Any]]) -> List[Image]:
+        images: List[Image] = []
+        fields = {"owner", "stored_filename", "updated_at"}
+        changed_collections = set()
+        now = timezone.now()
+
+        for attrs in validated_data:
+            image = self.instances[attrs.pop("id")]
+            previous_collection_id = image.collection_id
+
+            for attr, value in attrs.items():
+                setattr(image, attr, value)
+
+            image.set_managed_fields()
+            image.updated_at = now
+
+            if "labels" in attrs or "collection" in attrs:
+                changed_collections.update({previous_collection_id, image.collection_id})
+
+            fields.update(attrs)
+            images.append(image)
 
+        with transaction.atomic():
+            Image.objects.bulk_update(images, fields)
+            invalidate_label_facets(changed_collections)
+
+        return images
+
+
+class ImageSerializer(
+    WritableCollectionMixin,
+    LabelValidationMixin,
+    MimeTypeValidationMixin,
+    serializers.ModelSerializer,
+):
+    serializer_related_field = BulkPrimaryKeyRelatedField
 
-class ImageSerializer(LabelValidationMixin, serializers.ModelSerializer):
     class Meta:
         model = Image
+        list_serializer_class = BulkImageListSerializer
         fields = [
             "id",
             "filename",
@@ -30,13 +142,92 @@ class ImageSerializer(LabelValidationMixin, serializers.ModelSerializer):
             "updated_at",
         ]
 
-    def validate_mime_type(self, value: str):
-        value = value.lower()
 
-        if not re.match(config.MIME_TYPE_REGEX, value):
-            raise serializers.ValidationError("Invalid MIME type format.")
+class BulkImageUpdateSerializer(ImageSerializer):
+    id = serializers.UUIDField(help_text="Image to update.")
+
+    class Meta(ImageSerializer.Meta):
+        read_only_fields = [field for field in ImageSerializer.Meta.read_only_fields if field != "id"]
+
+
+class BulkImageDeleteSerializer(serializers.Serializer):
+    ids = serializers.ListField(
+        child=serializers.UUIDField(),
+        allow_empty=False,
+        max_length=config.BULK_MAX_SIZE,
+    )
+
+
+class ImageUploadSerializer(ImageSerializer):
+    class Meta(ImageSerializer.Meta):
+        read_only_fields = ImageSerializer.Meta.read_only_fields + [
+            "size_bytes",
+        ]
+
+
+class NearDuplicateSerializer(ImageSerializer):
+    distance = serializers.IntegerField(read_only=True)
+
+    class Meta(ImageSerializer.Meta):
+        fields = ImageSerializer.Meta.fields + [
+            "distance",
+        ]
+
+
+class NearDuplicateQuerySerializer(serializers.Serializer):
+    max_distance = serializers.IntegerField(
+        min_value=0,
+        max_value=config.NEAR_DUPLICATE_MAX_DISTANCE,
+        default=8,
+    )
+
+
+class SimilarImageSerializer(ImageSerializer):
+    distance = serializers.FloatField(read_only=True)
+
+    class Meta(ImageSerializer.Meta):
+        fields = ImageSerializer.Meta.fields + [
+            "distance",
+        ]
+
+
+class SimilarImageQuerySerializer(serializers.Serializer):
+    limit = serializers.IntegerField(
+        min_value=1,
+        max_value=config.SIMILAR_MAX_LIMIT,
+        default=config.SIMILAR_DEFAULT_LIMIT,
+    )
+    ef_search = serializers.IntegerField(
+        min_value=1,
+        max_value=1000,
+        default=config.SIMILAR_EF_SEARCH,
+    )
+
+
+class LabelFacetSerializer(serializers.Serializer):
+    label = serializers.CharField()
+    count = serializers.IntegerField()
+
+
+class LabelFacetQuerySerializer(serializers.Serializer):
+    collection = serializers.UUIDField(required=False)
+
+
+class LabelOperationSerializer(LabelValidationMixin, serializers.Serializer):
+    operation = serializers.ChoiceField(choices=OPERATIONS)
+    labels = serializers.ListField(
+        child=serializers.CharField(max_length=64),
+        max_length=config.MAX_LABELS,
+    )
+    ids = serializers.ListField(
+        child=serializers.UUIDField(),
+        required=False,
+        allow_empty=False,
+        max_length=config.BULK_MAX_SIZE,
+        help_text="Images to relabel. At least one of ids, collection or a label filter must select the images.",
+    )
+    collection = serializers.UUIDField(required=False)
 
-        if value not in config.ALLOWED_MIME_TYPES:
-            raise serializers.ValidationError(f"MIME type not allowed: {value}.")
 
-        return value
+class LabelOperationResultSerializer(serializers.Serializer):
+    updated = serializers.IntegerField()
@@ -1 +1,3 @@
 from .label_validation_mixin import LabelValidationMixin
+from .mime_type_validation_mixin import MimeTypeValidationMixin
+from .writable_collection_mixin import WritableCollectionMixin
@@ -0,0 +1,18 @@
+import re
+
+from rest_framework import serializers
+
+from ImageBankManager.config import config
+
+
+class MimeTypeValidationMixin:
+    def validate_mime_type(self, value: str) -> str:
+        value = value.lower()
+
+        if not re.match(config.MIME_TYPE_REGEX, value):
+            raise serializers.ValidationError("Invalid MIME type format.")
+
+        if value not in config.ALLOWED_MIME_TYPES:
+            raise serializers.ValidationError(f"MIME type not allowed: {value}.")
+
+        return value
@@ -0,0 +1,18 @@
+from typing import Dict
+
+from rest_framework import serializers
+
+from api.services.permissions.visibility import writable_collections
+
+
+class WritableCollectionMixin:
+    # Limits the collection field to collections the requesting user may add images to.
+    def get_fields(self) -> Dict[str, serializers.Field]:
+        fields = super().get_fields()
+
+        field = fields.get("collection")
+        request = self.context.get("request")
+        if field is not None and not field.read_only and request is not None:
+            field.queryset = writable_collections(request.user, field.get_queryset())
+
+        return fields
@@ -0,0 +1,52 @@
+from rest_framework import serializers
+
+from api.models.upload_session import UploadPart, UploadSession
+from api.serializers.mixins import LabelValidationMixin, MimeTypeValidationMixin, WritableCollectionMixin
+
+
+class UploadPartSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = UploadPart
+        fields = [
+            "number",
+            "size_bytes",
+            "sha256",
+            "created_at",
+            "updated_at",
+        ]
+
+        read_only_fields = fields
+
+
+class UploadSessionSerializer(
+    WritableCollectionMixin,
+    LabelValidationMixin,
+    MimeTypeValidationMixin,
+    serializers.ModelSerializer,
+):
+    parts = UploadPartSerializer(
+        many=True,
+        read_only=True
+    )
+
+    class Meta:
+        model = UploadSession
+        fields = [
+            "id",
+            "filename",
+            "mime_type",
+            "owner",
+            "collection",
+            "labels",
+            "parts",
+            "created_at",
+            "updated_at",
+        ]
+
+        read_only_fields = [
+            "id",
+            "owner",
+            "parts",
+            "created_at",
+            "updated_at",
+        ]
@@ -0,0 +1,32 @@
+import time
+from typing import Iterable
+
+from django.core.cache import cache
+from django.db import transaction
+
+
+# Cached entries embed the current generation of their scope in their key, so bumping it invalidates all of them.
+
+def generation(key: str) -> int:
+    # Seeded with the clock rather than 0 so that an evicted counter never comes back at a value that
+    # stale entries were cached under.
+    return cache.get_or_set(key, time.time_ns, timeout=None)
+
+
+def _bump(key: str) -> None:
+    try:
+        cache.incr(key)
+
+    except ValueError:
+        cache.set(key, time.time_ns(), timeout=None)
+
+
+def bump_after_commit(keys: Iterable[str]) -> None:
+    # After commit, so a request recomputing in between cannot cache pre-commit data under the new generation.
+    keys = set(keys)
+
+    def bump() -> None:
+        for key in keys:
+            _bump(key)
+
+    transaction.on_commit(bump)
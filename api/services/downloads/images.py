@@ -0,0 +1,118 @@
+from calendar import timegm
+from typing import Optional
+from urllib.parse import quote
+
+from django.http import FileResponse, Http404, HttpRequest, HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import content_disposition_header, http_date
+
+from ImageBankManager.config import config
+from api.models import Image
+from api.services.downloads.ranges import RangeReader, UnsatisfiableRange, parse_range_header
+from api.services.storage import StorageBackend, get_storage
+
+
+def _etag(image: Image) -> Optional[str]:
+    fingerprint = getattr(image, "fingerprint", None)
+    if fingerprint is None:
+        return None
+
+    return f'"{fingerprint.sha256}"'
+
+
+def _set_validators(response: HttpResponse, etag: Optional[str], last_modified: int) -> HttpResponse:
+    if etag:
+        response.headers["ETag"] = etag
+
+    response.headers["Last-Modified"] = http_date(last_modified)
+    response.headers["Cache-Control"] = "private, no-cache"
+
+    return response
+
+
+def _range_applies(request: HttpRequest, etag: Optional[str], last_modified: int) -> bool:
+    if_range = request.headers.get("If-Range")
+    if if_range is None:
+        return True
+
+    return if_range in (etag, http_date(last_modified))
+
+
+def _offload(storage: StorageBackend, image: Image) -> Optional[HttpResponse]:
+    if config.DOWNLOAD_OFFLOAD == "x-accel-redirect":
+        relative_path = storage.relative_path(image.storage_name)
+        if relative_path is None:
+            return None
+
+        header = "X-Accel-Redirect"
+        value = quote(f"{config.DOWNLOAD_OFFLOAD_PREFIX.rstrip('/')}/{relative_path}")
+
+    elif config.DOWNLOAD_OFFLOAD == "x-sendfile":
+        path = storage.path(image.storage_name)
+        if path is None:
+            return None
+
+        header = "X-Sendfile"
+        value = str(path)
+
+    else:
+        return None
+
+    response = HttpResponse(content_type=image.mime_type)
+    response.headers[header] = value
+    response.headers["Content-Disposition"] = content_disposition_header(False, image.filename)
+
+    return response
+
+
+def serve_image(request: HttpRequest, image: Image) -> HttpResponse:
+    etag = _etag(image)
+    last_modified = timegm(image.updated_at.utctimetuple())
+
+    conditional = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if conditional is not None:
+        return _set_validators(conditional, etag, last_modified)
+
+    storage = get_storage()
+
+    offloaded = _offload(storage, image)
+    if offloaded is not None:
+        return _set_validators(offloaded, etag, last_modified)
+
+    if not storage.exists(image.storage_name):
+        raise Http404("Image content has not been uploaded.")
+
+    size = storage.size(image.storage_name)
+    byte_range = None
+
+    range_header = request.headers.get("Range")
+    if range_header and _range_applies(request, etag, last_modified):
+        try:
+            byte_range = parse_range_header(range_header, size)
+
+        except UnsatisfiableRange:
+            response = HttpResponse(status=416)
+            response.headers["Content-Range"] = f"bytes */{size}"
+            return response
+
+    file = storage.open(image.storage_name)
+
+    if byte_range is None:
+        response = FileResponse(file, content_type=image.mime_type, filename=image.filename)
+
+    else:
+        start, end = byte_range
+        length = end - start + 1
+
+        response = FileResponse(
+            RangeReader(file, start, length),
+            status=206,
+            content_type=image.mime_type,
+            filename=image.filename,
+        )
+        response.headers["Content-Length"] = length
+        response.headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+
+    response.headers["Accept-Ranges"] = "bytes"
+
+    return _set_validators(response, etag, last_modified)
@@ -0,0 +1,54 @@
+import re
+from typing import BinaryIO, Optional, Tuple
+
+RANGE_REGEX = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+class UnsatisfiableRange(Exception):
+    pass
+
+
+def parse_range_header(header: str, size: int) -> Optional[Tuple[int, int]]:
+    match = RANGE_REGEX.match(header.strip())
+    if match is None:
+        return None
+
+    first, last = match.groups()
+
+    if not first:
+        if not last:
+            return None
+
+        suffix = int(last)
+        if suffix == 0:
+            raise UnsatisfiableRange()
+
+        return max(size - suffix, 0), size - 1
+
+    start = int(first)
+    if last and int(last) < start:
+        return None
+
+    if start >= size:
+        raise UnsatisfiableRange()
+
+    end = min(int(last), size - 1) if last else size - 1
+    return start, end
+
+
+class RangeReader:
+    def __init__(self, file: BinaryIO, start: int, length: int):
+        file.seek(start)
+        self.file = file
+        self.remaining = length
+
+    def read(self, size: int = -1) -> bytes:
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def close(self) -> None:
+        self.file.close()
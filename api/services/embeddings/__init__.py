@@ -0,0 +1,46 @@
+import uuid
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterable
+
+from django.conf import settings
+from django.db import transaction
+
+from ImageBankManager.config import config
+from api.models import ImageFingerprint
+from .memmap_index import MemmapEmbeddingIndex
+
+
+@lru_cache(maxsize=None)
+def _embedding_index(path: Path) -> MemmapEmbeddingIndex:
+    return MemmapEmbeddingIndex(path)
+
+
+def get_embedding_index() -> MemmapEmbeddingIndex:
+    # One instance per process keeps its mapping open between requests.
+    return _embedding_index(Path(settings.EMBEDDING_INDEX_PATH))
+
+
+def index_embeddings(fingerprints: Iterable[ImageFingerprint]) -> None:
+    # Bulk writes bypass the fingerprint signals, so they must call this themselves.
+    if config.SIMILAR_BACKEND != "numpy":
+        return
+
+    items = [
+        (fingerprint.image_id, fingerprint.embedding)
+        for fingerprint in fingerprints
+        if fingerprint.embedding is not None
+    ]
+    if items:
+        index = get_embedding_index()
+        transaction.on_commit(lambda: index.append(items))
+
+
+def unindex_embeddings(image_ids: Iterable[uuid.UUID]) -> None:
+    if config.SIMILAR_BACKEND != "numpy":
+        return
+
+    image_ids = list(image_ids)
+    if image_ids:
+        index = get_embedding_index()
+        transaction.on_commit(lambda: index.remove(image_ids))
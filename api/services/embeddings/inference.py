@@ -0,0 +1,65 @@
+from functools import lru_cache
+from pathlib import Path
+from typing import BinaryIO
+
+import numpy as np
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from PIL import Image as PILImage
+
+from ImageBankManager.config import config
+from api.models.image_fingerprint import EMBEDDING_DIMENSIONS
+
+try:
+    import onnxruntime
+except ImportError:
+    onnxruntime = None
+
+# Channel statistics of ImageNet, which pretrained image encoders expect their input normalized with.
+CHANNEL_MEAN = np.array([0.485, 0.456, 0.406], dtype=np.float32).reshape(3, 1, 1)
+CHANNEL_STD = np.array([0.229, 0.224, 0.225], dtype=np.float32).reshape(3, 1, 1)
+
+
+def load_model_input(file: BinaryIO, size: int) -> np.ndarray:
+    with PILImage.open(file) as image:
+        image.draft("RGB", (size, size))
+        image = image.convert("RGB").resize((size, size), PILImage.Resampling.BILINEAR)
+
+        pixels = np.asarray(image, dtype=np.float32) / 255
+
+    return (pixels.transpose(2, 0, 1) - CHANNEL_MEAN) / CHANNEL_STD
+
+
+class EmbeddingModel:
+    def __init__(self, path: Path, threads: int = 0):
+        if onnxruntime is None:
+            raise ImproperlyConfigured("Computing embeddings requires the onnxruntime package.")
+
+        options = onnxruntime.SessionOptions()
+        options.intra_op_num_threads = threads
+
+        self.session = onnxruntime.InferenceSession(str(path), options, providers=["CPUExecutionProvider"])
+        self.input_name = self.session.get_inputs()[0].name
+
+    def embed(self, pixels: np.ndarray) -> np.ndarray:
+        # pixels is a (N, 3, size, size) stack; a single run over the whole batch lets the kernels use the
+        # CPU's vector units, while per-image runs would mostly pay dispatch overhead.
+        embeddings = self.session.run(None, {self.input_name: pixels})[0]
+
+        if embeddings.shape[1:] != (EMBEDDING_DIMENSIONS,):
+            raise ImproperlyConfigured(
+                f"Embedding model returned shape {embeddings.shape}, expected (N, {EMBEDDING_DIMENSIONS})."
+            )
+
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        return embeddings / np.maximum(norms, np.finfo(np.float32).tiny)
+
+
+@lru_cache(maxsize=None)
+def _embedding_model(path: Path, threads: int) -> EmbeddingModel:
+    return EmbeddingModel(path, threads)
+
+
+def get_embedding_model() -> EmbeddingModel:
+    # Loading a session is expensive, so each worker process keeps its own for its lifetime.
+    return _embedding_model(Path(settings.EMBEDDING_MODEL_PATH), config.EMBEDDING_THREADS)
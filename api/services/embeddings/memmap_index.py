@@ -0,0 +1,208 @@
+import fcntl
+import os
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Sequence, Tuple
+
+import numpy as np
+
+
+# Exact cosine search over L2-normalized float32 vectors kept in one contiguous memory-mapped matrix, with the image
+# ids and tombstone flags of its rows in a parallel file next to it. Readers only map the files, so all processes on
+# a host share one page-cached copy and search is a single matrix-vector product. Writers serialize on a lock file:
+# appends and tombstones happen in place, while compaction writes new files and atomically replaces the old ones.
+class MemmapEmbeddingIndex:
+    id_dtype = np.dtype([("id", "S16"), ("deleted", "u1")])
+
+    def __init__(self, path: Path, dimensions: int = 512):
+        self.path = path
+        self.ids_path = path.with_suffix(".ids")
+        self.dimensions = dimensions
+        self.row_size = dimensions * np.dtype(np.float32).itemsize
+
+        self._vectors = np.empty((0, dimensions), np.float32)
+        self._ids = np.empty(0, self.id_dtype)
+        self._file_state = None
+
+    @staticmethod
+    def _normalize(vectors: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+        return vectors / np.maximum(norms, np.finfo(np.float32).tiny)
+
+    def _stat(self) -> Tuple:
+        try:
+            vectors, ids = os.stat(self.path), os.stat(self.ids_path)
+
+        except FileNotFoundError:
+            return ()
+
+        return vectors.st_ino, vectors.st_size, ids.st_ino, ids.st_size
+
+    def _count(self) -> int:
+        try:
+            vectors, ids = os.path.getsize(self.path), os.path.getsize(self.ids_path)
+
+        except FileNotFoundError:
+            return 0
+
+        # Rows past the shorter file belong to an interrupted append.
+        return min(vectors // self.row_size, ids // self.id_dtype.itemsize)
+
+    def _map(self) -> Tuple[np.ndarray, np.ndarray]:
+        count = self._count()
+        if not count:
+            return np.empty((0, self.dimensions), np.float32), np.empty(0, self.id_dtype)
+
+        return (
+            np.memmap(self.path, np.float32, "r", shape=(count, self.dimensions)),
+            np.memmap(self.ids_path, self.id_dtype, "r", shape=(count,)),
+        )
+
+    def _mapped(self) -> Tuple[np.ndarray, np.ndarray]:
+        # Appends grow the files and compaction replaces them, so either one requires a fresh mapping.
+        if self._stat() != self._file_state:
+            # Compaction replaces the two files one after the other, so they are mapped under the lock to pair up.
+            with self._locked(fcntl.LOCK_SH):
+                self._vectors, self._ids = self._map()
+                self._file_state = self._stat()
+
+        return self._vectors, self._ids
+
+    @contextmanager
+    def _locked(self, operation: int = fcntl.LOCK_EX, suffix: str = ".lock") -> Iterator[None]:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        with open(self.path.with_suffix(suffix), "a") as lock:
+            fcntl.flock(lock, operation)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _build(self, items: Iterable[Tuple[uuid.UUID, Sequence[float]]]) -> Tuple[np.ndarray, np.ndarray]:
+        items = list(items)
+        vectors = np.zeros((len(items), self.dimensions), np.float32)
+        ids = np.zeros(len(items), self.id_dtype)
+
+        if items:
+            image_ids, embeddings = zip(*items)
+            ids["id"] = [image_id.bytes for image_id in image_ids]
+            vectors[:] = self._normalize(np.asarray(embeddings, dtype=np.float32))
+
+        return vectors, ids
+
+    def _mark_deleted(self, ids_path: Path, count: int, ids: Sequence[bytes]) -> None:
+        if not count or not len(ids):
+            return
+
+        records = np.memmap(ids_path, self.id_dtype, "r+", shape=(count,))
+        records["deleted"][np.isin(records["id"], ids)] = 1
+        records.flush()
+
+    def _tombstone(self, ids: List[bytes]) -> None:
+        self._mark_deleted(self.ids_path, self._count(), ids)
+
+    def append(self, items: Iterable[Tuple[uuid.UUID, Sequence[float]]]) -> None:
+        vectors, ids = self._build(items)
+        if not len(ids):
+            return
+
+        with self._locked():
+            # Earlier vectors of the same images are superseded.
+            self._tombstone(ids["id"].tolist())
+            count = self._count()
+
+            # Vectors go first so that a row only counts once its id is written too.
+            with open(self.path, "ab") as file:
+                file.truncate(count * self.row_size)
+                file.write(vectors.tobytes())
+
+            with open(self.ids_path, "ab") as file:
+                file.truncate(count * self.id_dtype.itemsize)
+                file.write(ids.tobytes())
+
+    def remove(self, ids: Iterable[uuid.UUID]) -> None:
+        with self._locked():
+            self._tombstone([image_id.bytes for image_id in ids])
+
+    @contextmanager
+    def _replacement(self) -> Iterator[Tuple[Path, Path]]:
+        # Rebuilds and compactions are serialized by the maintenance lock, so one pair of temporary files suffices.
+        tmp_path, tmp_ids_path = self.path.with_suffix(".tmp"), self.ids_path.with_suffix(".ids.tmp")
+
+        # Files left by an interrupted run would otherwise be appended to.
+        tmp_path.unlink(missing_ok=True)
+        tmp_ids_path.unlink(missing_ok=True)
+
+        try:
+            yield tmp_path, tmp_ids_path
+
+        finally:
+            tmp_path.unlink(missing_ok=True)
+            tmp_ids_path.unlink(missing_ok=True)
+
+    @staticmethod
+    def _write(tmp_path: Path, tmp_ids_path: Path, chunks: Iterable[Tuple[np.ndarray, np.ndarray]]) -> None:
+        with open(tmp_path, "ab") as vectors_file, open(tmp_ids_path, "ab") as ids_file:
+            for vectors, ids in chunks:
+                vectors_file.write(np.ascontiguousarray(vectors).tobytes())
+                ids_file.write(np.ascontiguousarray(ids).tobytes())
+
+    def _swap(self, tmp_path: Path, tmp_ids_path: Path) -> None:
+        os.replace(tmp_path, self.path)
+        os.replace(tmp_ids_path, self.ids_path)
+
+    def compact(self) -> None:
+        with self._locked(suffix=".maintenance.lock"), self._replacement() as tmp_paths, self._locked():
+            vectors, ids = self._map()
+            live = ids["deleted"] == 0
+
+            self._write(*tmp_paths, [(vectors[live], ids[live])])
+            self._swap(*tmp_paths)
+
+    def rebuild(self, batches: Iterable[Iterable[Tuple[uuid.UUID, Sequence[float]]]]) -> None:
+        with self._locked(suffix=".maintenance.lock"), self._replacement() as (tmp_path, tmp_ids_path):
+            # No other rebuild or compaction can move the rows present now, so the ones appended or tombstoned while
+            # the database is read are found by position and replayed onto the new files before the swap.
+            with self._locked():
+                deleted_at_start = np.array(self._map()[1]["deleted"])
+
+            self._write(tmp_path, tmp_ids_path, (self._build(batch) for batch in batches))
+
+            with self._locked():
+                vectors, ids = self._map()
+                start = len(deleted_at_start)
+
+                removed = ids["id"][:start][(deleted_at_start == 0) & (ids["deleted"][:start] == 1)]
+                count = os.path.getsize(tmp_ids_path) // self.id_dtype.itemsize
+                self._mark_deleted(tmp_ids_path, count, np.concatenate([removed, ids["id"][start:]]))
+
+                self._write(tmp_path, tmp_ids_path, [(vectors[start:], ids[start:])])
+                self._swap(tmp_path, tmp_ids_path)
+
+    def stats(self) -> Dict[str, int]:
+        _, ids = self._mapped()
+        deleted = int(np.count_nonzero(ids["deleted"]))
+
+        return {"records": len(ids), "live": len(ids) - deleted, "deleted": deleted}
+
+    def search(self, vector: Sequence[float], limit: int) -> List[Tuple[uuid.UUID, float]]:
+        vectors, ids = self._mapped()
+        deleted = ids["deleted"] == 1
+
+        limit = min(limit, len(ids) - int(np.count_nonzero(deleted)))
+        if limit <= 0:
+            return []
+
+        query = self._normalize(np.asarray(vector, dtype=np.float32))
+        scores = np.asarray(vectors @ query)
+        scores[deleted] = -np.inf
+
+        top = np.argpartition(-scores, limit - 1)[:limit]
+        top = top[np.argsort(-scores[top])]
+
+        return [
+            (uuid.UUID(bytes=ids["id"][index].ljust(16, b"\0")), 1.0 - float(scores[index]))
+            for index in top
+        ]
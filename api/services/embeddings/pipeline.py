@@ -0,0 +1,66 @@
+import uuid
+from typing import Dict, List, Optional
+
+import numpy as np
+from django.utils import timezone
+
+from ImageBankManager.config import config
+from api.models import Image, ImageFingerprint, Job
+from api.services.embeddings import index_embeddings
+from api.services.embeddings.inference import get_embedding_model, load_model_input
+from api.services.jobs.queue import enqueue
+from api.services.storage import get_storage
+
+EMBEDDING_JOB = "embedding"
+
+
+def enqueue_embedding(image: Image) -> Optional[Job]:
+    if not config.EMBEDDING_ENABLED:
+        return None
+
+    return enqueue(EMBEDDING_JOB, {"image": str(image.id)})
+
+
+def compute_embeddings(jobs: List[Job]) -> Dict[uuid.UUID, str]:
+    model = get_embedding_model()
+    storage = get_storage()
+    images = Image.objects.select_related("fingerprint").in_bulk(
+        {job.payload["image"] for job in jobs}
+    )
+
+    failures: Dict[uuid.UUID, str] = {}
+    fingerprints: List[ImageFingerprint] = []
+    pixels: List[np.ndarray] = []
+
+    for job in jobs:
+        image = images.get(uuid.UUID(job.payload["image"]))
+        if image is None:
+            continue
+
+        fingerprint = getattr(image, "fingerprint", None)
+        if fingerprint is None:
+            failures[job.id] = "Image has no fingerprint yet."
+            continue
+
+        try:
+            with storage.open(image.storage_name) as file:
+                pixels.append(load_model_input(file, config.EMBEDDING_INPUT_SIZE))
+
+        except Exception as exc:
+            failures[job.id] = repr(exc)
+            continue
+
+        fingerprints.append(fingerprint)
+
+    if not fingerprints:
+        return failures
+
+    now = timezone.now()
+    for fingerprint, embedding in zip(fingerprints, model.embed(np.stack(pixels))):
+        fingerprint.embedding = embedding
+        fingerprint.updated_at = now
+
+    ImageFingerprint.objects.bulk_update(fingerprints, ["embedding", "updated_at"])
+    index_embeddings(fingerprints)
+
+    return failures
@@ -0,0 +1,49 @@
+import hashlib
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from api.services.fingerprints.phash import load_pixels, phash_batch
+from api.services.storage import StorageBackend
+
+# (image id, sha256, phash, error)
+BackfillResult = Tuple[str, Optional[str], Optional[int], Optional[str]]
+
+
+def fingerprint_files(
+    storage: StorageBackend,
+    items: List[Tuple[str, str]],
+    chunk_size: int,
+) -> List[BackfillResult]:
+    # Runs in worker processes: it must not touch the database.
+    results: List[BackfillResult] = []
+    decoded: List[Tuple[int, np.ndarray]] = []
+
+    for image_id, stored_filename in items:
+        sha256 = None
+
+        try:
+            with storage.open(stored_filename) as file:
+                digest = hashlib.sha256()
+                while chunk := file.read(chunk_size):
+                    digest.update(chunk)
+
+                sha256 = digest.hexdigest()
+
+                file.seek(0)
+                pixels = load_pixels(file)
+
+        except Exception as exc:
+            results.append((image_id, sha256, None, repr(exc)))
+            continue
+
+        decoded.append((len(results), pixels))
+        results.append((image_id, sha256, None, None))
+
+    if decoded:
+        indices, images = zip(*decoded)
+        for index, phash in zip(indices, phash_batch(np.stack(images)).tolist()):
+            image_id, sha256, _, _ = results[index]
+            results[index] = (image_id, sha256, phash, None)
+
+    return results
@@ -0,0 +1,51 @@
+from itertools import combinations
+from typing import List, Optional
+
+from django.db.models import BigIntegerField, Func, IntegerField, Q, QuerySet, Value
+
+from api.models import Image, ImageFingerprint
+from api.models.image_fingerprint import PHASH_BAND_BITS, PHASH_BAND_FIELDS, PHASH_BANDS
+
+
+class HammingDistance(Func):
+    template = "bit_count(CAST(%(expressions)s AS bit(64)))"
+    arg_joiner = " # "
+    output_field = IntegerField()
+
+
+def find_exact_duplicate(image: Image, sha256: str) -> Optional[ImageFingerprint]:
+    return (
+        ImageFingerprint.objects
+        .select_related("image")
+        .filter(sha256=sha256, image__owner_id=image.owner_id)
+        .exclude(image=image)
+        .order_by("image__created_at")
+        .first()
+    )
+
+
+def _band_neighbours(band: int, radius: int) -> List[int]:
+    return [
+        band ^ sum(1 << bit for bit in bits)
+        for distance in range(radius + 1)
+        for bits in combinations(range(PHASH_BAND_BITS), distance)
+    ]
+
+
+def find_near_duplicates(images: QuerySet[Image], fingerprint: ImageFingerprint, max_distance: int) -> QuerySet[Image]:
+    # Any hash within max_distance matches at least one band within this radius, so the band lookups
+    # return every true match; the exact Hamming check then discards the false candidates.
+    radius = max_distance // PHASH_BANDS
+
+    candidates = Q()
+    for field, band in zip(PHASH_BAND_FIELDS, fingerprint.phash_bands):
+        candidates |= Q(**{f"fingerprint__{field}__in": _band_neighbours(band, radius)})
+
+    return (
+        images
+        .filter(candidates)
+        .exclude(id=fingerprint.image_id)
+        .annotate(distance=HammingDistance("fingerprint__phash", Value(fingerprint.phash, BigIntegerField())))
+        .filter(distance__lte=max_distance)
+        .order_by("distance", "-created_at")
+    )
@@ -0,0 +1,44 @@
+from functools import lru_cache
+from typing import BinaryIO
+
+import numpy as np
+from PIL import Image as PILImage
+
+HASH_SIZE = 8
+IMAGE_SIZE = HASH_SIZE * 4
+
+
+@lru_cache(maxsize=None)
+def dct_matrix(size: int) -> np.ndarray:
+    k = np.arange(size)[:, None]
+    n = np.arange(size)[None, :]
+
+    matrix = np.sqrt(2 / size) * np.cos(np.pi * (2 * n + 1) * k / (2 * size))
+    matrix[0] /= np.sqrt(2)
+
+    return matrix.astype(np.float32)
+
+
+def load_pixels(file: BinaryIO) -> np.ndarray:
+    with PILImage.open(file) as image:
+        # Lets JPEG decode at a reduced scale instead of decoding full resolution only to downsample it.
+        image.draft("L", (IMAGE_SIZE, IMAGE_SIZE))
+        image = image.convert("L").resize((IMAGE_SIZE, IMAGE_SIZE), PILImage.Resampling.LANCZOS)
+
+        return np.asarray(image, dtype=np.float32)
+
+
+def phash_batch(pixels: np.ndarray) -> np.ndarray:
+    # pixels is a (N, IMAGE_SIZE, IMAGE_SIZE) stack; the DCT of every image is computed in one matmul.
+    matrix = dct_matrix(IMAGE_SIZE)
+
+    dct = matrix @ pixels @ matrix.T
+    low = dct[:, :HASH_SIZE, :HASH_SIZE].reshape(len(pixels), -1)
+    bits = low > np.median(low, axis=1, keepdims=True)
+
+    # Big-endian bytes reinterpreted as signed, since phash is stored in a BigIntegerField.
+    return np.packbits(bits, axis=1).view(">i8").ravel().astype(np.int64)
+
+
+def compute_phash(file: BinaryIO) -> int:
+    return int(phash_batch(load_pixels(file)[np.newaxis])[0])
@@ -0,0 +1,80 @@
+import hashlib
+import uuid
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from ImageBankManager.config import config
+from api.models import Image, ImageFingerprint, Job
+from api.models.image_fingerprint import PHASH_BAND_FIELDS
+from api.services.fingerprints.phash import load_pixels, phash_batch
+from api.services.jobs.queue import enqueue
+from api.services.storage import StorageBackend, get_storage
+
+FINGERPRINT_JOB = "fingerprint"
+
+
+def enqueue_fingerprint(image: Image) -> Job:
+    return enqueue(FINGERPRINT_JOB, {"image": str(image.id)})
+
+
+def _file_sha256(storage: StorageBackend, image: Image) -> str:
+    sha256 = hashlib.sha256()
+
+    with storage.open(image.storage_name) as file:
+        while chunk := file.read(config.UPLOAD_CHUNK_SIZE):
+            sha256.update(chunk)
+
+    return sha256.hexdigest()
+
+
+def _prepare(storage: StorageBackend, image: Image) -> Tuple[ImageFingerprint, np.ndarray]:
+    fingerprint = getattr(image, "fingerprint", None) or ImageFingerprint(image=image)
+
+    if not fingerprint.sha256:
+        fingerprint.sha256 = _file_sha256(storage, image)
+
+    with storage.open(image.storage_name) as file:
+        pixels = load_pixels(file)
+
+    return fingerprint, pixels
+
+
+def compute_fingerprints(jobs: List[Job]) -> Dict[uuid.UUID, str]:
+    storage = get_storage()
+    images = Image.objects.select_related("fingerprint").in_bulk(
+        {job.payload["image"] for job in jobs}
+    )
+
+    failures: Dict[uuid.UUID, str] = {}
+    fingerprints: List[ImageFingerprint] = []
+    pixels: List[np.ndarray] = []
+
+    for job in jobs:
+        image = images.get(uuid.UUID(job.payload["image"]))
+        if image is None:
+            continue
+
+        try:
+            fingerprint, image_pixels = _prepare(storage, image)
+
+        except Exception as exc:
+            failures[job.id] = repr(exc)
+            continue
+
+        fingerprints.append(fingerprint)
+        pixels.append(image_pixels)
+
+    if fingerprints:
+        for fingerprint, phash in zip(fingerprints, phash_batch(np.stack(pixels))):
+            fingerprint.phash = int(phash)
+            fingerprint.set_phash_bands()
+
+    ImageFingerprint.objects.bulk_create(
+        fingerprints,
+        update_conflicts=True,
+        unique_fields=["image"],
+        update_fields=["sha256", "phash", *PHASH_BAND_FIELDS, "updated_at"],
+    )
+
+    return failures
@@ -0,0 +1,130 @@
+import uuid
+from typing import Dict, List
+
+from django.db import connection, transaction
+from django.db.models import F, QuerySet, Value
+from django.db.models.functions import Cast
+from pgvector import Vector
+from pgvector.django import CosineDistance, HammingDistance, VectorField
+
+from ImageBankManager.config import config
+from api.models import Image, ImageFingerprint
+from api.models.image_fingerprint import EMBEDDING_DIMENSIONS, quantize_embedding
+from api.services.embeddings import get_embedding_index
+
+# Upper bound pgvector accepts for hnsw.ef_search.
+HNSW_MAX_EF_SEARCH = 1000
+
+
+def _query_embedding(fingerprint: ImageFingerprint) -> Cast:
+    return Cast(Value(Vector(fingerprint.embedding).to_text()), VectorField(dimensions=EMBEDDING_DIMENSIONS))
+
+
+def _candidate_count(limit: int, precision: str) -> int:
+    return limit if precision == "full" else limit * config.SIMILAR_RERANK_FACTOR
+
+
+def _candidates(images: QuerySet[Image], fingerprint: ImageFingerprint) -> QuerySet[ImageFingerprint]:
+    return (
+        ImageFingerprint.objects
+        .filter(image__in=images, embedding__isnull=False)
+        .exclude(image_id=fingerprint.image_id)
+    )
+
+
+def similar_fingerprints(
+    images: QuerySet[Image],
+    fingerprint: ImageFingerprint,
+    limit: int,
+    precision: str,
+) -> QuerySet[ImageFingerprint]:
+    candidates = _candidates(images, fingerprint)
+    query = _query_embedding(fingerprint)
+
+    if precision != "full":
+        # Walk the quantized index for a shortlist, then re-rank it against the full-precision column.
+        distance_type = CosineDistance if precision == "half" else HammingDistance
+        shortlist = (
+            candidates
+            .order_by(distance_type(
+                quantize_embedding(F("embedding"), precision),
+                quantize_embedding(query, precision),
+            ))
+            .values("image_id")[:_candidate_count(limit, precision)]
+        )
+        candidates = ImageFingerprint.objects.filter(image_id__in=shortlist)
+
+    return (
+        candidates
+        .select_related("image")
+        .annotate(distance=CosineDistance("embedding", query))
+        .order_by("distance")[:limit]
+    )
+
+
+def _find_similar_in_database(
+    images: QuerySet[Image],
+    fingerprint: ImageFingerprint,
+    limit: int,
+    ef_search: int,
+) -> List[Image]:
+    precision = config.EMBEDDING_INDEX_PRECISION
+    matches = similar_fingerprints(images, fingerprint, limit, precision)
+    # The HNSW scan yields at most ef_search candidates, so it must cover every candidate requested.
+    ef_search = max(ef_search, _candidate_count(limit, precision))
+    expected = None
+
+    with transaction.atomic():
+        # Visibility is filtered after the scan, so a caller who sees little of the bank can be left short.
+        # Widen the scan until enough candidates survive the filter, as the in-memory backend does.
+        while True:
+            # The setting is transaction-local, so the query has to run inside this block.
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT set_config('hnsw.ef_search', %s, true)", [str(ef_search)])
+
+            found = list(matches.all())
+            if len(found) >= limit or ef_search >= HNSW_MAX_EF_SEARCH:
+                break
+
+            if expected is None:
+                expected = _candidates(images, fingerprint)[:limit].count()
+            if len(found) >= expected:
+                break
+
+            ef_search = min(ef_search * 4, HNSW_MAX_EF_SEARCH)
+
+    for match in found:
+        match.image.distance = match.distance
+
+    return [match.image for match in found]
+
+
+def _find_similar_in_memory(images: QuerySet[Image], fingerprint: ImageFingerprint, limit: int) -> List[Image]:
+    index = get_embedding_index()
+    candidates = limit * 4
+
+    # The index knows nothing about permissions, so over-fetch and widen until enough candidates are viewable.
+    while True:
+        matches = index.search(fingerprint.embedding, candidates + 1)
+        distances: Dict[uuid.UUID, float] = {
+            image_id: distance for image_id, distance in matches if image_id != fingerprint.image_id
+        }
+        found = images.in_bulk(distances)
+
+        if len(found) >= limit or len(matches) <= candidates:
+            break
+
+        candidates *= 4
+
+    similar = sorted(found.values(), key=lambda image: distances[image.id])[:limit]
+    for image in similar:
+        image.distance = distances[image.id]
+
+    return similar
+
+
+def find_similar(images: QuerySet[Image], fingerprint: ImageFingerprint, limit: int, ef_search: int) -> List[Image]:
+    if config.SIMILAR_BACKEND == "numpy":
+        return _find_similar_in_memory(images, fingerprint, limit)
+
+    return _find_similar_in_database(images, fingerprint, limit, ef_search)
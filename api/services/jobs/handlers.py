@@ -0,0 +1,20 @@
+import uuid
+from typing import Callable, Dict, List
+
+from ImageBankManager.config import config
+from api.models import Job
+from api.services.embeddings.pipeline import EMBEDDING_JOB, compute_embeddings
+from api.services.fingerprints.pipeline import FINGERPRINT_JOB, compute_fingerprints
+
+# A handler processes a batch of claimed jobs and returns the errors of the jobs that failed.
+JobHandler = Callable[[List[Job]], Dict[uuid.UUID, str]]
+
+JOB_HANDLERS: Dict[str, JobHandler] = {
+    FINGERPRINT_JOB: compute_fingerprints,
+    EMBEDDING_JOB: compute_embeddings,
+}
+
+# Seconds a kind's due jobs may wait to fill a whole batch before a worker runs a smaller one.
+JOB_BATCH_WINDOWS: Dict[str, float] = {
+    EMBEDDING_JOB: config.EMBEDDING_MAX_WAIT,
+}
@@ -0,0 +1,117 @@
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional
+
+from django.db import transaction
+from django.db.models import Count, F, Min
+from django.utils import timezone
+
+from ImageBankManager.config import config
+from api.models.job import Job
+
+
+def enqueue(kind: str, payload: Dict[str, Any], run_after: Optional[datetime] = None) -> Job:
+    return Job.objects.create(
+        kind=kind,
+        payload=payload,
+        run_after=run_after or timezone.now(),
+    )
+
+
+def claim(kind: str, limit: int) -> List[Job]:
+    now = timezone.now()
+
+    with transaction.atomic():
+        jobs = list(
+            Job.objects
+            .select_for_update(skip_locked=True)
+            .filter(kind=kind, status=Job.Status.PENDING, run_after__lte=now)
+            .order_by("run_after")[:limit]
+        )
+
+        Job.objects.filter(id__in=[job.id for job in jobs]).update(
+            status=Job.Status.RUNNING,
+            locked_at=now,
+            attempts=F("attempts") + 1,
+            updated_at=now,
+        )
+
+    for job in jobs:
+        job.status = Job.Status.RUNNING
+        job.locked_at = now
+        job.attempts += 1
+
+    return jobs
+
+
+def batch_ready(kind: str, batch_size: int, max_wait: float) -> bool:
+    now = timezone.now()
+    due = Job.objects.filter(kind=kind, status=Job.Status.PENDING, run_after__lte=now)
+
+    if due[:batch_size].count() >= batch_size:
+        return True
+
+    oldest = due.aggregate(oldest=Min("run_after"))["oldest"]
+    return oldest is not None and oldest <= now - timedelta(seconds=max_wait)
+
+
+def complete(jobs: Iterable[Job]) -> None:
+    Job.objects.filter(id__in=[job.id for job in jobs]).update(
+        status=Job.Status.DONE,
+        locked_at=None,
+        last_error="",
+        updated_at=timezone.now(),
+    )
+
+
+def fail(job: Job, error: str) -> None:
+    now = timezone.now()
+
+    job.locked_at = None
+    job.last_error = error
+
+    if job.attempts >= config.JOB_MAX_ATTEMPTS:
+        job.status = Job.Status.FAILED
+
+    else:
+        job.status = Job.Status.PENDING
+        job.run_after = now + timedelta(seconds=config.JOB_RETRY_DELAY * 2 ** (job.attempts - 1))
+
+    job.save(update_fields=["status", "run_after", "locked_at", "last_error", "updated_at"])
+
+
+def requeue_stale() -> int:
+    now = timezone.now()
+
+    return Job.objects.filter(
+        status=Job.Status.RUNNING,
+        locked_at__lt=now - timedelta(seconds=config.JOB_STALE_TIMEOUT),
+    ).update(
+        status=Job.Status.PENDING,
+        locked_at=None,
+        run_after=now,
+        updated_at=now,
+    )
+
+
+def prune_done(older_than: timedelta) -> int:
+    deleted, _ = Job.objects.filter(
+        status=Job.Status.DONE,
+        updated_at__lt=timezone.now() - older_than,
+    ).delete()
+
+    return deleted
+
+
+def queue_depth(kind: Optional[str] = None) -> Dict[str, Any]:
+    jobs = Job.objects.all()
+    if kind is not None:
+        jobs = jobs.filter(kind=kind)
+
+    depth: Dict[str, Any] = {status: 0 for status in Job.Status.values}
+    for row in jobs.values("status").annotate(count=Count("id")):
+        depth[row["status"]] = row["count"]
+
+    oldest = jobs.filter(status=Job.Status.PENDING).aggregate(oldest=Min("run_after"))["oldest"]
+    depth["oldest_pending_seconds"] = max((timezone.now() - oldest).total_seconds(), 0) if oldest else 0
+
+    return depth
@@ -0,0 +1,44 @@
+import logging
+import traceback
+from typing import Iterable, Optional
+
+from ImageBankManager.config import config
+from api.services.jobs.handlers import JOB_BATCH_WINDOWS, JOB_HANDLERS
+from api.services.jobs.queue import batch_ready, claim, complete, fail, requeue_stale
+
+logger = logging.getLogger(__name__)
+
+
+def run_batch(kind: str, batch_size: Optional[int] = None, drain: bool = False) -> int:
+    batch_size = batch_size or config.JOB_BATCH_SIZE
+
+    # Draining runs partial batches right away instead of waiting out the kind's batch window.
+    if not drain and kind in JOB_BATCH_WINDOWS and not batch_ready(kind, batch_size, JOB_BATCH_WINDOWS[kind]):
+        return 0
+
+    jobs = claim(kind, batch_size)
+    if not jobs:
+        return 0
+
+    try:
+        failures = JOB_HANDLERS[kind](jobs)
+
+    except Exception:
+        failures = {job.id: traceback.format_exc() for job in jobs}
+
+    for job in jobs:
+        if job.id in failures:
+            logger.warning("Job %s failed (attempt %s): %s", job.id, job.attempts, failures[job.id])
+            fail(job, failures[job.id])
+
+    complete(job for job in jobs if job.id not in failures)
+
+    return len(jobs)
+
+
+def run_once(kinds: Optional[Iterable[str]] = None, batch_size: Optional[int] = None, drain: bool = False) -> int:
+    requeued = requeue_stale()
+    if requeued:
+        logger.warning("Requeued %s stale jobs.", requeued)
+
+    return sum(run_batch(kind, batch_size, drain) for kind in kinds or JOB_HANDLERS)
@@ -0,0 +1,50 @@
+import uuid
+from typing import Dict, Iterable, List, Optional, Union
+
+from django.core.cache import cache
+from django.db.models import CharField, Count, F, Func, QuerySet
+
+from ImageBankManager.config import config
+from api.models import Image, User
+from api.services.cache import bump_after_commit, generation
+
+GLOBAL_SCOPE = "*"
+
+
+def _generation_key(scope: str) -> str:
+    return f"label-facets:generation:{scope}"
+
+
+def invalidate_label_facets(collection_ids: Iterable[Union[uuid.UUID, str]]) -> None:
+    scopes = {str(collection_id) for collection_id in collection_ids if collection_id} | {GLOBAL_SCOPE}
+    bump_after_commit(_generation_key(scope) for scope in scopes)
+
+
+def count_labels(images: QuerySet[Image]) -> List[Dict[str, Union[str, int]]]:
+    return list(
+        images
+        .order_by()
+        .annotate(label=Func(F("labels"), function="unnest", output_field=CharField()))
+        .values("label")
+        .annotate(count=Count("id"))
+        .order_by("-count", "label")
+    )
+
+
+def get_label_facets(
+    user: User,
+    images: QuerySet[Image],
+    collection_id: Optional[uuid.UUID] = None,
+) -> List[Dict[str, Union[str, int]]]:
+    scope = str(collection_id) if collection_id else GLOBAL_SCOPE
+    key = f"label-facets:{user.pk}:{scope}:{generation(_generation_key(scope))}"
+
+    facets = cache.get(key)
+    if facets is None:
+        if collection_id:
+            images = images.filter(collection_id=collection_id)
+
+        facets = count_labels(images)
+        cache.set(key, facets, timeout=config.LABEL_FACETS_CACHE_TIMEOUT)
+
+    return facets
@@ -0,0 +1,75 @@
+import uuid
+from typing import List
+
+from django.contrib.postgres.fields import ArrayField
+from django.db import models, transaction
+from django.db.models import F, Func, QuerySet, Value
+from django.utils import timezone
+from rest_framework import serializers
+
+from ImageBankManager.config import config
+from api.models import Image
+from api.services.labels.facets import invalidate_label_facets
+
+ADD = "add"
+REMOVE = "remove"
+REPLACE = "replace"
+
+OPERATIONS = [ADD, REMOVE, REPLACE]
+
+
+def _labels_field() -> ArrayField:
+    return ArrayField(models.CharField(max_length=64))
+
+
+class AppendUniqueLabels(Func):
+    # Concatenates the arrays and drops repeated labels, keeping the first occurrence of each in order.
+    template = (
+        "ARRAY(SELECT label FROM unnest(%(expressions)s) WITH ORDINALITY AS labels(label, position) "
+        "GROUP BY label ORDER BY min(position))"
+    )
+    arg_joiner = " || "
+
+
+def _labels_expression(operation: str, labels: List[str]) -> models.Expression:
+    if operation == REPLACE:
+        return Value(labels, output_field=_labels_field())
+
+    if operation == ADD:
+        return AppendUniqueLabels(F("labels"), Value(labels, output_field=_labels_field()), output_field=_labels_field())
+
+    expression = F("labels")
+    for label in labels:
+        expression = Func(expression, Value(label), function="array_remove", output_field=_labels_field())
+
+    return expression
+
+
+def apply_label_operation(images: QuerySet[Image], operation: str, labels: List[str]) -> int:
+    expression = _labels_expression(operation, labels)
+    images = images.order_by()
+
+    # Removing labels can only change images that have one of them.
+    if operation == REMOVE:
+        images = images.filter(labels__overlap=labels)
+
+    with transaction.atomic():
+        # Locked, so the matched images cannot change before the update below.
+        matched: List[uuid.UUID] = list(images.select_for_update().values_list("collection_id", flat=True))
+
+        if operation == ADD:
+            images = (
+                images
+                .alias(label_count=Func(expression, function="cardinality", output_field=models.IntegerField()))
+                .filter(label_count__lte=config.MAX_LABELS)
+            )
+
+        updated = images.update(labels=expression, updated_at=timezone.now())
+
+        # The limit is checked by the update itself. Any image it skipped rolls the whole operation back.
+        if updated < len(matched):
+            raise serializers.ValidationError({"labels": [f"Images would have more than {config.MAX_LABELS} labels."]})
+
+        invalidate_label_facets(set(matched))
+
+    return updated
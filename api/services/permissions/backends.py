@@ -0,0 +1,44 @@
+from typing import Any, Iterable, Optional
+
+from django.db.models import Model
+from guardian.backends import ObjectPermissionBackend
+
+from api.models.collection import Collection
+from api.models.image import Image
+
+IMAGE_SUFFIX = "_image"
+COLLECTION_SUFFIX = "_collection"
+
+
+# Resolves image permissions through the image's collection, so sharing a collection never writes per-image rows.
+# Permission rows stored directly on images are ignored.
+class CollectionPermissionBackend(ObjectPermissionBackend):
+    def has_perm(self, user_obj: Any, perm: str, obj: Optional[Model] = None) -> bool:
+        if not isinstance(obj, Image):
+            return super().has_perm(user_obj, perm, obj)
+
+        if not perm.endswith(IMAGE_SUFFIX):
+            return False
+
+        return super().has_perm(user_obj, perm.removesuffix(IMAGE_SUFFIX) + COLLECTION_SUFFIX, _collection_of(obj))
+
+    def get_group_permissions(self, user_obj: Any, obj: Optional[Model] = None) -> Iterable[str]:
+        if not isinstance(obj, Image):
+            return super().get_group_permissions(user_obj, obj)
+
+        return _as_image_perms(super().get_group_permissions(user_obj, _collection_of(obj)))
+
+    def get_all_permissions(self, user_obj: Any, obj: Optional[Model] = None) -> Iterable[str]:
+        if not isinstance(obj, Image):
+            return super().get_all_permissions(user_obj, obj)
+
+        return _as_image_perms(super().get_all_permissions(user_obj, _collection_of(obj)))
+
+
+def _collection_of(image: Image) -> Collection:
+    # Guardian only needs the primary key, so the collection row itself is never loaded.
+    return Collection(pk=image.collection_id)
+
+
+def _as_image_perms(perms: Iterable[str]) -> set[str]:
+    return {perm.removesuffix(COLLECTION_SUFFIX) + IMAGE_SUFFIX for perm in perms if perm.endswith(COLLECTION_SUFFIX)}
@@ -1,25 +1,28 @@
 from typing import Iterable
 
 from django.contrib.auth.models import AbstractBaseUser
+from django.db import transaction
 from guardian.shortcuts import assign_perm, remove_perm
 
 from api.models.collection import Collection
-from api.models.image import Image
+from api.services.labels.facets import invalidate_label_facets
 from api.services.permissions.enums import Permission
+from api.services.permissions.visibility import invalidate_shared_collections
 
 
+# Images inherit these permissions through CollectionPermissionBackend, so only the collection rows are written.
+
 def share_collection_with_user(
     collection: Collection,
     user: AbstractBaseUser,
     perms: Iterable[Permission],
 ) -> None:
-    for perm in perms:
-        assign_perm(f"{perm}_collection", user, collection)
-
-    images: Iterable[Image] = collection.images.all()
-    for image in images:
+    with transaction.atomic():
         for perm in perms:
-            assign_perm(f"{perm}_image", user, image)
+            assign_perm(f"{perm}_collection", user, collection)
+
+        invalidate_shared_collections(user.pk)
+        invalidate_label_facets([collection.id])
 
 
 def revoke_collection_share_from_user(
@@ -27,10 +30,9 @@ def revoke_collection_share_from_user(
     user: AbstractBaseUser,
     perms: Iterable[Permission],
 ) -> None:
-    for perm in perms:
-        remove_perm(f"{perm}_collection", user, collection)
-
-    images: Iterable[Image] = collection.images.all()
-    for image in images:
+    with transaction.atomic():
         for perm in perms:
-            remove_perm(f"{perm}_image", user, image)
+            remove_perm(f"{perm}_collection", user, collection)
+
+        invalidate_shared_collections(user.pk)
+        invalidate_label_facets([collection.id])
@@ -0,0 +1,74 @@
+import uuid
+from typing import Any, List
+
+from django.core.cache import cache
+from django.db.models import Q, QuerySet
+from guardian.shortcuts import get_objects_for_user
+
+from ImageBankManager.config import config
+from api.models.collection import Collection
+from api.models.image import Image
+from api.services.cache import bump_after_commit, generation
+from api.services.permissions.enums import Permission
+
+
+def _generation_key(user_id: Any) -> str:
+    return f"shared-collections:generation:{user_id}"
+
+
+def invalidate_shared_collections(user_id: Any) -> None:
+    bump_after_commit([_generation_key(user_id)])
+
+
+def shared_collection_ids(user, perm: Permission = Permission.VIEW) -> List[uuid.UUID]:
+    key = f"shared-collections:{user.pk}:{perm}:{generation(_generation_key(user.pk))}"
+
+    ids = cache.get(key)
+    if ids is None:
+        ids = list(
+            get_objects_for_user(
+                user, f"api.{perm}_collection", Collection, with_superuser=False, accept_global_perms=False
+            )
+            .values_list("id", flat=True)
+        )
+        cache.set(key, ids, timeout=config.SHARED_COLLECTIONS_CACHE_TIMEOUT)
+
+    return ids
+
+
+def visible_collections(
+    user,
+    collections: QuerySet[Collection],
+    perm: Permission = Permission.VIEW,
+) -> QuerySet[Collection]:
+    if user.is_superuser:
+        return collections
+
+    if not user.is_authenticated:
+        return collections.none()
+
+    return collections.filter(Q(owner=user) | Q(id__in=shared_collection_ids(user, perm)))
+
+
+def writable_collections(user, collections: QuerySet[Collection]) -> QuerySet[Collection]:
+    if user.is_superuser:
+        return collections
+
+    if not user.is_authenticated:
+        return collections.none()
+
+    # Images may be added to, or moved into, collections the user may add to or change.
+    shared_ids = {*shared_collection_ids(user, Permission.ADD), *shared_collection_ids(user, Permission.CHANGE)}
+
+    return collections.filter(Q(owner=user) | Q(id__in=shared_ids))
+
+
+def visible_images(user, images: QuerySet[Image], perm: Permission = Permission.VIEW) -> QuerySet[Image]:
+    if user.is_superuser:
+        return images
+
+    if not user.is_authenticated:
+        return images.none()
+
+    # Images always belong to their collection's owner.
+    return images.filter(Q(owner=user) | Q(collection_id__in=shared_collection_ids(user, perm)))
@@ -0,0 +1,17 @@
+from pathlib import Path
+from typing import Dict, Type
+
+from django.conf import settings
+
+from ImageBankManager.config import config
+from .base import StorageBackend
+from .local import LocalStorage, ShardedLocalStorage
+
+STORAGE_BACKENDS: Dict[str, Type[StorageBackend]] = {
+    "local": LocalStorage,
+    "sharded": ShardedLocalStorage,
+}
+
+
+def get_storage() -> StorageBackend:
+    return STORAGE_BACKENDS[config.STORAGE_BACKEND](Path(settings.MEDIA_ROOT))
@@ -0,0 +1,39 @@
+from abc import ABC, abstractmethod
+from pathlib import Path, PurePosixPath
+from typing import BinaryIO, Iterable, Optional
+
+
+class StorageBackend(ABC):
+    COPY_CHUNK_SIZE = 1024 * 1024
+
+    @abstractmethod
+    def save(self, name: str, chunks: Iterable[bytes]) -> None:
+        ...
+
+    @abstractmethod
+    def open(self, name: str) -> BinaryIO:
+        ...
+
+    @abstractmethod
+    def delete(self, name: str) -> None:
+        ...
+
+    @abstractmethod
+    def exists(self, name: str) -> bool:
+        ...
+
+    @abstractmethod
+    def size(self, name: str) -> int:
+        ...
+
+    def move(self, source: str, name: str) -> None:
+        with self.open(source) as file:
+            self.save(name, iter(lambda: file.read(self.COPY_CHUNK_SIZE), b""))
+
+        self.delete(source)
+
+    def path(self, name: str) -> Optional[Path]:
+        return None
+
+    def relative_path(self, name: str) -> Optional[PurePosixPath]:
+        return None
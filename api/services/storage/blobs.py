@@ -0,0 +1,61 @@
+from django.db import connection, transaction
+from django.db.models import F
+
+from api.models import StoredBlob
+from api.services.storage.base import StorageBackend
+
+
+def _lock_content(sha256: str) -> None:
+    # Serializes every acquire/release of the same content, including the file operations, across processes.
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT pg_advisory_xact_lock(hashtextextended(%s, 0))", [sha256])
+
+
+def acquire_blob(storage: StorageBackend, staged_name: str, sha256: str, size_bytes: int) -> StoredBlob:
+    with transaction.atomic():
+        _lock_content(sha256)
+
+        blob, _ = StoredBlob.objects.get_or_create(sha256=sha256, defaults={"size_bytes": size_bytes})
+
+        if storage.exists(blob.storage_name):
+            storage.delete(staged_name)
+
+        else:
+            storage.move(staged_name, blob.storage_name)
+
+        StoredBlob.objects.filter(sha256=sha256).update(ref_count=F("ref_count") + 1)
+        blob.ref_count += 1
+
+    return blob
+
+
+def release_blob(storage: StorageBackend, sha256: str) -> None:
+    with transaction.atomic():
+        _lock_content(sha256)
+
+        blob = StoredBlob.objects.filter(sha256=sha256).first()
+        if blob is None:
+            return
+
+        if blob.ref_count > 1:
+            StoredBlob.objects.filter(sha256=sha256).update(ref_count=F("ref_count") - 1)
+            return
+
+        storage_name = blob.storage_name
+        blob.delete()
+
+    transaction.on_commit(lambda: _delete_unreferenced(storage, sha256, storage_name))
+
+
+def discard_unreferenced_blob(storage: StorageBackend, sha256: str) -> None:
+    # For uploads whose transaction rolled back after acquire_blob moved their content into place.
+    _delete_unreferenced(storage, sha256, StoredBlob(sha256=sha256).storage_name)
+
+
+def _delete_unreferenced(storage: StorageBackend, sha256: str, storage_name: str) -> None:
+    with transaction.atomic():
+        _lock_content(sha256)
+
+        # The same content may have been uploaded again since the last reference went away.
+        if not StoredBlob.objects.filter(sha256=sha256).exists():
+            storage.delete(storage_name)
@@ -0,0 +1,66 @@
+import hashlib
+import os
+import uuid
+from pathlib import Path, PurePosixPath
+from typing import BinaryIO, Iterable
+
+from api.services.storage.base import StorageBackend
+
+
+class LocalStorage(StorageBackend):
+    def __init__(self, root: Path):
+        self.root = Path(root)
+
+    def save(self, name: str, chunks: Iterable[bytes]) -> None:
+        path = self.path(name)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        tmp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+
+        try:
+            with open(tmp_path, "wb") as file:
+                for chunk in chunks:
+                    file.write(chunk)
+
+            os.replace(tmp_path, path)
+
+        finally:
+            tmp_path.unlink(missing_ok=True)
+
+    def move(self, source: str, name: str) -> None:
+        path = self.path(name)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        os.replace(self.path(source), path)
+
+    def open(self, name: str) -> BinaryIO:
+        return open(self.path(name), "rb")
+
+    def delete(self, name: str) -> None:
+        self.path(name).unlink(missing_ok=True)
+
+    def exists(self, name: str) -> bool:
+        return self.path(name).is_file()
+
+    def size(self, name: str) -> int:
+        return self.path(name).stat().st_size
+
+    def path(self, name: str) -> Path:
+        return self.root / self.relative_path(name)
+
+    def relative_path(self, name: str) -> PurePosixPath:
+        return PurePosixPath(name)
+
+
+class ShardedLocalStorage(LocalStorage):
+    SHARD_DEPTH = 2
+    SHARD_WIDTH = 2
+
+    def relative_path(self, name: str) -> PurePosixPath:
+        digest = hashlib.sha256(name.encode()).hexdigest()
+        shards = [
+            digest[level * self.SHARD_WIDTH:(level + 1) * self.SHARD_WIDTH]
+            for level in range(self.SHARD_DEPTH)
+        ]
+
+        return PurePosixPath(*shards, name)
@@ -0,0 +1,65 @@
+import uuid
+from typing import BinaryIO
+
+from django.db import transaction
+from rest_framework import serializers
+
+from ImageBankManager.config import config
+from api.models import Image, ImageDuplicate, ImageFingerprint
+from api.services.embeddings.pipeline import enqueue_embedding
+from api.services.fingerprints.duplicates import find_exact_duplicate
+from api.services.fingerprints.pipeline import enqueue_fingerprint
+from api.services.storage import get_storage
+from api.services.storage.blobs import acquire_blob, discard_unreferenced_blob
+from api.services.uploads.streaming import HashingReader
+
+
+def _record_fingerprint(image: Image, sha256: str) -> None:
+    original = find_exact_duplicate(image, sha256)
+
+    if original is None:
+        ImageFingerprint.objects.create(image=image, sha256=sha256)
+        enqueue_fingerprint(image)
+        enqueue_embedding(image)
+        return
+
+    ImageDuplicate.objects.create(image=image, original_image=original.image)
+
+    # Identical bytes have identical perceptual data, so there is nothing left to compute.
+    ImageFingerprint.objects.create(
+        image=image,
+        sha256=sha256,
+        phash=original.phash,
+        embedding=original.embedding,
+    )
+    if original.phash is None:
+        enqueue_fingerprint(image)
+    if original.embedding is None:
+        enqueue_embedding(image)
+
+
+def upload_image(serializer: serializers.ModelSerializer, stream: BinaryIO) -> Image:
+    storage = get_storage()
+    staged_name = f"staged-{uuid.uuid4()}"
+
+    reader = HashingReader(stream, config.UPLOAD_CHUNK_SIZE)
+    storage.save(staged_name, reader)
+
+    try:
+        if reader.size == 0:
+            raise serializers.ValidationError({"detail": "Uploaded file is empty."})
+
+        with transaction.atomic():
+            blob = acquire_blob(storage, staged_name, reader.sha256, reader.size)
+            image: Image = serializer.save(blob=blob, size_bytes=reader.size)
+            _record_fingerprint(image, reader.sha256)
+
+    except Exception:
+        storage.delete(staged_name)
+
+        # The blob row was rolled back, but the content may already have been moved out of the staged file.
+        if reader.size:
+            discard_unreferenced_blob(storage, reader.sha256)
+        raise
+
+    return image
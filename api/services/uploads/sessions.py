@@ -0,0 +1,80 @@
+import os
+import shutil
+import uuid
+from pathlib import Path
+from typing import Any, BinaryIO, Dict
+
+from django.conf import settings
+from rest_framework import serializers
+
+from ImageBankManager.config import config
+from api.models import Image, UploadPart, UploadSession
+from api.serializers.image import ImageUploadSerializer
+from api.services.uploads.images import upload_image
+from api.services.uploads.streaming import ConcatenatedReader, HashingReader
+
+
+def _session_dir(session: UploadSession) -> Path:
+    return Path(settings.MEDIA_ROOT) / "uploads" / str(session.id)
+
+
+def store_upload_part(session: UploadSession, number: int, stream: BinaryIO) -> UploadPart:
+    directory = _session_dir(session)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    tmp_path = directory / f"{number}.{uuid.uuid4()}.tmp"
+    reader = HashingReader(stream, config.UPLOAD_CHUNK_SIZE)
+
+    try:
+        with open(tmp_path, "wb") as file:
+            for chunk in reader:
+                file.write(chunk)
+
+        if reader.size == 0:
+            raise serializers.ValidationError({"detail": "Uploaded part is empty."})
+
+        os.replace(tmp_path, directory / f"{number}.part")
+
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+    part, _ = UploadPart.objects.update_or_create(
+        session=session,
+        number=number,
+        defaults={"size_bytes": reader.size, "sha256": reader.sha256},
+    )
+
+    return part
+
+
+def commit_upload_session(session: UploadSession, context: Dict[str, Any]) -> Image:
+    numbers = list(session.parts.values_list("number", flat=True))
+    missing = sorted(set(range(1, max(numbers, default=0) + 1)) - set(numbers))
+
+    if not numbers:
+        raise serializers.ValidationError({"parts": "No parts have been uploaded."})
+
+    if missing:
+        raise serializers.ValidationError({"parts": f"Missing parts: {missing}."})
+
+    serializer = ImageUploadSerializer(data={
+        "collection": session.collection_id,
+        "filename": session.filename,
+        "mime_type": session.mime_type,
+        "labels": session.labels,
+    }, context=context)
+    serializer.is_valid(raise_exception=True)
+
+    directory = _session_dir(session)
+    with ConcatenatedReader(directory / f"{number}.part" for number in sorted(numbers)) as stream:
+        image = upload_image(serializer, stream)
+
+    discard_upload_session(session)
+
+    return image
+
+
+def discard_upload_session(session: UploadSession) -> None:
+    directory = _session_dir(session)
+    session.delete()
+    shutil.rmtree(directory, ignore_errors=True)
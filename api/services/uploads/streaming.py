@@ -0,0 +1,54 @@
+import hashlib
+from pathlib import Path
+from typing import BinaryIO, Iterable, Iterator, Optional
+
+
+class HashingReader:
+    def __init__(self, stream: BinaryIO, chunk_size: int):
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.size = 0
+        self._sha256 = hashlib.sha256()
+
+    def __iter__(self) -> Iterator[bytes]:
+        while chunk := self.stream.read(self.chunk_size):
+            self._sha256.update(chunk)
+            self.size += len(chunk)
+            yield chunk
+
+    @property
+    def sha256(self) -> str:
+        return self._sha256.hexdigest()
+
+
+class ConcatenatedReader:
+    def __init__(self, paths: Iterable[Path]):
+        self._paths = iter(paths)
+        self._current: Optional[BinaryIO] = None
+
+    def __enter__(self) -> "ConcatenatedReader":
+        return self
+
+    def __exit__(self, *_exc_info) -> None:
+        self.close()
+
+    def read(self, size: int = -1) -> bytes:
+        while True:
+            if self._current is None:
+                path = next(self._paths, None)
+                if path is None:
+                    return b""
+
+                self._current = open(path, "rb")
+
+            data = self._current.read(size)
+            if data:
+                return data
+
+            self._current.close()
+            self._current = None
+
+    def close(self) -> None:
+        if self._current is not None:
+            self._current.close()
+            self._current = None
@@ -1 +1,4 @@
+from . import db_signals
+from . import fingerprint_signals
+from . import image_signals
 from . import user_signals
@@ -0,0 +1,17 @@
+from django.apps import AppConfig
+from django.db import connections
+from django.db.models.signals import pre_migrate
+from django.dispatch import receiver
+
+
+@receiver(pre_migrate)
+def create_vector_extension(
+    sender: AppConfig,
+    using: str,
+    **_kwargs
+) -> None:
+    if sender.name != "api":
+        return
+
+    with connections[using].cursor() as cursor:
+        cursor.execute("CREATE EXTENSION IF NOT EXISTS vector")
@@ -0,0 +1,38 @@
+from typing import Optional, Type
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from api.models import ImageFingerprint
+from api.services.embeddings import index_embeddings, unindex_embeddings
+
+
+@receiver(post_save, sender=ImageFingerprint)
+def index_saved_embedding(
+    sender: Type[ImageFingerprint],
+    instance: ImageFingerprint,
+    created: bool,
+    update_fields: Optional[frozenset],
+    **_kwargs
+) -> None:
+    _ = sender
+    if update_fields is not None and "embedding" not in update_fields:
+        return
+
+    if created and instance.embedding is None:
+        return
+
+    if instance.embedding is None:
+        unindex_embeddings([instance.image_id])
+    else:
+        index_embeddings([instance])
+
+
+@receiver(post_delete, sender=ImageFingerprint)
+def unindex_deleted_embedding(
+    sender: Type[ImageFingerprint],
+    instance: ImageFingerprint,
+    **_kwargs
+) -> None:
+    _ = sender
+    unindex_embeddings([instance.image_id])
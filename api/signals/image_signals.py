@@ -0,0 +1,58 @@
+from typing import Type
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from api.models import Image
+from api.services.labels.facets import invalidate_label_facets
+from api.services.storage import get_storage
+from api.services.storage.blobs import release_blob
+
+
+@receiver(post_delete, sender=Image)
+def delete_stored_file(
+    sender: Type[Image],
+    instance: Image,
+    **_kwargs
+) -> None:
+    _ = sender
+    storage = get_storage()
+
+    if instance.blob_id:
+        release_blob(storage, instance.blob_id)
+        return
+
+    stored_filename = instance.stored_filename
+    transaction.on_commit(lambda: storage.delete(stored_filename))
+
+
+@receiver(post_save, sender=Image)
+def invalidate_facets_on_save(
+    sender: Type[Image],
+    instance: Image,
+    **_kwargs
+) -> None:
+    _ = sender
+    previous_collection_id = getattr(instance, "_loaded_collection_id", None)
+    previous_labels = getattr(instance, "_loaded_labels", [])
+
+    instance._loaded_collection_id = instance.collection_id
+    instance._loaded_labels = list(instance.labels)
+
+    moved = previous_collection_id != instance.collection_id and instance.labels
+    if previous_labels == instance.labels and not moved:
+        return
+
+    invalidate_label_facets([instance.collection_id, previous_collection_id])
+
+
+@receiver(post_delete, sender=Image)
+def invalidate_facets_on_delete(
+    sender: Type[Image],
+    instance: Image,
+    **_kwargs
+) -> None:
+    _ = sender
+    if instance.labels:
+        invalidate_label_facets([instance.collection_id])
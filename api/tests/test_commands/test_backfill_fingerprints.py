@@ -0,0 +1,126 @@
+import hashlib
+import io
+import json
+import tempfile
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from api.models import Collection, Image, ImageFingerprint
+from api.services.fingerprints.phash import compute_phash
+from api.services.storage import get_storage
+from api.tests.test_services.test_fingerprints import make_image
+
+User = get_user_model()
+
+
+class TestBackfillFingerprintsCommand(TestCase):
+    def setUp(self) -> None:
+        self.media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(self.media_root.cleanup)
+        self.enterContext(override_settings(MEDIA_ROOT=self.media_root.name))
+
+        self.user = User.objects.create_user(
+            username="backfill_owner", password="test_password", full_name="Owner"
+        )
+        self.collection = Collection.objects.create(owner=self.user, name="Archive")
+
+    def _create_image(self, content: bytes) -> Image:
+        image = Image.objects.create(
+            collection=self.collection,
+            filename="archived.png",
+            mime_type="image/png",
+            size_bytes=len(content),
+        )
+        get_storage().save(image.stored_filename, [content])
+        return image
+
+    def _backfill(self, **options) -> str:
+        stdout, stderr = io.StringIO(), io.StringIO()
+        call_command("backfill_fingerprints", workers=2, batch_size=2, stdout=stdout, stderr=stderr, **options)
+        return stdout.getvalue() + stderr.getvalue()
+
+    def test_backfills_images_without_fingerprint(self) -> None:
+        contents = [make_image(seed) for seed in range(5)]
+        images = [self._create_image(content) for content in contents]
+
+        output = self._backfill()
+
+        self.assertIn("5 fingerprints written", output)
+        for image, content in zip(images, contents):
+            fingerprint = ImageFingerprint.objects.get(image=image)
+            self.assertEqual(fingerprint.sha256, hashlib.sha256(content).hexdigest())
+            self.assertEqual(fingerprint.phash, compute_phash(io.BytesIO(content)))
+
+    def test_skips_images_that_already_have_a_fingerprint(self) -> None:
+        image = self._create_image(make_image(1))
+        ImageFingerprint.objects.create(image=image, sha256="0" * 64, phash=1)
+
+        self._backfill()
+
+        self.assertEqual(ImageFingerprint.objects.get(image=image).sha256, "0" * 64)
+
+    def test_reports_failures_and_keeps_going(self) -> None:
+        missing = Image.objects.create(
+            collection=self.collection,
+            filename="missing.png",
+            mime_type="image/png",
+            size_bytes=1,
+        )
+        undecodable = self._create_image(b"not an image")
+        valid = self._create_image(make_image(1))
+
+        output = self._backfill()
+
+        self.assertIn(str(missing.id), output)
+        self.assertIn(str(undecodable.id), output)
+        self.assertFalse(ImageFingerprint.objects.filter(image__in=[missing, undecodable]).exists())
+        self.assertIsNotNone(ImageFingerprint.objects.get(image=valid).phash)
+
+    def test_failed_images_are_retried(self) -> None:
+        image = self._create_image(b"not an image")
+        self._backfill()
+
+        content = make_image(1)
+        get_storage().save(image.stored_filename, [content])
+        output = self._backfill()
+
+        self.assertIn("1 fingerprints written", output)
+        self.assertEqual(ImageFingerprint.objects.get(image=image).phash, compute_phash(io.BytesIO(content)))
+
+    def test_checkpoint_resumes_after_last_written_image(self) -> None:
+        first = self._create_image(make_image(1))
+        checkpoint = Path(self.media_root.name) / "backfill.json"
+
+        self._backfill(checkpoint=checkpoint)
+
+        self.assertEqual(json.loads(checkpoint.read_text())["id"], str(first.id))
+
+        ImageFingerprint.objects.all().delete()
+        second = self._create_image(make_image(2))
+
+        self._backfill(checkpoint=checkpoint)
+
+        self.assertFalse(ImageFingerprint.objects.filter(image=first).exists())
+        self.assertTrue(ImageFingerprint.objects.filter(image=second).exists())
+
+    def test_checkpoint_stops_before_failed_image(self) -> None:
+        first = self._create_image(make_image(1))
+        failed = self._create_image(b"not an image")
+        later = [self._create_image(make_image(seed)) for seed in range(2, 5)]
+        checkpoint = Path(self.media_root.name) / "backfill.json"
+
+        self._backfill(checkpoint=checkpoint)
+
+        self.assertEqual(json.loads(checkpoint.read_text())["id"], str(first.id))
+        self.assertEqual(ImageFingerprint.objects.filter(image__in=later).count(), 3)
+
+        content = make_image(5)
+        get_storage().save(failed.stored_filename, [content])
+        output = self._backfill(checkpoint=checkpoint)
+
+        self.assertIn("1 fingerprints written", output)
+        self.assertEqual(ImageFingerprint.objects.get(image=failed).phash, compute_phash(io.BytesIO(content)))
+        self.assertEqual(json.loads(checkpoint.read_text())["id"], str(failed.id))
@@ -0,0 +1,48 @@
+import io
+import tempfile
+import uuid
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from api.models import Collection, Image, ImageFingerprint
+from api.services.embeddings import get_embedding_index
+from api.tests.test_services.test_embeddings import make_embedding
+
+User = get_user_model()
+
+
+class TestEmbeddingIndexCommand(TestCase):
+    def setUp(self) -> None:
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.enterContext(override_settings(EMBEDDING_INDEX_PATH=Path(directory.name) / "embeddings.idx"))
+
+        user = User.objects.create_user(username="index_owner", password="test_password", full_name="Owner")
+        collection = Collection.objects.create(owner=user, name="Photos")
+
+        for embedding in [make_embedding(1.0, 0.0), make_embedding(0.0, 1.0), None]:
+            image = Image.objects.create(
+                collection=collection,
+                filename="photo.jpg",
+                mime_type="image/jpeg",
+                size_bytes=1000,
+            )
+            ImageFingerprint.objects.create(image=image, sha256=uuid.uuid4().hex * 2, embedding=embedding)
+
+    def test_rebuild_indexes_every_embedding(self) -> None:
+        stdout = io.StringIO()
+        call_command("embedding_index", "rebuild", batch_size=1, stdout=stdout)
+
+        self.assertEqual(get_embedding_index().stats(), {"records": 2, "live": 2, "deleted": 0})
+        self.assertIn("live=2", stdout.getvalue())
+
+    def test_compact_after_rebuild(self) -> None:
+        call_command("embedding_index", "rebuild", stdout=io.StringIO())
+        get_embedding_index().remove(ImageFingerprint.objects.values_list("image_id", flat=True)[:1])
+
+        call_command("embedding_index", "compact", stdout=io.StringIO())
+
+        self.assertEqual(get_embedding_index().stats(), {"records": 1, "live": 1, "deleted": 0})
@@ -41,7 +41,8 @@ class TestCollectionSerializer(TestCase):
         self.assertIn("is_default", data)
         self.assertIn("owner", data)
         self.assertIn("labels", data)
-        self.assertIn("images", data)
+        self.assertIn("image_count", data)
+        self.assertIn("recent_images", data)
         self.assertIn("created_at", data)
         self.assertIn("updated_at", data)
 
@@ -108,5 +109,5 @@ class TestCollectionSerializer(TestCase):
 
         self.assertEqual(len(data["labels"]), 2)
         self.assertEqual(data["labels"], ["x", "y"])
-        self.assertEqual(len(data["images"]), 1)
-        self.assertEqual(data["images"][0], self.image.id)
+        self.assertEqual(data["image_count"], 1)
+        self.assertEqual(data["recent_images"], [self.image.id])
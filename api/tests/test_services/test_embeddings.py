@@ -0,0 +1,284 @@
+import io
+import tempfile
+import uuid
+from pathlib import Path
+from unittest import mock, skipIf
+
+import numpy as np
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from ImageBankManager.config import config
+from api.models import Collection, Image, ImageFingerprint, Job
+from api.models.image_fingerprint import build_embedding_index
+from api.serializers.image import ImageUploadSerializer
+from api.services.embeddings import get_embedding_index
+from api.services.embeddings.inference import get_embedding_model, load_model_input, onnxruntime
+from api.services.embeddings.memmap_index import MemmapEmbeddingIndex
+from api.services.embeddings.pipeline import EMBEDDING_JOB
+from api.services.fingerprints.similarity import find_similar, similar_fingerprints
+from api.services.jobs.worker import run_batch
+from api.services.uploads.images import upload_image
+from api.tests.test_services.test_fingerprints import make_image
+
+User = get_user_model()
+
+
+def make_embedding(x: float, y: float, dimensions: int = 512) -> np.ndarray:
+    embedding = np.zeros(dimensions, dtype=np.float32)
+    embedding[:2] = x, y
+    return embedding
+
+
+class TestMemmapEmbeddingIndex(SimpleTestCase):
+    def setUp(self) -> None:
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+
+        self.path = Path(directory.name) / "embeddings.idx"
+        self.index = MemmapEmbeddingIndex(self.path, dimensions=8)
+        self.ids = [uuid.uuid4() for _ in range(4)]
+
+    def _populate(self) -> None:
+        self.index.append([
+            (self.ids[0], make_embedding(1.0, 0.0, 8)),
+            (self.ids[1], make_embedding(5.0, 1.0, 8)),
+            (self.ids[2], make_embedding(0.0, 2.0, 8)),
+            (self.ids[3], make_embedding(-3.0, 0.0, 8)),
+        ])
+
+    def test_search_orders_by_cosine_distance(self) -> None:
+        self._populate()
+
+        results = self.index.search(make_embedding(1.0, 0.0, 8), 3)
+
+        self.assertEqual([image_id for image_id, _ in results], self.ids[:3])
+        self.assertAlmostEqual(results[0][1], 0.0, places=6)
+        self.assertAlmostEqual(results[2][1], 1.0, places=6)
+
+    def test_vectors_are_stored_contiguously(self) -> None:
+        self._populate()
+
+        vectors, ids = self.index._mapped()
+        self.assertTrue(vectors.flags.c_contiguous)
+        self.assertEqual(vectors.shape, (4, 8))
+        self.assertEqual(self.path.stat().st_size, 4 * 8 * 4)
+        self.assertEqual(self.index.ids_path.stat().st_size, 4 * self.index.id_dtype.itemsize)
+
+    def test_removed_and_replaced_vectors_are_not_returned(self) -> None:
+        self._populate()
+
+        self.index.remove([self.ids[0]])
+        self.index.append([(self.ids[3], make_embedding(1.0, 0.0, 8))])
+
+        results = self.index.search(make_embedding(1.0, 0.0, 8), 10)
+        self.assertEqual([image_id for image_id, _ in results], [self.ids[3], self.ids[1], self.ids[2]])
+        self.assertEqual(self.index.stats(), {"records": 5, "live": 3, "deleted": 2})
+
+    def test_compact_drops_deleted_records(self) -> None:
+        self._populate()
+        self.index.remove(self.ids[:2])
+
+        self.index.compact()
+
+        self.assertEqual(self.index.stats(), {"records": 2, "live": 2, "deleted": 0})
+        self.assertEqual(self.path.stat().st_size, 2 * self.index.row_size)
+        self.assertEqual(len(self.index.search(make_embedding(1.0, 0.0, 8), 10)), 2)
+
+    def test_readers_see_changes_made_by_other_writers(self) -> None:
+        reader = MemmapEmbeddingIndex(self.path, dimensions=8)
+        self.assertEqual(reader.search(make_embedding(1.0, 0.0, 8), 1), [])
+
+        self._populate()
+        self.assertEqual(reader.search(make_embedding(1.0, 0.0, 8), 1)[0][0], self.ids[0])
+
+        self.index.remove([self.ids[0]])
+        self.assertEqual(reader.search(make_embedding(1.0, 0.0, 8), 1)[0][0], self.ids[1])
+
+        self.index.compact()
+        self.assertEqual(reader.stats()["records"], 3)
+
+    def test_append_discards_partial_trailing_record(self) -> None:
+        self._populate()
+        with open(self.path, "ab") as file:
+            file.write(b"\1" * (self.index.row_size + 10))
+
+        new_id = uuid.uuid4()
+        self.index.append([(new_id, make_embedding(0.0, -1.0, 8))])
+
+        self.assertEqual(self.index.stats()["live"], 5)
+        self.assertEqual(self.index.search(make_embedding(0.0, -1.0, 8), 1)[0][0], new_id)
+
+    def test_rebuild_replays_changes_made_while_reading(self) -> None:
+        self._populate()
+        writer = MemmapEmbeddingIndex(self.path, dimensions=8)
+        new_id = uuid.uuid4()
+
+        def batches():
+            yield [(self.ids[0], make_embedding(1.0, 0.0, 8)), (self.ids[1], make_embedding(5.0, 1.0, 8))]
+
+            # The write lock is not held while batches are read, so these do not block.
+            writer.remove([self.ids[0]])
+            writer.append([(self.ids[1], make_embedding(0.0, -1.0, 8)), (new_id, make_embedding(-1.0, 0.0, 8))])
+
+            yield [(self.ids[2], make_embedding(0.0, 2.0, 8))]
+
+        self.index.rebuild(batches())
+
+        results = self.index.search(make_embedding(0.0, -1.0, 8), 10)
+        self.assertEqual(results[0][0], self.ids[1])
+        self.assertEqual({image_id for image_id, _ in results}, {self.ids[1], self.ids[2], new_id})
+        self.assertEqual(self.index.stats(), {"records": 5, "live": 3, "deleted": 2})
+
+
+class TestNumpySimilarityBackend(TestCase):
+    def setUp(self) -> None:
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.enterContext(override_settings(EMBEDDING_INDEX_PATH=Path(directory.name) / "embeddings.idx"))
+
+        numpy_config = config.model_copy(update={"SIMILAR_BACKEND": "numpy"})
+        self.enterContext(mock.patch("api.services.embeddings.config", numpy_config))
+        self.enterContext(mock.patch("api.services.fingerprints.similarity.config", numpy_config))
+
+        user = User.objects.create_user(username="numpy_owner", password="test_password", full_name="Owner")
+        self.collection = Collection.objects.create(owner=user, name="Photos")
+
+    def _create_image(self, embedding: np.ndarray) -> Image:
+        image = Image.objects.create(
+            collection=self.collection,
+            filename="photo.jpg",
+            mime_type="image/jpeg",
+            size_bytes=1000,
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            ImageFingerprint.objects.create(image=image, sha256=uuid.uuid4().hex * 2, embedding=embedding)
+
+        return image
+
+    def test_saved_embeddings_are_searchable(self) -> None:
+        target = self._create_image(make_embedding(1.0, 0.0))
+        close = self._create_image(make_embedding(2.0, 0.5))
+        hidden = self._create_image(make_embedding(1.0, 0.1))
+        far = self._create_image(make_embedding(0.0, 1.0))
+
+        similar = find_similar(Image.objects.exclude(id=hidden.id), target.fingerprint, 5, 40)
+
+        self.assertEqual([image.id for image in similar], [close.id, far.id])
+        self.assertLess(similar[0].distance, similar[1].distance)
+
+    def test_deleted_images_leave_the_index(self) -> None:
+        target = self._create_image(make_embedding(1.0, 0.0))
+        deleted = self._create_image(make_embedding(1.0, 0.0))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            deleted.delete()
+
+        self.assertEqual(get_embedding_index().stats()["live"], 1)
+        self.assertEqual(find_similar(Image.objects.all(), target.fingerprint, 5, 40), [])
+
+
+class TestQuantizedEmbeddingIndex(TestCase):
+    # The bundled test database predates halfvec and binary_quantize, so these check the generated SQL.
+    QUANTIZED_EXPRESSIONS = {
+        "half": ('("embedding")::halfvec(512) halfvec_cosine_ops', '(V0."embedding")::halfvec(512) <=>'),
+        "binary": (
+            '(binary_quantize("embedding"))::bit(512) bit_hamming_ops',
+            '(binary_quantize(V0."embedding"))::bit(512) <~>',
+        ),
+    }
+
+    def setUp(self) -> None:
+        self.fingerprint = ImageFingerprint(image_id=uuid.uuid4(), embedding=make_embedding(1.0, 0.0))
+
+    def _index_sql(self, precision: str) -> str:
+        with connection.schema_editor(collect_sql=True) as schema_editor:
+            return str(build_embedding_index(precision).create_sql(ImageFingerprint, schema_editor))
+
+    def test_full_precision_index_covers_column(self) -> None:
+        self.assertIn('("embedding" vector_cosine_ops)', self._index_sql("full"))
+
+        sql = str(similar_fingerprints(Image.objects.all(), self.fingerprint, 5, "full").query)
+        self.assertEqual(sql.count("LIMIT"), 1)
+
+    def test_quantized_index_shortlists_then_reranks(self) -> None:
+        for precision, (index_expression, query_expression) in self.QUANTIZED_EXPRESSIONS.items():
+            with self.subTest(precision=precision):
+                self.assertIn(index_expression, self._index_sql(precision))
+
+                sql = str(similar_fingerprints(Image.objects.all(), self.fingerprint, 5, precision).query)
+                self.assertIn(query_expression, sql)
+                self.assertIn(f"LIMIT {5 * config.SIMILAR_RERANK_FACTOR})", sql)
+                self.assertTrue(sql.endswith("LIMIT 5"))
+
+
+@skipIf(onnxruntime is None, "onnxruntime is not installed")
+class TestEmbeddingPipeline(TestCase):
+    MODEL_PATH = Path(__file__).resolve().parent.parent / "fixtures" / "tiny_embedding.onnx"
+
+    def setUp(self) -> None:
+        media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(media_root.cleanup)
+        self.enterContext(override_settings(MEDIA_ROOT=media_root.name, EMBEDDING_MODEL_PATH=self.MODEL_PATH))
+
+        self.enterContext(mock.patch(
+            "api.services.embeddings.pipeline.config",
+            config.model_copy(update={"EMBEDDING_ENABLED": True, "EMBEDDING_INPUT_SIZE": 32}),
+        ))
+        self.enterContext(mock.patch.dict("api.services.jobs.worker.JOB_BATCH_WINDOWS", {EMBEDDING_JOB: 0}))
+
+        user = User.objects.create_user(username="embedding_owner", password="test_password", full_name="Owner")
+        self.collection = Collection.objects.create(owner=user, name="Photos")
+
+    def _upload(self, content: bytes) -> Image:
+        serializer = ImageUploadSerializer(data={
+            "collection": self.collection.id,
+            "filename": "photo.png",
+            "mime_type": "image/png",
+        })
+        serializer.is_valid(raise_exception=True)
+        return upload_image(serializer, io.BytesIO(content))
+
+    def test_upload_enqueues_embedding_job(self) -> None:
+        image = self._upload(make_image(1))
+
+        self.assertEqual(
+            Job.objects.get(kind=EMBEDDING_JOB).payload,
+            {"image": str(image.id)},
+        )
+
+    def test_worker_embeds_whole_batch_in_one_run(self) -> None:
+        contents = [make_image(seed) for seed in range(3)]
+        images = [self._upload(content) for content in contents]
+        broken = self._upload(b"not an image")
+
+        model = get_embedding_model()
+        with mock.patch.object(model.session, "run", wraps=model.session.run) as run, \
+                self.assertLogs("api.services.jobs.worker", "WARNING"):
+            self.assertEqual(run_batch(EMBEDDING_JOB), 4)
+
+        run.assert_called_once()
+        [pixels] = run.call_args.args[1].values()
+        self.assertEqual(pixels.shape, (3, 3, 32, 32))
+
+        for image, content in zip(images, contents):
+            image.fingerprint.refresh_from_db()
+            expected = model.embed(load_model_input(io.BytesIO(content), 32)[np.newaxis])[0]
+
+            np.testing.assert_allclose(image.fingerprint.embedding, expected, rtol=1e-5)
+            self.assertAlmostEqual(float(np.linalg.norm(image.fingerprint.embedding)), 1.0, places=5)
+
+        broken.fingerprint.refresh_from_db()
+        self.assertIsNone(broken.fingerprint.embedding)
+
+    def test_duplicate_upload_reuses_embedding(self) -> None:
+        content = make_image(1)
+        self._upload(content)
+        run_batch(EMBEDDING_JOB)
+
+        duplicate = self._upload(content)
+
+        self.assertIsNotNone(duplicate.fingerprint.embedding)
+        self.assertEqual(Job.objects.filter(kind=EMBEDDING_JOB).count(), 1)
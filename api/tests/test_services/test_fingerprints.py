@@ -0,0 +1,148 @@
+import io
+import tempfile
+
+import numpy as np
+from PIL import Image as PILImage
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+
+from api.models import Collection, Image, ImageFingerprint, Job
+from api.serializers.image import ImageUploadSerializer
+from api.services.fingerprints.phash import compute_phash, load_pixels, phash_batch
+from api.services.jobs.worker import run_once
+from api.services.uploads.images import upload_image
+
+User = get_user_model()
+
+
+def make_image(seed: int, size: int = 64, image_format: str = "PNG") -> bytes:
+    rng = np.random.default_rng(seed)
+    pixels = rng.integers(0, 256, (size, size, 3), dtype=np.uint8)
+
+    buffer = io.BytesIO()
+    PILImage.fromarray(pixels).save(buffer, format=image_format)
+    return buffer.getvalue()
+
+
+class TestPerceptualHash(TestCase):
+    def test_identical_content_has_identical_hash(self) -> None:
+        self.assertEqual(
+            compute_phash(io.BytesIO(make_image(1))),
+            compute_phash(io.BytesIO(make_image(1))),
+        )
+
+    def test_resized_image_is_close(self) -> None:
+        original = compute_phash(io.BytesIO(make_image(1, size=64)))
+
+        with PILImage.open(io.BytesIO(make_image(1, size=64))) as image:
+            buffer = io.BytesIO()
+            image.resize((128, 128)).save(buffer, format="PNG")
+
+        resized = compute_phash(io.BytesIO(buffer.getvalue()))
+        different = compute_phash(io.BytesIO(make_image(2)))
+
+        distance = ((original ^ resized) & (2 ** 64 - 1)).bit_count()
+        self.assertLessEqual(distance, 8)
+        self.assertGreater(((original ^ different) & (2 ** 64 - 1)).bit_count(), distance)
+
+    def test_batch_matches_single_image_hashes(self) -> None:
+        contents = [make_image(seed) for seed in range(5)] + [make_image(9, image_format="JPEG")]
+
+        pixels = np.stack([load_pixels(io.BytesIO(content)) for content in contents])
+        batch = phash_batch(pixels)
+
+        self.assertEqual(batch.dtype, np.int64)
+        self.assertEqual(
+            batch.tolist(),
+            [compute_phash(io.BytesIO(content)) for content in contents],
+        )
+
+    def test_hash_bits_are_packed_as_signed_big_endian(self) -> None:
+        pixels = np.zeros((1, 32, 32), dtype=np.float32)
+        pixels[0, :16] = 255
+
+        [phash] = phash_batch(pixels).tolist()
+
+        unsigned = phash & (2 ** 64 - 1)
+        self.assertEqual(unsigned >> 63, 1)
+        self.assertEqual(phash, unsigned - 2 ** 64)
+
+    def test_phash_bands_split_unsigned_hash(self) -> None:
+        self.assertEqual(
+            ImageFingerprint.split_phash(-0x0123_4567_89AB_CDF0),
+            [0xFEDC, 0xBA98, 0x7654, 0x3210],
+        )
+        self.assertEqual(ImageFingerprint.split_phash(None), [None] * 4)
+
+
+class TestFingerprintPipeline(TestCase):
+    def setUp(self) -> None:
+        self.media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(self.media_root.cleanup)
+        self.enterContext(override_settings(MEDIA_ROOT=self.media_root.name))
+
+        self.user = User.objects.create_user(
+            username="fingerprint_owner", password="test_password", full_name="Owner"
+        )
+        self.collection = Collection.objects.create(owner=self.user, name="Photos")
+
+    def _upload(self, content: bytes) -> Image:
+        serializer = ImageUploadSerializer(data={
+            "collection": self.collection.id,
+            "filename": "photo.png",
+            "mime_type": "image/png",
+        })
+        serializer.is_valid(raise_exception=True)
+        return upload_image(serializer, io.BytesIO(content))
+
+    def test_upload_enqueues_fingerprint_job(self) -> None:
+        image = self._upload(make_image(1))
+
+        job = Job.objects.get()
+        self.assertEqual(job.kind, "fingerprint")
+        self.assertEqual(job.payload, {"image": str(image.id)})
+        self.assertIsNone(image.fingerprint.phash)
+
+    def test_worker_computes_phash(self) -> None:
+        content = make_image(1)
+        image = self._upload(content)
+
+        self.assertEqual(run_once(), 1)
+
+        fingerprint = ImageFingerprint.objects.get(image=image)
+        self.assertEqual(fingerprint.phash, compute_phash(io.BytesIO(content)))
+        self.assertEqual(fingerprint.phash_bands, ImageFingerprint.split_phash(fingerprint.phash))
+        self.assertEqual(Job.objects.get().status, Job.Status.DONE)
+
+    def test_worker_hashes_batch_with_partial_failures(self) -> None:
+        contents = [make_image(seed) for seed in range(3)]
+        images = [self._upload(content) for content in contents]
+        broken = self._upload(b"not an image")
+
+        with self.assertLogs("api.services.jobs.worker", "WARNING"):
+            self.assertEqual(run_once(), 4)
+
+        for image, content in zip(images, contents):
+            image.fingerprint.refresh_from_db()
+            self.assertEqual(image.fingerprint.phash, compute_phash(io.BytesIO(content)))
+
+        broken.fingerprint.refresh_from_db()
+        self.assertIsNone(broken.fingerprint.phash)
+        self.assertEqual(Job.objects.filter(status=Job.Status.DONE).count(), 3)
+
+    def test_undecodable_image_is_retried(self) -> None:
+        self._upload(b"not an image")
+
+        with self.assertLogs("api.services.jobs.worker", "WARNING"):
+            run_once()
+
+        job = Job.objects.get()
+        self.assertEqual(job.status, Job.Status.PENDING)
+        self.assertIn("UnidentifiedImageError", job.last_error)
+
+    def test_deleted_image_job_completes(self) -> None:
+        self._upload(make_image(1)).delete()
+
+        run_once()
+
+        self.assertEqual(Job.objects.get().status, Job.Status.DONE)
@@ -0,0 +1,163 @@
+import io
+from datetime import timedelta
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from api.models import Job
+from api.services.jobs.queue import (
+    batch_ready,
+    claim,
+    complete,
+    enqueue,
+    fail,
+    prune_done,
+    queue_depth,
+    requeue_stale,
+)
+from api.services.jobs.worker import run_batch
+
+
+class TestJobQueue(TestCase):
+    KIND = "test"
+
+    def test_claim_marks_jobs_running_in_due_order(self) -> None:
+        later = enqueue(self.KIND, {"n": 2}, run_after=timezone.now() - timedelta(seconds=1))
+        earlier = enqueue(self.KIND, {"n": 1}, run_after=timezone.now() - timedelta(seconds=10))
+        enqueue(self.KIND, {"n": 3}, run_after=timezone.now() + timedelta(hours=1))
+
+        jobs = claim(self.KIND, 10)
+
+        self.assertEqual([job.id for job in jobs], [earlier.id, later.id])
+        later.refresh_from_db()
+        self.assertEqual(later.status, Job.Status.RUNNING)
+        self.assertEqual(later.attempts, 1)
+        self.assertEqual(claim(self.KIND, 10), [])
+
+    def test_claim_respects_limit(self) -> None:
+        for n in range(5):
+            enqueue(self.KIND, {"n": n})
+
+        self.assertEqual(len(claim(self.KIND, 3)), 3)
+        self.assertEqual(len(claim(self.KIND, 3)), 2)
+
+    def test_failed_job_is_retried_with_backoff_then_marked_failed(self) -> None:
+        job = enqueue(self.KIND, {})
+
+        with mock.patch("api.services.jobs.queue.config") as config:
+            config.JOB_MAX_ATTEMPTS = 2
+            config.JOB_RETRY_DELAY = 30
+
+            [job] = claim(self.KIND, 1)
+            fail(job, "boom")
+            job.refresh_from_db()
+
+            self.assertEqual(job.status, Job.Status.PENDING)
+            self.assertEqual(job.last_error, "boom")
+            self.assertGreater(job.run_after, timezone.now() + timedelta(seconds=20))
+
+            Job.objects.filter(id=job.id).update(run_after=timezone.now())
+            [job] = claim(self.KIND, 1)
+            fail(job, "boom again")
+            job.refresh_from_db()
+
+            self.assertEqual(job.status, Job.Status.FAILED)
+            self.assertEqual(job.attempts, 2)
+
+    def test_complete(self) -> None:
+        enqueue(self.KIND, {})
+        jobs = claim(self.KIND, 1)
+        complete(jobs)
+
+        self.assertEqual(Job.objects.get().status, Job.Status.DONE)
+
+    def test_prune_done_deletes_only_old_finished_jobs(self) -> None:
+        for _ in range(3):
+            enqueue(self.KIND, {})
+        old, recent = claim(self.KIND, 2)
+        complete([old, recent])
+        Job.objects.filter(id=old.id).update(updated_at=timezone.now() - timedelta(days=2))
+
+        self.assertEqual(prune_done(timedelta(days=1)), 1)
+        self.assertEqual(sorted(Job.objects.values_list("status", flat=True)), [Job.Status.DONE, Job.Status.PENDING])
+
+    def test_run_jobs_prunes_finished_jobs(self) -> None:
+        enqueue(self.KIND, {})
+        complete(claim(self.KIND, 1))
+        Job.objects.update(updated_at=timezone.now() - timedelta(hours=2))
+
+        stdout = io.StringIO()
+        call_command("run_jobs", prune_done_older_than=3600, stdout=stdout)
+
+        self.assertIn("Deleted 1 finished jobs.", stdout.getvalue())
+        self.assertFalse(Job.objects.exists())
+
+    def test_requeue_stale_running_jobs(self) -> None:
+        enqueue(self.KIND, {})
+        claim(self.KIND, 1)
+        Job.objects.update(locked_at=timezone.now() - timedelta(days=1))
+
+        self.assertEqual(requeue_stale(), 1)
+        self.assertEqual(Job.objects.get().status, Job.Status.PENDING)
+
+    def test_queue_depth(self) -> None:
+        enqueue(self.KIND, {}, run_after=timezone.now() - timedelta(minutes=5))
+        enqueue(self.KIND, {})
+        enqueue("other", {})
+
+        depth = queue_depth(self.KIND)
+
+        self.assertEqual(depth["pending"], 2)
+        self.assertEqual(depth["running"], 0)
+        self.assertGreaterEqual(depth["oldest_pending_seconds"], 300)
+
+    def test_run_batch_reports_handler_failures_per_job(self) -> None:
+        ok = enqueue(self.KIND, {})
+        broken = enqueue(self.KIND, {})
+
+        handler = mock.Mock(return_value={broken.id: "bad image"})
+        with mock.patch.dict("api.services.jobs.worker.JOB_HANDLERS", {self.KIND: handler}):
+            with self.assertLogs("api.services.jobs.worker", "WARNING"):
+                self.assertEqual(run_batch(self.KIND), 2)
+
+        ok.refresh_from_db()
+        broken.refresh_from_db()
+        self.assertEqual(ok.status, Job.Status.DONE)
+        self.assertEqual(broken.status, Job.Status.PENDING)
+        self.assertEqual(broken.last_error, "bad image")
+
+    def test_batch_ready_when_full_or_oldest_job_waited(self) -> None:
+        enqueue(self.KIND, {})
+        self.assertFalse(batch_ready(self.KIND, 2, 60))
+
+        enqueue(self.KIND, {})
+        self.assertTrue(batch_ready(self.KIND, 2, 60))
+        self.assertFalse(batch_ready(self.KIND, 3, 60))
+
+        Job.objects.update(run_after=timezone.now() - timedelta(seconds=61))
+        self.assertTrue(batch_ready(self.KIND, 3, 60))
+
+    def test_run_batch_waits_for_batch_window(self) -> None:
+        enqueue(self.KIND, {})
+
+        handler = mock.Mock(return_value={})
+        with mock.patch.dict("api.services.jobs.worker.JOB_HANDLERS", {self.KIND: handler}), \
+                mock.patch.dict("api.services.jobs.worker.JOB_BATCH_WINDOWS", {self.KIND: 60}):
+            self.assertEqual(run_batch(self.KIND, 2), 0)
+
+            enqueue(self.KIND, {})
+            self.assertEqual(run_batch(self.KIND, 2), 2)
+
+        handler.assert_called_once()
+
+    def test_run_batch_drain_ignores_batch_window(self) -> None:
+        enqueue(self.KIND, {})
+
+        handler = mock.Mock(return_value={})
+        with mock.patch.dict("api.services.jobs.worker.JOB_HANDLERS", {self.KIND: handler}), \
+                mock.patch.dict("api.services.jobs.worker.JOB_BATCH_WINDOWS", {self.KIND: 60}):
+            self.assertEqual(run_batch(self.KIND, 2, drain=True), 1)
+
+        self.assertEqual(Job.objects.get().status, Job.Status.DONE)
@@ -0,0 +1,87 @@
+import io
+
+from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from guardian.models import UserObjectPermission
+from guardian.shortcuts import assign_perm, get_perms
+
+from api.models import Collection, Image
+from api.services.permissions.collections import revoke_collection_share_from_user, share_collection_with_user
+from api.services.permissions.enums import Permission
+
+User = get_user_model()
+
+
+class TestCollectionSharing(TestCase):
+    def setUp(self) -> None:
+        self.owner = User.objects.create_user(username="owner", password="test_password", full_name="Owner")
+        self.user = User.objects.create_user(username="user", password="test_password", full_name="User")
+        self.collection = Collection.objects.create(owner=self.owner, name="Shared")
+        self.other = Collection.objects.create(owner=self.owner, name="Other")
+
+        self.image = self._create_image(self.collection)
+        self.other_image = self._create_image(self.other)
+
+    def _create_image(self, collection: Collection) -> Image:
+        return Image.objects.create(
+            collection=collection,
+            filename="image.jpg",
+            mime_type="image/jpeg",
+            size_bytes=10,
+        )
+
+    def _image_permission_rows(self) -> int:
+        return UserObjectPermission.objects.filter(content_type=ContentType.objects.get_for_model(Image)).count()
+
+    def test_share_grants_image_perms_through_collection(self) -> None:
+        share_collection_with_user(self.collection, self.user, [Permission.VIEW, Permission.CHANGE])
+
+        self.assertCountEqual(get_perms(self.user, self.collection), ["view_collection", "change_collection"])
+        self.assertTrue(self.user.has_perm("api.view_image", self.image))
+        self.assertTrue(self.user.has_perm("change_image", self.image))
+        self.assertFalse(self.user.has_perm("api.delete_image", self.image))
+        self.assertFalse(self.user.has_perm("api.view_image", self.other_image))
+        self.assertEqual(self.user.get_all_permissions(self.image), {"view_image", "change_image"})
+        self.assertEqual(self._image_permission_rows(), 0)
+
+    def test_images_added_after_share_inherit_perms(self) -> None:
+        share_collection_with_user(self.collection, self.user, [Permission.VIEW])
+
+        image = self._create_image(self.collection)
+
+        self.assertTrue(self.user.has_perm("api.view_image", image))
+
+    def test_image_perm_check_does_not_load_collection(self) -> None:
+        share_collection_with_user(self.collection, self.user, [Permission.VIEW])
+        image = Image.objects.get(id=self.image.id)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertTrue(self.user.has_perm("api.view_image", image))
+
+        self.assertFalse(any('"api_collection"' in query["sql"] for query in queries))
+
+    def test_revoke_removes_only_given_perms(self) -> None:
+        share_collection_with_user(self.collection, self.user, [Permission.VIEW, Permission.CHANGE])
+
+        revoke_collection_share_from_user(self.collection, self.user, [Permission.CHANGE])
+
+        self.assertEqual(get_perms(self.user, self.collection), ["view_collection"])
+        self.assertTrue(self.user.has_perm("api.view_image", self.image))
+        self.assertFalse(self.user.has_perm("api.change_image", self.image))
+
+    def test_image_level_rows_are_ignored_and_pruned(self) -> None:
+        assign_perm("view_image", self.user, self.image)
+
+        self.assertFalse(self.user.has_perm("api.view_image", self.image))
+
+        call_command("prune_image_permissions", stdout=io.StringIO())
+        self.assertEqual(self._image_permission_rows(), 0)
+
+    def test_superuser_has_all_image_perms(self) -> None:
+        admin = User.objects.create_superuser(username="admin", password="test_password", full_name="Admin")
+
+        self.assertTrue(admin.has_perm("api.delete_image", self.image))
@@ -0,0 +1,70 @@
+import tempfile
+from pathlib import Path
+
+from django.test import SimpleTestCase
+
+from api.services.storage import LocalStorage, ShardedLocalStorage
+
+
+class TestLocalStorage(SimpleTestCase):
+    storage_class = LocalStorage
+    NAME = "0b7e5cf2-4bfb-4a61-9c0e-1d6f0c3c8a52.jpeg"
+
+    def setUp(self) -> None:
+        self.root = tempfile.TemporaryDirectory()
+        self.addCleanup(self.root.cleanup)
+        self.storage = self.storage_class(Path(self.root.name))
+
+    def test_save_and_open_round_trip(self) -> None:
+        self.storage.save(self.NAME, iter([b"abc", b"def"]))
+
+        self.assertTrue(self.storage.exists(self.NAME))
+        self.assertEqual(self.storage.size(self.NAME), 6)
+
+        with self.storage.open(self.NAME) as file:
+            self.assertEqual(file.read(), b"abcdef")
+
+    def test_save_overwrites_existing_file(self) -> None:
+        self.storage.save(self.NAME, [b"old"])
+        self.storage.save(self.NAME, [b"new"])
+
+        with self.storage.open(self.NAME) as file:
+            self.assertEqual(file.read(), b"new")
+
+    def test_failed_save_leaves_no_partial_file(self) -> None:
+        def chunks():
+            yield b"partial"
+            raise IOError("connection reset")
+
+        with self.assertRaises(IOError):
+            self.storage.save(self.NAME, chunks())
+
+        self.assertFalse(self.storage.exists(self.NAME))
+        self.assertEqual([path for path in Path(self.root.name).rglob("*") if path.is_file()], [])
+
+    def test_delete(self) -> None:
+        self.storage.save(self.NAME, [b"abc"])
+        self.storage.delete(self.NAME)
+        self.storage.delete(self.NAME)
+
+        self.assertFalse(self.storage.exists(self.NAME))
+
+    def test_move(self) -> None:
+        self.storage.save(self.NAME, [b"abc"])
+        self.storage.move(self.NAME, "moved.jpeg")
+
+        self.assertFalse(self.storage.exists(self.NAME))
+        with self.storage.open("moved.jpeg") as file:
+            self.assertEqual(file.read(), b"abc")
+
+
+class TestShardedLocalStorage(TestLocalStorage):
+    storage_class = ShardedLocalStorage
+
+    def test_files_are_spread_over_hash_prefixed_directories(self) -> None:
+        self.storage.save(self.NAME, [b"abc"])
+
+        relative = self.storage.path(self.NAME).relative_to(self.root.name)
+        self.assertEqual(len(relative.parts), 3)
+        self.assertEqual(relative.name, self.NAME)
+        self.assertTrue(all(len(part) == 2 for part in relative.parts[:2]))
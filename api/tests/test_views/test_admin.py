@@ -0,0 +1,58 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from api.models import Collection, Image, ImageDuplicate, ImageFingerprint, UploadSession
+
+User = get_user_model()
+
+
+class TestAdminChangelists(TestCase):
+    MODELS = ["user", "collection", "image", "imagefingerprint", "imageduplicate", "uploadsession", "job"]
+
+    def setUp(self) -> None:
+        self.admin = User.objects.create_superuser(username="admin", password="test_password", full_name="Admin")
+        self.client.force_login(self.admin)
+
+        self.original = self._create_rows(0)
+
+    def _create_rows(self, index: int) -> Image:
+        owner = User.objects.create_user(username=f"user{index}", password="test_password", full_name="User")
+        collection = Collection.objects.create(owner=owner, name=f"Collection {index}")
+        image = Image.objects.create(
+            collection=collection,
+            filename=f"image{index}.jpg",
+            mime_type="image/jpeg",
+            size_bytes=10,
+        )
+        ImageFingerprint.objects.update_or_create(image=image, defaults={"sha256": f"{index:064x}"})
+        UploadSession.objects.create(owner=owner, collection=collection, filename="upload.jpg", mime_type="image/jpeg")
+
+        if index:
+            ImageDuplicate.objects.create(image=image, original_image=self.original)
+
+        return image
+
+    def test_changelists_render(self) -> None:
+        for model in self.MODELS:
+            with self.subTest(model=model):
+                resp = self.client.get(reverse(f"admin:api_{model}_changelist"))
+                self.assertEqual(resp.status_code, 200)
+
+    def test_changelist_query_count_does_not_grow_with_rows(self) -> None:
+        self._create_rows(1)
+
+        baselines = {}
+        for model in self.MODELS:
+            with CaptureQueriesContext(connection) as queries:
+                self.client.get(reverse(f"admin:api_{model}_changelist"))
+            baselines[model] = len(queries)
+
+        for index in range(2, 12):
+            self._create_rows(index)
+
+        for model in self.MODELS:
+            with self.subTest(model=model), self.assertNumQueries(baselines[model]):
+                self.client.get(reverse(f"admin:api_{model}_changelist"))
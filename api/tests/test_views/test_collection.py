@@ -1,13 +1,20 @@
 from typing import Any, Dict, List
+from unittest import mock
 from uuid import UUID
 
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.core.exceptions import ValidationError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APITestCase, APIClient
 
+from ImageBankManager.config import config
 from api.models import Collection, Image
+from api.services.permissions.collections import revoke_collection_share_from_user, share_collection_with_user
+from api.services.permissions.enums import Permission
 
 User = get_user_model()
 
@@ -56,7 +63,7 @@ class TestCollectionViewSet(APITestCase):
         resp = self.client.get(self.list_url)
         self.assertEqual(resp.status_code, status.HTTP_200_OK)
 
-        data: List[Dict[str, Any]] = resp.json()
+        data: List[Dict[str, Any]] = resp.json()["results"]
         self.assertGreaterEqual(len(data), 2)
 
         created_values = [item["created_at"] for item in data]
@@ -179,3 +186,148 @@ class TestCollectionViewSet(APITestCase):
 
         default_count = Collection.objects.filter(owner=self.user1, is_default=True).count()
         self.assertEqual(default_count, 1)
+
+    def test_filter_by_labels(self) -> None:
+        resp = self.client.get(self.list_url, {"labels": "bar,foo"})
+        self.assertEqual([item["id"] for item in resp.json()["results"]], [str(self.collection1.id)])
+
+        resp = self.client.get(self.list_url, {"labels_any": "alpha,missing"})
+        self.assertEqual([item["id"] for item in resp.json()["results"]], [str(self.collection2.id)])
+
+    def test_list_query_count_does_not_grow_with_collections(self) -> None:
+        with CaptureQueriesContext(connection) as baseline:
+            self.client.get(self.list_url)
+
+        for i in range(10):
+            collection = Collection.objects.create(owner=self.user1, name=f"Extra {i}")
+            Image.objects.create(
+                collection=collection,
+                filename="filename.jpg",
+                mime_type="image/jpeg",
+                size_bytes=1234,
+            )
+
+        with self.assertNumQueries(len(baseline)):
+            resp = self.client.get(self.list_url)
+        self.assertEqual(len(resp.json()["results"]), Collection.objects.count())
+
+    def test_list_includes_image_count_and_recent_images(self) -> None:
+        newer = Image.objects.create(
+            collection=self.collection1,
+            filename="newer.jpg",
+            mime_type="image/jpeg",
+            size_bytes=1234,
+        )
+
+        resp = self.client.get(self.list_url)
+        items = {item["id"]: item for item in resp.json()["results"]}
+
+        self.assertEqual(items[str(self.collection1.id)]["image_count"], 2)
+        self.assertEqual(items[str(self.collection1.id)]["recent_images"], [str(newer.id), str(self.image.id)])
+        self.assertEqual(items[str(self.collection2.id)]["image_count"], 0)
+        self.assertEqual(items[str(self.collection2.id)]["recent_images"], [])
+
+    def test_recent_images_are_capped(self) -> None:
+        for i in range(3):
+            Image.objects.create(
+                collection=self.collection1,
+                filename=f"extra{i}.jpg",
+                mime_type="image/jpeg",
+                size_bytes=1234,
+            )
+
+        with mock.patch("api.models.collection.config", config.model_copy(update={"COLLECTION_PREVIEW_SIZE": 2})):
+            resp = self.client.get(reverse("collection-detail", args=[self.collection1.id]))
+
+        self.assertEqual(resp.json()["image_count"], 4)
+        self.assertEqual(len(resp.json()["recent_images"]), 2)
+
+    def test_images_lists_collection_images_paginated(self) -> None:
+        for i in range(2):
+            Image.objects.create(
+                collection=self.collection1,
+                filename=f"extra{i}.jpg",
+                mime_type="image/jpeg",
+                size_bytes=1234,
+            )
+        url = reverse("collection-images", args=[self.collection1.id])
+
+        first = self.client.get(url, {"page_size": 2})
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(first.json()["results"]), 2)
+
+        second = self.client.get(first.json()["next"])
+        self.assertEqual(len(second.json()["results"]), 1)
+        self.assertIsNone(second.json()["next"])
+
+        ids = {item["id"] for item in first.json()["results"] + second.json()["results"]}
+        self.assertEqual(ids, {str(i) for i in self.collection1.images.values_list("id", flat=True)})
+
+
+class TestCollectionVisibility(APITestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+        self.user = User.objects.create_user(username="viewer", password="test_password", full_name="Viewer")
+        self.owner = User.objects.create_user(username="owner", password="test_password", full_name="Owner")
+        self.shared = Collection.objects.create(owner=self.owner, name="Shared")
+        self.private = Collection.objects.create(owner=self.owner, name="Private")
+
+        share_collection_with_user(self.shared, self.user, [Permission.VIEW])
+        self.client.force_authenticate(self.user)
+
+    def _listed_ids(self) -> set:
+        return {item["id"] for item in self.client.get(reverse("collection-list")).json()["results"]}
+
+    def test_list_returns_owned_and_shared_collections(self) -> None:
+        own = self.user.collections.get()
+
+        self.assertEqual(self._listed_ids(), {str(own.id), str(self.shared.id)})
+
+    def test_detail_of_hidden_collection_is_not_found(self) -> None:
+        resp = self.client.get(reverse("collection-detail", args=[self.private.id]))
+
+        self.assertEqual(resp.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_view_only_sharee_cannot_change_or_delete(self) -> None:
+        url = reverse("collection-detail", args=[self.shared.id])
+
+        resp = self.client.patch(url, data={"name": "Renamed"}, format="json")
+        self.assertEqual(resp.status_code, status.HTTP_404_NOT_FOUND)
+
+        resp = self.client.delete(url)
+        self.assertEqual(resp.status_code, status.HTTP_404_NOT_FOUND)
+
+        self.shared.refresh_from_db()
+        self.assertEqual(self.shared.name, "Shared")
+
+    def test_change_sharee_can_rename(self) -> None:
+        with self.captureOnCommitCallbacks(execute=True):
+            share_collection_with_user(self.shared, self.user, [Permission.CHANGE])
+
+        resp = self.client.patch(reverse("collection-detail", args=[self.shared.id]), data={"name": "Renamed"})
+
+        self.assertEqual(resp.status_code, status.HTTP_200_OK, resp.content)
+        self.assertEqual(resp.json()["name"], "Renamed")
+
+    def test_revoke_hides_collection(self) -> None:
+        self.assertIn(str(self.shared.id), self._listed_ids())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            revoke_collection_share_from_user(self.shared, self.user, [Permission.VIEW])
+
+        self.assertNotIn(str(self.shared.id), self._listed_ids())
+
+    def test_shared_ids_are_cached(self) -> None:
+        self._listed_ids()
+
+        with CaptureQueriesContext(connection) as queries:
+            self._listed_ids()
+
+        self.assertFalse(any("guardian_" in query["sql"] for query in queries))
+
+    def test_anonymous_users_see_nothing(self) -> None:
+        self.client.force_authenticate(None)
+
+        self.assertEqual(self._listed_ids(), set())
@@ -1,13 +1,26 @@
+import hashlib
+import tempfile
 from datetime import datetime, timezone
+from pathlib import Path
 from typing import Any, Dict, List
+from unittest import mock
+from urllib.parse import urlencode
 from uuid import UUID
 
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APITestCase, APIClient
 
-from api.models import Image, Collection
+from ImageBankManager.config import config
+from api.models import Image, Collection, ImageDuplicate, ImageFingerprint, StoredBlob
+from api.services.permissions.collections import share_collection_with_user
+from api.services.permissions.enums import Permission
+from api.services.storage import get_storage
 
 User = get_user_model()
 
@@ -57,7 +70,7 @@ class TestImageViewSet(APITestCase):
         resp = self.client.get(self.list_url)
         self.assertEqual(resp.status_code, status.HTTP_200_OK)
 
-        data: List[Dict[str, Any]] = resp.json()
+        data: List[Dict[str, Any]] = resp.json()["results"]
         self.assertGreaterEqual(len(data), 2)
 
         created_values = [item["created_at"] for item in data]
@@ -159,3 +172,940 @@ class TestImageViewSet(APITestCase):
         resp = self.client.delete(url)
         self.assertEqual(resp.status_code, status.HTTP_204_NO_CONTENT)
         self.assertFalse(Image.objects.filter(id=image.id).exists())
+
+    def test_filter_by_all_labels(self) -> None:
+        resp = self.client.get(self.list_url, {"labels": "baz,bar"})
+        self.assertEqual([item["id"] for item in resp.json()["results"]], [str(self.image2.id)])
+
+        resp = self.client.get(self.list_url, {"labels": "foo,bar"})
+        self.assertEqual(resp.json()["results"], [])
+
+    def test_filter_by_any_label(self) -> None:
+        resp = self.client.get(self.list_url, {"labels_any": "foo, baz"})
+        self.assertEqual({item["id"] for item in resp.json()["results"]}, {str(self.image1.id), str(self.image2.id)})
+
+        resp = self.client.get(self.list_url, {"labels_any": "foo,baz", "labels": "baz"})
+        self.assertEqual([item["id"] for item in resp.json()["results"]], [str(self.image2.id)])
+
+    def test_label_filters_use_gin_index(self) -> None:
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+            cursor.execute("SET LOCAL enable_sort = off")
+
+        self.assertIn("image_labels_gin_idx", Image.objects.filter(labels__contains=["foo"]).explain())
+        self.assertIn("image_labels_gin_idx", Image.objects.filter(labels__overlap=["foo"]).explain())
+
+    def test_list_is_limited_to_visible_images(self) -> None:
+        self.client.force_authenticate(self.user1)
+
+        resp = self.client.get(self.list_url)
+        self.assertEqual([item["id"] for item in resp.json()["results"]], [str(self.image1.id)])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            share_collection_with_user(self.col2, self.user1, [Permission.VIEW])
+
+        resp = self.client.get(self.list_url)
+        self.assertEqual({item["id"] for item in resp.json()["results"]}, {str(self.image1.id), str(self.image2.id)})
+
+    def test_view_only_sharee_cannot_change_or_delete(self) -> None:
+        with self.captureOnCommitCallbacks(execute=True):
+            share_collection_with_user(self.col2, self.user1, [Permission.VIEW])
+        self.client.force_authenticate(self.user1)
+        url = reverse("image-detail", kwargs={"pk": str(self.image2.id)})
+
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_200_OK)
+
+        resp = self.client.patch(url, data={"filename": "patch.jpg"}, format="json")
+        self.assertEqual(resp.status_code, status.HTTP_404_NOT_FOUND)
+
+        resp = self.client.delete(url)
+        self.assertEqual(resp.status_code, status.HTTP_404_NOT_FOUND)
+
+        self.image2.refresh_from_db()
+        self.assertEqual(self.image2.filename, "image2.jpg")
+
+    def test_change_sharee_can_update_but_not_delete(self) -> None:
+        with self.captureOnCommitCallbacks(execute=True):
+            share_collection_with_user(self.col2, self.user1, [Permission.VIEW, Permission.CHANGE])
+        self.client.force_authenticate(self.user1)
+        url = reverse("image-detail", kwargs={"pk": str(self.image2.id)})
+
+        resp = self.client.patch(url, data={"filename": "patch.jpg"}, format="json")
+        self.assertEqual(resp.status_code, status.HTTP_200_OK, resp.content)
+
+        resp = self.client.delete(url)
+        self.assertEqual(resp.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertTrue(Image.objects.filter(id=self.image2.id).exists())
+
+    def _create_images(self, count: int) -> None:
+        for i in range(count):
+            Image.objects.create(
+                collection=self.col2 if i % 2 else self.col1,
+                filename=f"bulk{i}.jpg",
+                mime_type="image/jpeg",
+                size_bytes=10,
+            )
+
+    def test_list_query_count_does_not_grow_with_images(self) -> None:
+        with CaptureQueriesContext(connection) as baseline:
+            self.client.get(self.list_url)
+
+        self._create_images(10)
+
+        with self.assertNumQueries(len(baseline)):
+            resp = self.client.get(self.list_url)
+        self.assertEqual(len(resp.json()["results"]), 12)
+
+    def test_patch_does_not_load_collection_owner(self) -> None:
+        url = reverse("image-detail", kwargs={"pk": str(self.image1.id)})
+
+        with CaptureQueriesContext(connection) as queries:
+            self.client.patch(url, data={"filename": "patch.jpg"}, format="json")
+
+        self.assertFalse(any('"api_user"."username"' in query["sql"] for query in queries))
+
+
+class TestImageUpload(APITestCase):
+    DEFAULT_PASSWORD = "test_password"
+    CONTENT = b"\xff\xd8\xff" + bytes(range(256)) * 64
+
+    def setUp(self) -> None:
+        self.media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(self.media_root.cleanup)
+        self.enterContext(override_settings(MEDIA_ROOT=self.media_root.name))
+
+        self.client: APIClient = APIClient()
+
+        self.user = User.objects.create_user(
+            username="uploader", password=self.DEFAULT_PASSWORD, full_name="Uploader"
+        )
+        self.client.force_authenticate(self.user)
+
+        self.collection = Collection.objects.create(owner=self.user, name="Uploads")
+        self.upload_url = reverse("image-upload")
+
+    def _upload(self, content: bytes, **params: Any):
+        query = {
+            "collection": str(self.collection.id),
+            "filename": "scan.jpg",
+            **params,
+        }
+        return self.client.post(
+            f"{self.upload_url}?{urlencode(query)}",
+            data=content,
+            content_type="image/jpeg",
+        )
+
+    def test_upload_streams_bytes_to_storage(self) -> None:
+        resp = self._upload(self.CONTENT)
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED, resp.content)
+
+        image = Image.objects.get(id=resp.json()["id"])
+        with get_storage().open(image.storage_name) as stored:
+            self.assertEqual(stored.read(), self.CONTENT)
+        self.assertEqual(image.mime_type, "image/jpeg")
+        self.assertEqual(image.filename, "scan.jpg")
+        self.assertEqual(image.owner, self.user)
+
+    def test_upload_derives_size_and_hash_from_stream(self) -> None:
+        with mock.patch(
+            "api.services.uploads.images.config",
+            config.model_copy(update={"UPLOAD_CHUNK_SIZE": 100}),
+        ):
+            resp = self._upload(self.CONTENT, size_bytes=1)
+
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED, resp.content)
+
+        image = Image.objects.get(id=resp.json()["id"])
+        self.assertEqual(image.size_bytes, len(self.CONTENT))
+        self.assertEqual(image.fingerprint.sha256, hashlib.sha256(self.CONTENT).hexdigest())
+
+    def test_reupload_is_recorded_as_exact_duplicate(self) -> None:
+        original = Image.objects.get(id=self._upload(self.CONTENT).json()["id"])
+        duplicate = Image.objects.get(id=self._upload(self.CONTENT, filename="copy.jpg").json()["id"])
+
+        self.assertEqual(duplicate.duplicate_record.original_image, original)
+        self.assertFalse(ImageDuplicate.objects.filter(image=original).exists())
+        self.assertEqual(duplicate.fingerprint.sha256, original.fingerprint.sha256)
+
+    def test_identical_uploads_share_one_blob(self) -> None:
+        original = Image.objects.get(id=self._upload(self.CONTENT).json()["id"])
+        duplicate = Image.objects.get(id=self._upload(self.CONTENT).json()["id"])
+
+        self.assertEqual(duplicate.blob_id, original.blob_id)
+        self.assertEqual(original.blob_id, hashlib.sha256(self.CONTENT).hexdigest())
+        self.assertEqual(StoredBlob.objects.get().ref_count, 2)
+
+        stored_files = [path for path in Path(self.media_root.name).rglob("*") if path.is_file()]
+        self.assertEqual(len(stored_files), 1)
+
+    def _stored_files(self) -> List[Path]:
+        return [path for path in Path(self.media_root.name).rglob("*") if path.is_file()]
+
+    def test_failed_upload_leaves_no_blob_file(self) -> None:
+        with mock.patch("api.services.uploads.images._record_fingerprint", side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                self._upload(self.CONTENT)
+
+        self.assertFalse(StoredBlob.objects.exists())
+        self.assertEqual(self._stored_files(), [])
+
+    def test_failed_reupload_keeps_existing_blob_file(self) -> None:
+        image = Image.objects.get(id=self._upload(self.CONTENT).json()["id"])
+
+        with mock.patch("api.services.uploads.images._record_fingerprint", side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                self._upload(self.CONTENT)
+
+        self.assertEqual(StoredBlob.objects.get().ref_count, 1)
+        with get_storage().open(image.storage_name) as stored:
+            self.assertEqual(stored.read(), self.CONTENT)
+
+    def test_duplicate_keeps_content_after_original_is_deleted(self) -> None:
+        original = Image.objects.get(id=self._upload(self.CONTENT).json()["id"])
+        duplicate = Image.objects.get(id=self._upload(self.CONTENT).json()["id"])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            original.delete()
+
+        self.assertEqual(StoredBlob.objects.get().ref_count, 1)
+        with get_storage().open(duplicate.storage_name) as stored:
+            self.assertEqual(stored.read(), self.CONTENT)
+
+    def test_duplicates_are_scoped_to_owner(self) -> None:
+        original = Image.objects.get(id=self._upload(self.CONTENT).json()["id"])
+
+        other = User.objects.create_user(
+            username="other_uploader", password=self.DEFAULT_PASSWORD, full_name="Other"
+        )
+        other_collection = Collection.objects.create(owner=other, name="Other uploads")
+        self.client.force_authenticate(other)
+
+        resp = self._upload(self.CONTENT, collection=str(other_collection.id))
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED, resp.content)
+        self.assertFalse(ImageDuplicate.objects.exists())
+        self.assertEqual(Image.objects.get(id=resp.json()["id"]).blob_id, original.blob_id)
+
+    def test_delete_removes_stored_file(self) -> None:
+        resp = self._upload(self.CONTENT)
+        image = Image.objects.get(id=resp.json()["id"])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            resp = self.client.delete(reverse("image-detail", kwargs={"pk": str(image.id)}))
+
+        self.assertEqual(resp.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertFalse(get_storage().exists(image.storage_name))
+        self.assertFalse(StoredBlob.objects.exists())
+
+    def test_reupload_after_delete_restores_blob(self) -> None:
+        image = Image.objects.get(id=self._upload(self.CONTENT).json()["id"])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            image.delete()
+
+        image = Image.objects.get(id=self._upload(self.CONTENT).json()["id"])
+        with get_storage().open(image.storage_name) as stored:
+            self.assertEqual(stored.read(), self.CONTENT)
+
+    def test_upload_rejects_empty_body(self) -> None:
+        resp = self._upload(b"")
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Image.objects.exists())
+
+    def test_upload_rejects_disallowed_mime_type(self) -> None:
+        resp = self.client.post(
+            f"{self.upload_url}?collection={self.collection.id}&filename=doc.pdf",
+            data=self.CONTENT,
+            content_type="application/pdf",
+        )
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("mime_type", resp.json())
+        self.assertEqual([path for path in Path(self.media_root.name).rglob("*") if path.is_file()], [])
+
+
+class TestImageDownload(APITestCase):
+    DEFAULT_PASSWORD = "test_password"
+    CONTENT = bytes(range(256)) * 16
+
+    def setUp(self) -> None:
+        self.media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(self.media_root.cleanup)
+        self.enterContext(override_settings(MEDIA_ROOT=self.media_root.name))
+
+        self.client: APIClient = APIClient()
+
+        self.user = User.objects.create_user(
+            username="downloader", password=self.DEFAULT_PASSWORD, full_name="Downloader"
+        )
+        self.client.force_authenticate(self.user)
+
+        collection = Collection.objects.create(owner=self.user, name="Gallery")
+        query = urlencode({"collection": str(collection.id), "filename": "photo.png"})
+        resp = self.client.post(
+            f"{reverse('image-upload')}?{query}",
+            data=self.CONTENT,
+            content_type="image/png",
+        )
+        self.image = Image.objects.get(id=resp.json()["id"])
+        self.url = reverse("image-download", kwargs={"pk": str(self.image.id)})
+
+    def test_download_streams_full_content(self) -> None:
+        resp = self.client.get(self.url, HTTP_ACCEPT="image/png")
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertTrue(resp.streaming)
+
+        self.assertEqual(b"".join(resp.streaming_content), self.CONTENT)
+        self.assertEqual(resp["Content-Type"], "image/png")
+        self.assertEqual(resp["Content-Length"], str(len(self.CONTENT)))
+        self.assertEqual(resp["Accept-Ranges"], "bytes")
+        self.assertEqual(resp["ETag"], f'"{hashlib.sha256(self.CONTENT).hexdigest()}"')
+        self.assertIn("Last-Modified", resp)
+
+    def test_download_range(self) -> None:
+        resp = self.client.get(self.url, HTTP_RANGE="bytes=10-19")
+        self.assertEqual(resp.status_code, status.HTTP_206_PARTIAL_CONTENT)
+
+        self.assertEqual(b"".join(resp.streaming_content), self.CONTENT[10:20])
+        self.assertEqual(resp["Content-Length"], "10")
+        self.assertEqual(resp["Content-Range"], f"bytes 10-19/{len(self.CONTENT)}")
+
+    def test_download_open_ended_and_suffix_ranges(self) -> None:
+        resp = self.client.get(self.url, HTTP_RANGE="bytes=4000-")
+        self.assertEqual(resp.status_code, status.HTTP_206_PARTIAL_CONTENT)
+        self.assertEqual(b"".join(resp.streaming_content), self.CONTENT[4000:])
+
+        resp = self.client.get(self.url, HTTP_RANGE="bytes=-5")
+        self.assertEqual(resp.status_code, status.HTTP_206_PARTIAL_CONTENT)
+        self.assertEqual(b"".join(resp.streaming_content), self.CONTENT[-5:])
+
+    def test_download_unsatisfiable_range(self) -> None:
+        resp = self.client.get(self.url, HTTP_RANGE=f"bytes={len(self.CONTENT)}-")
+        self.assertEqual(resp.status_code, status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE)
+        self.assertEqual(resp["Content-Range"], f"bytes */{len(self.CONTENT)}")
+
+    def test_download_ignores_range_when_if_range_does_not_match(self) -> None:
+        resp = self.client.get(self.url, HTTP_RANGE="bytes=0-9", HTTP_IF_RANGE='"stale"')
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(b"".join(resp.streaming_content), self.CONTENT)
+
+    def test_if_none_match_returns_not_modified(self) -> None:
+        etag = self.client.get(self.url)["ETag"]
+
+        resp = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resp.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(resp.content, b"")
+        self.assertEqual(resp["ETag"], etag)
+
+    def test_if_modified_since_returns_not_modified(self) -> None:
+        last_modified = self.client.get(self.url)["Last-Modified"]
+
+        resp = self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(resp.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_download_without_content_returns_not_found(self) -> None:
+        image = Image.objects.create(
+            collection=self.image.collection,
+            filename="metadata-only.png",
+            mime_type="image/png",
+            size_bytes=10,
+        )
+
+        resp = self.client.get(reverse("image-download", kwargs={"pk": str(image.id)}))
+        self.assertEqual(resp.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_x_accel_redirect_offload(self) -> None:
+        with mock.patch(
+            "api.services.downloads.images.config",
+            config.model_copy(update={
+                "DOWNLOAD_OFFLOAD": "x-accel-redirect",
+                "DOWNLOAD_OFFLOAD_PREFIX": "/protected/images/",
+            }),
+        ):
+            resp = self.client.get(self.url)
+
+        relative_path = get_storage().relative_path(self.image.storage_name)
+
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertFalse(resp.streaming)
+        self.assertEqual(resp.content, b"")
+        self.assertEqual(resp["X-Accel-Redirect"], f"/protected/images/{relative_path}")
+        self.assertEqual(resp["Content-Type"], "image/png")
+        self.assertIn("ETag", resp)
+
+    def test_x_sendfile_offload(self) -> None:
+        with mock.patch(
+            "api.services.downloads.images.config",
+            config.model_copy(update={"DOWNLOAD_OFFLOAD": "x-sendfile"}),
+        ):
+            resp = self.client.get(self.url)
+
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(resp["X-Sendfile"], str(get_storage().path(self.image.storage_name)))
+        self.assertEqual(resp.content, b"")
+
+
+class TestImageNearDuplicates(APITestCase):
+    DEFAULT_PASSWORD = "test_password"
+    PHASH = -0x5A5A_0F0F_3C3C_1234
+
+    def setUp(self) -> None:
+        self.client: APIClient = APIClient()
+
+        self.user = User.objects.create_user(
+            username="searcher", password=self.DEFAULT_PASSWORD, full_name="Searcher"
+        )
+        self.client.force_authenticate(self.user)
+
+        self.collection = Collection.objects.create(owner=self.user, name="Photos")
+        self.image = self._create_image(self.PHASH)
+
+    def _create_image(self, phash: Any) -> Image:
+        image = Image.objects.create(
+            collection=self.collection,
+            filename="photo.jpg",
+            mime_type="image/jpeg",
+            size_bytes=1000,
+        )
+        ImageFingerprint.objects.create(image=image, sha256=hashlib.sha256(str(image.id).encode()).hexdigest(), phash=phash)
+        return image
+
+    def _flip(self, *bits: int) -> int:
+        unsigned = (self.PHASH & (2 ** 64 - 1)) ^ sum(1 << bit for bit in bits)
+        return unsigned - 2 ** 64 if unsigned >> 63 else unsigned
+
+    def _search(self, image: Image, **params: Any):
+        url = reverse("image-near-duplicates", kwargs={"pk": str(image.id)})
+        return self.client.get(url, params)
+
+    def test_excludes_images_the_user_cannot_see(self) -> None:
+        other = User.objects.create_user(username="other", password=self.DEFAULT_PASSWORD, full_name="Other")
+        self.collection = Collection.objects.create(owner=other, name="Private")
+        hidden = self._create_image(self._flip(1))
+
+        resp = self._search(self.image, max_distance=8)
+        self.assertNotIn(str(hidden.id), [item["id"] for item in resp.json()["results"]])
+
+    def test_returns_matches_within_distance_ordered_by_distance(self) -> None:
+        far = self._create_image(self._flip(*range(0, 64, 4)))
+        two_bits = self._create_image(self._flip(3, 40))
+        one_bit = self._create_image(self._flip(63))
+
+        resp = self._search(self.image, max_distance=8)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK, resp.content)
+
+        data = resp.json()["results"]
+        self.assertEqual([item["id"] for item in data], [str(one_bit.id), str(two_bits.id)])
+        self.assertEqual([item["distance"] for item in data], [1, 2])
+        self.assertNotIn(str(far.id), [item["id"] for item in data])
+
+    def test_finds_matches_spread_across_every_band(self) -> None:
+        # Seven flipped bits split 2/2/2/1 over the bands: only the last band is within 7 // 4 bits.
+        spread = self._create_image(self._flip(60, 50, 44, 34, 28, 18, 5))
+
+        resp = self._search(self.image, max_distance=7)
+        self.assertEqual([item["id"] for item in resp.json()["results"]], [str(spread.id)])
+
+        resp = self._search(self.image, max_distance=6)
+        self.assertEqual(resp.json()["results"], [])
+
+    def test_rejects_distance_above_limit(self) -> None:
+        resp = self._search(self.image, max_distance=config.NEAR_DUPLICATE_MAX_DISTANCE + 1)
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("max_distance", resp.json())
+
+    def test_conflict_when_phash_is_not_computed(self) -> None:
+        pending = self._create_image(None)
+
+        resp = self._search(pending)
+        self.assertEqual(resp.status_code, status.HTTP_409_CONFLICT)
+
+
+class TestSimilarImages(APITestCase):
+    DEFAULT_PASSWORD = "test_password"
+
+    def setUp(self) -> None:
+        self.client: APIClient = APIClient()
+
+        self.user = User.objects.create_user(
+            username="similar_searcher", password=self.DEFAULT_PASSWORD, full_name="Searcher"
+        )
+        self.client.force_authenticate(self.user)
+
+        self.collection = Collection.objects.create(owner=self.user, name="Photos")
+        self.image = self._create_image(self._embedding(1.0, 0.0))
+
+    def _embedding(self, x: float, y: float) -> List[float]:
+        return [x, y] + [0.0] * 510
+
+    def _create_image(self, embedding: Any, collection: Any = None) -> Image:
+        image = Image.objects.create(
+            collection=collection or self.collection,
+            filename="photo.jpg",
+            mime_type="image/jpeg",
+            size_bytes=1000,
+        )
+        ImageFingerprint.objects.create(
+            image=image,
+            sha256=hashlib.sha256(str(image.id).encode()).hexdigest(),
+            embedding=embedding,
+        )
+        return image
+
+    def _search(self, image: Image, **params: Any):
+        return self.client.get(reverse("image-similar", kwargs={"pk": str(image.id)}), params)
+
+    def test_returns_nearest_images_by_cosine_distance(self) -> None:
+        far = self._create_image(self._embedding(-1.0, 0.1))
+        close = self._create_image(self._embedding(2.0, 0.1))
+        closer = self._create_image(self._embedding(3.0, 0.0))
+        self._create_image(None)
+
+        resp = self._search(self.image)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK, resp.content)
+
+        data = resp.json()
+        self.assertEqual([item["id"] for item in data], [str(closer.id), str(close.id), str(far.id)])
+        self.assertAlmostEqual(data[0]["distance"], 0.0, places=5)
+        self.assertGreater(data[2]["distance"], 1.0)
+
+    def test_limit_and_ef_search(self) -> None:
+        for _ in range(3):
+            self._create_image(self._embedding(1.0, 0.5))
+
+        with CaptureQueriesContext(connection) as queries:
+            resp = self._search(self.image, limit=2, ef_search=64)
+
+        self.assertEqual(len(resp.json()), 2)
+        self.assertTrue(any("hnsw.ef_search" in query["sql"] and "64" in query["sql"] for query in queries))
+
+    def test_results_are_scoped_to_viewable_images(self) -> None:
+        other = User.objects.create_user(
+            username="other_searcher", password=self.DEFAULT_PASSWORD, full_name="Other"
+        )
+        shared_collection = Collection.objects.create(owner=other, name="Shared photos")
+        with self.captureOnCommitCallbacks(execute=True):
+            share_collection_with_user(shared_collection, self.user, [Permission.VIEW])
+
+        shared = self._create_image(self._embedding(1.0, 0.1), shared_collection)
+        self._create_image(self._embedding(1.0, 0.0), Collection.objects.create(owner=other, name="Other photos"))
+
+        resp = self._search(self.image)
+
+        self.assertEqual([item["id"] for item in resp.json()], [str(shared.id)])
+
+    def test_index_scan_is_widened_past_hidden_images(self) -> None:
+        hidden = Collection.objects.create(
+            owner=User.objects.create_user(username="hidden_owner", password=self.DEFAULT_PASSWORD, full_name="Hidden"),
+            name="Hidden photos",
+        )
+        for _ in range(20):
+            self._create_image(self._embedding(1.0, 0.01), hidden)
+        visible = [self._create_image(self._embedding(1.0, y)) for y in (0.5, 1.0)]
+
+        # Force the ordered HNSW scan; the first candidates it yields are all hidden from the caller.
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+            cursor.execute("SET LOCAL enable_sort = off")
+
+        resp = self._search(self.image, limit=2, ef_search=1)
+
+        self.assertEqual([item["id"] for item in resp.json()], [str(image.id) for image in visible])
+
+    def test_rejects_limit_above_maximum(self) -> None:
+        resp = self._search(self.image, limit=config.SIMILAR_MAX_LIMIT + 1)
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_conflict_when_embedding_is_not_computed(self) -> None:
+        resp = self._search(self._create_image(None))
+        self.assertEqual(resp.status_code, status.HTTP_409_CONFLICT)
+
+
+class TestLabelFacets(APITestCase):
+    DEFAULT_PASSWORD = "test_password"
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.client: APIClient = APIClient()
+
+        self.user = User.objects.create_user(
+            username="facet_user", password=self.DEFAULT_PASSWORD, full_name="Facet User"
+        )
+        self.client.force_authenticate(self.user)
+
+        self.holidays = Collection.objects.create(owner=self.user, name="Holidays")
+        self.work = Collection.objects.create(owner=self.user, name="Work")
+
+        self.beach = self._create_image(self.holidays, ["beach", "sun"])
+        self._create_image(self.holidays, ["beach"])
+        self._create_image(self.work, ["office", "sun"])
+
+        self.url = reverse("image-label-facets")
+
+    def _create_image(self, collection: Collection, labels: List[str]) -> Image:
+        return Image.objects.create(
+            collection=collection,
+            filename="photo.jpg",
+            mime_type="image/jpeg",
+            size_bytes=1000,
+            labels=labels,
+        )
+
+    def _facets(self, collection: Any = None) -> List[Dict[str, Any]]:
+        resp = self.client.get(self.url, {"collection": str(collection.id)} if collection else {})
+        self.assertEqual(resp.status_code, status.HTTP_200_OK, resp.content)
+        return resp.json()
+
+    def test_counts_labels_across_images(self) -> None:
+        self.assertEqual(self._facets(), [
+            {"label": "beach", "count": 2},
+            {"label": "sun", "count": 2},
+            {"label": "office", "count": 1},
+        ])
+
+    def test_counts_labels_within_collection(self) -> None:
+        self.assertEqual(self._facets(self.work), [
+            {"label": "office", "count": 1},
+            {"label": "sun", "count": 1},
+        ])
+
+    def test_repeated_requests_are_served_from_cache(self) -> None:
+        self._facets(self.holidays)
+
+        with self.assertNumQueries(0):
+            self._facets(self.holidays)
+
+    def test_label_change_invalidates_cache(self) -> None:
+        self._facets()
+        self._facets(self.holidays)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.beach.labels = ["beach", "sunset"]
+            self.beach.save()
+
+        self.assertIn({"label": "sunset", "count": 1}, self._facets())
+        self.assertIn({"label": "sunset", "count": 1}, self._facets(self.holidays))
+
+    def test_move_and_delete_invalidate_both_collections(self) -> None:
+        self._facets(self.holidays)
+        self._facets(self.work)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.beach.collection = self.work
+            self.beach.save()
+
+        self.assertEqual(self._facets(self.holidays), [{"label": "beach", "count": 1}])
+        self.assertIn({"label": "sun", "count": 2}, self._facets(self.work))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.beach.delete()
+
+        self.assertIn({"label": "sun", "count": 1}, self._facets(self.work))
+
+    def test_unrelated_change_keeps_cache(self) -> None:
+        self._facets(self.holidays)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            image = Image.objects.get(id=self.beach.id)
+            image.filename = "renamed.jpg"
+            image.save()
+
+        with self.assertNumQueries(0):
+            self._facets(self.holidays)
+
+
+class TestBulkImages(APITestCase):
+    DEFAULT_PASSWORD = "test_password"
+
+    def setUp(self) -> None:
+        self.client: APIClient = APIClient()
+
+        self.user = User.objects.create_user(username="importer", password=self.DEFAULT_PASSWORD, full_name="Importer")
+        self.client.force_authenticate(self.user)
+
+        self.collection = Collection.objects.create(owner=self.user, name="Imports")
+        self.other_collection = Collection.objects.create(owner=self.user, name="Archive")
+
+        self.url = reverse("image-bulk")
+
+    def _payload(self, count: int, **fields: Any) -> List[Dict[str, Any]]:
+        return [
+            {
+                "collection": str(self.collection.id),
+                "filename": f"image{i}.jpg",
+                "mime_type": "image/JPEG",
+                "size_bytes": 100 + i,
+                "labels": ["import"],
+                **fields,
+            }
+            for i in range(count)
+        ]
+
+    def _create(self, count: int) -> List[Image]:
+        resp = self.client.post(self.url, self._payload(count), format="json")
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED, resp.content)
+        return list(Image.objects.filter(id__in=[item["id"] for item in resp.json()]))
+
+    def test_bulk_create(self) -> None:
+        images = self._create(3)
+
+        self.assertEqual(len(images), 3)
+        for image in images:
+            self.assertEqual(image.owner_id, self.user.id)
+            self.assertEqual(image.mime_type, "image/jpeg")
+            self.assertEqual(image.stored_filename, f"{image.id}.jpeg")
+
+    def test_bulk_create_query_count_does_not_grow_with_records(self) -> None:
+        # Warms the cached shared collection ids.
+        self.client.post(self.url, self._payload(1), format="json")
+
+        with CaptureQueriesContext(connection) as baseline:
+            self.client.post(self.url, self._payload(2), format="json")
+
+        with self.assertNumQueries(len(baseline)):
+            resp = self.client.post(self.url, self._payload(50), format="json")
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
+
+    def test_bulk_create_is_all_or_nothing(self) -> None:
+        payload = self._payload(2)
+        payload[1]["collection"] = str(UUID(int=0))
+        payload.append({**payload[0], "mime_type": "text/plain"})
+
+        resp = self.client.post(self.url, payload, format="json")
+
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("collection", resp.json()["1"])
+        self.assertIn("mime_type", resp.json()["2"])
+        self.assertFalse(Image.objects.exists())
+
+    def test_bulk_create_rejects_collections_the_user_cannot_add_to(self) -> None:
+        other = User.objects.create_user(username="other", password=self.DEFAULT_PASSWORD, full_name="Other")
+        viewed = Collection.objects.create(owner=other, name="Viewed")
+        with self.captureOnCommitCallbacks(execute=True):
+            share_collection_with_user(viewed, self.user, [Permission.VIEW])
+
+        resp = self.client.post(self.url, [
+            *self._payload(1, collection=str(other.collections.get(is_default=True).id)),
+            *self._payload(1, collection=str(viewed.id)),
+        ], format="json")
+
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("collection", resp.json()["0"])
+        self.assertIn("collection", resp.json()["1"])
+        self.assertFalse(Image.objects.exists())
+
+    def test_bulk_create_in_collection_shared_for_adding(self) -> None:
+        other = User.objects.create_user(username="other", password=self.DEFAULT_PASSWORD, full_name="Other")
+        shared = Collection.objects.create(owner=other, name="Inbox")
+        with self.captureOnCommitCallbacks(execute=True):
+            share_collection_with_user(shared, self.user, [Permission.VIEW, Permission.ADD])
+
+        resp = self.client.post(self.url, self._payload(1, collection=str(shared.id)), format="json")
+
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED, resp.content)
+        self.assertEqual(Image.objects.get().owner_id, other.id)
+
+    def test_bulk_rejects_too_many_records(self) -> None:
+        with mock.patch("api.views.image.config", config.model_copy(update={"BULK_MAX_SIZE": 2})):
+            resp = self.client.post(self.url, self._payload(3), format="json")
+
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_bulk_update(self) -> None:
+        first, second = self._create(2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            resp = self.client.patch(self.url, [
+                {"id": str(first.id), "labels": ["a", "b"]},
+                {"id": str(second.id), "collection": str(self.other_collection.id), "filename": "moved.jpg"},
+            ], format="json")
+        self.assertEqual(resp.status_code, status.HTTP_200_OK, resp.content)
+
+        first.refresh_from_db()
+        second.refresh_from_db()
+        self.assertEqual(first.labels, ["a", "b"])
+        self.assertEqual(first.filename, "image0.jpg")
+        self.assertEqual(second.collection_id, self.other_collection.id)
+        self.assertEqual(second.filename, "moved.jpg")
+        self.assertGreater(second.updated_at, second.created_at)
+
+    def test_bulk_update_rejects_unknown_and_hidden_images(self) -> None:
+        other = User.objects.create_user(username="other", password=self.DEFAULT_PASSWORD, full_name="Other")
+        hidden = Image.objects.create(
+            collection=other.collections.get(),
+            filename="hidden.jpg",
+            mime_type="image/jpeg",
+            size_bytes=1,
+        )
+
+        resp = self.client.patch(self.url, [
+            {"id": str(hidden.id), "filename": "mine.jpg"},
+            {"filename": "no-id.jpg"},
+        ], format="json")
+
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("id", resp.json()["0"])
+        self.assertIn("id", resp.json()["1"])
+        hidden.refresh_from_db()
+        self.assertEqual(hidden.filename, "hidden.jpg")
+
+    def test_bulk_update_rejects_moving_into_other_users_collection(self) -> None:
+        image, = self._create(1)
+        other = User.objects.create_user(username="other", password=self.DEFAULT_PASSWORD, full_name="Other")
+
+        resp = self.client.patch(self.url, [
+            {"id": str(image.id), "collection": str(other.collections.get().id)},
+        ], format="json")
+
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("collection", resp.json()["0"])
+        image.refresh_from_db()
+        self.assertEqual(image.owner_id, self.user.id)
+
+    def test_bulk_update_rejects_duplicate_ids(self) -> None:
+        image, = self._create(1)
+
+        resp = self.client.patch(self.url, [{"id": str(image.id)}, {"id": str(image.id)}], format="json")
+
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_bulk_delete(self) -> None:
+        first, second = self._create(2)
+        other = User.objects.create_user(username="other", password=self.DEFAULT_PASSWORD, full_name="Other")
+        hidden = Image.objects.create(
+            collection=other.collections.get(),
+            filename="hidden.jpg",
+            mime_type="image/jpeg",
+            size_bytes=1,
+        )
+
+        resp = self.client.delete(self.url, {"ids": [str(first.id), str(hidden.id)]}, format="json")
+
+        self.assertEqual(resp.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(set(Image.objects.values_list("id", flat=True)), {second.id, hidden.id})
+
+
+class TestLabelOperations(APITestCase):
+    DEFAULT_PASSWORD = "test_password"
+
+    def setUp(self) -> None:
+        self.client: APIClient = APIClient()
+
+        self.user = User.objects.create_user(username="labeller", password=self.DEFAULT_PASSWORD, full_name="Labeller")
+        self.client.force_authenticate(self.user)
+
+        self.collection = Collection.objects.create(owner=self.user, name="Photos")
+        self.first = self._create_image(["beach", "sun"])
+        self.second = self._create_image(["sun"])
+        self.third = self._create_image([])
+
+        self.url = reverse("image-labels")
+
+    def _create_image(self, labels: List[str], collection: Any = None) -> Image:
+        return Image.objects.create(
+            collection=collection or self.collection,
+            filename="photo.jpg",
+            mime_type="image/jpeg",
+            size_bytes=1000,
+            labels=labels,
+        )
+
+    def _apply(self, query: str = "", **data: Any):
+        return self.client.post(self.url + query, data, format="json")
+
+    def _apply_to_collection(self, **data: Any):
+        return self._apply(collection=str(self.collection.id), **data)
+
+    def _labels(self, image: Image) -> List[str]:
+        image.refresh_from_db()
+        return image.labels
+
+    def test_add_appends_missing_labels_in_order(self) -> None:
+        with CaptureQueriesContext(connection) as queries:
+            resp = self._apply_to_collection(operation="add", labels=["sea", "sun", "sand"])
+
+        self.assertEqual(sum(query["sql"].startswith("UPDATE") for query in queries), 1)
+
+        self.assertEqual(resp.status_code, status.HTTP_200_OK, resp.content)
+        self.assertEqual(resp.json(), {"updated": 3})
+        self.assertEqual(self._labels(self.first), ["beach", "sun", "sea", "sand"])
+        self.assertEqual(self._labels(self.second), ["sun", "sea", "sand"])
+        self.assertEqual(self._labels(self.third), ["sea", "sun", "sand"])
+
+    def test_remove(self) -> None:
+        resp = self._apply_to_collection(operation="remove", labels=["sun", "missing"])
+
+        self.assertEqual(resp.json(), {"updated": 2})
+        self.assertEqual(self._labels(self.first), ["beach"])
+        self.assertEqual(self._labels(self.second), [])
+
+    def test_replace_selected_ids(self) -> None:
+        resp = self._apply(operation="replace", labels=["new"], ids=[str(self.first.id), str(self.third.id)])
+
+        self.assertEqual(resp.json(), {"updated": 2})
+        self.assertEqual(self._labels(self.first), ["new"])
+        self.assertEqual(self._labels(self.second), ["sun"])
+        self.assertEqual(self._labels(self.third), ["new"])
+
+    def test_label_filter_selects_images(self) -> None:
+        resp = self._apply("?labels=beach", operation="add", labels=["holiday"])
+
+        self.assertEqual(resp.json(), {"updated": 1})
+        self.assertEqual(self._labels(self.first), ["beach", "sun", "holiday"])
+        self.assertEqual(self._labels(self.second), ["sun"])
+
+    def test_only_visible_images_are_changed(self) -> None:
+        other = User.objects.create_user(username="other", password=self.DEFAULT_PASSWORD, full_name="Other")
+        hidden = self._create_image(["sun"], collection=other.collections.get())
+
+        self._apply("?labels_any=sun", operation="remove", labels=["sun"])
+
+        self.assertEqual(self._labels(hidden), ["sun"])
+
+    def test_view_only_images_are_not_changed(self) -> None:
+        other = User.objects.create_user(username="other", password=self.DEFAULT_PASSWORD, full_name="Other")
+        shared = Collection.objects.create(owner=other, name="Shared")
+        image = self._create_image(["sun"], collection=shared)
+        with self.captureOnCommitCallbacks(execute=True):
+            share_collection_with_user(shared, self.user, [Permission.VIEW])
+
+        resp = self._apply(operation="replace", labels=[], ids=[str(image.id)])
+
+        self.assertEqual(resp.json(), {"updated": 0})
+        self.assertEqual(self._labels(image), ["sun"])
+
+    def test_requires_a_selector(self) -> None:
+        resp = self._apply(operation="replace", labels=[])
+
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self._labels(self.first), ["beach", "sun"])
+
+    def test_add_enforces_max_labels(self) -> None:
+        with mock.patch("api.services.labels.operations.config", config.model_copy(update={"MAX_LABELS": 3})):
+            resp = self._apply_to_collection(operation="add", labels=["a", "b"])
+
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self._labels(self.second), ["sun"])
+
+    def test_max_labels_is_checked_by_the_update(self) -> None:
+        with CaptureQueriesContext(connection) as queries:
+            with mock.patch("api.services.labels.operations.config", config.model_copy(update={"MAX_LABELS": 3})):
+                self._apply_to_collection(operation="add", labels=["a", "b"])
+
+        update = next(query["sql"] for query in queries if query["sql"].startswith("UPDATE"))
+        self.assertIn("cardinality", update)
+        self.assertEqual(self._labels(self.third), [])
+
+    def test_rejects_duplicate_labels(self) -> None:
+        resp = self._apply_to_collection(operation="replace", labels=["a", "a"])
+
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_invalidates_label_facets(self) -> None:
+        cache.clear()
+        facets_url = reverse("image-label-facets")
+        self.client.get(facets_url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self._apply_to_collection(operation="add", labels=["fresh"])
+
+        self.assertIn({"label": "fresh", "count": 3}, self.client.get(facets_url).json())
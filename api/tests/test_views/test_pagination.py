@@ -0,0 +1,97 @@
+from datetime import timedelta
+from typing import Any, Dict, List, Optional
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase, APIClient
+
+from api.models import Collection, Image
+from api.pagination import KeysetPagination
+
+User = get_user_model()
+
+
+class TestKeysetPagination(APITestCase):
+    def setUp(self) -> None:
+        self.client: APIClient = APIClient()
+
+        self.user = User.objects.create_user(
+            username="pager", password="test_password", full_name="Pager"
+        )
+        self.client.force_authenticate(self.user)
+
+        collection = Collection.objects.create(owner=self.user, name="Many")
+        self.images = [
+            Image.objects.create(
+                collection=collection,
+                filename=f"{n}.jpg",
+                mime_type="image/jpeg",
+                size_bytes=n % 3,
+            )
+            for n in range(7)
+        ]
+
+        # Several rows share a timestamp so that pages must break ties on id.
+        now = timezone.now()
+        for n, image in enumerate(self.images):
+            Image.objects.filter(id=image.id).update(created_at=now - timedelta(seconds=n // 3))
+
+        self.url = reverse("image-list")
+
+    def _walk(self, url: str, params: Optional[Dict[str, Any]] = None, link: str = "next") -> List[List[str]]:
+        pages = []
+        resp = self.client.get(url, params)
+
+        while True:
+            self.assertEqual(resp.status_code, status.HTTP_200_OK, resp.content)
+            pages.append([item["id"] for item in resp.json()["results"]])
+
+            if not resp.json()[link]:
+                return pages
+
+            resp = self.client.get(resp.json()[link])
+
+    def test_pages_cover_every_row_once_in_order(self) -> None:
+        pages = self._walk(self.url, {"page_size": 3})
+
+        expected = [
+            str(image.id)
+            for image in Image.objects.order_by("-created_at", "-id")
+        ]
+        self.assertEqual([len(page) for page in pages], [3, 3, 1])
+        self.assertEqual(sum(pages, []), expected)
+
+    def test_previous_links_walk_back_through_same_pages(self) -> None:
+        forward = self._walk(self.url, {"page_size": 3})
+
+        last_page = self.client.get(self.url, {"page_size": 3})
+        while last_page.json()["next"]:
+            last_page = self.client.get(last_page.json()["next"])
+
+        backward = self._walk(last_page.json()["previous"], link="previous")
+
+        self.assertEqual(backward, list(reversed(forward[:-1])))
+        self.assertIsNone(self.client.get(self.url, {"page_size": 3}).json()["previous"])
+
+    def test_pages_follow_requested_ordering(self) -> None:
+        pages = self._walk(self.url, {"page_size": 2, "ordering": "size_bytes"})
+
+        expected = [str(image.id) for image in Image.objects.order_by("size_bytes", "id")]
+        self.assertEqual(sum(pages, []), expected)
+
+    def test_page_size_is_capped(self) -> None:
+        with mock.patch.object(KeysetPagination, "max_page_size", 4):
+            resp = self.client.get(self.url, {"page_size": 1000})
+
+        self.assertEqual(len(resp.json()["results"]), 4)
+
+    def test_invalid_cursor_is_not_found(self) -> None:
+        resp = self.client.get(self.url, {"cursor": "not-a-cursor"})
+        self.assertEqual(resp.status_code, status.HTTP_404_NOT_FOUND)
+
+        next_link = self.client.get(self.url, {"page_size": 2}).json()["next"]
+        resp = self.client.get(f"{next_link}&ordering=size_bytes")
+        self.assertEqual(resp.status_code, status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,198 @@
+import hashlib
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase, APIClient
+
+from ImageBankManager.config import config
+from api.models import Collection, Image, StoredBlob, UploadSession
+from api.services.permissions.collections import revoke_collection_share_from_user, share_collection_with_user
+from api.services.permissions.enums import Permission
+from api.services.storage import get_storage
+
+User = get_user_model()
+
+
+class TestUploadSessionViewSet(APITestCase):
+    DEFAULT_PASSWORD = "test_password"
+    PARTS = [b"\xff\xd8\xff" + b"a" * 1000, b"b" * 1000, b"c" * 10]
+
+    def setUp(self) -> None:
+        self.media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(self.media_root.cleanup)
+        self.enterContext(override_settings(MEDIA_ROOT=self.media_root.name))
+
+        self.client: APIClient = APIClient()
+
+        self.user = User.objects.create_user(
+            username="uploader", password=self.DEFAULT_PASSWORD, full_name="Uploader"
+        )
+        self.client.force_authenticate(self.user)
+
+        self.collection = Collection.objects.create(owner=self.user, name="Scans")
+
+    def _start_session(self, collection: Collection = None) -> str:
+        resp = self.client.post(
+            reverse("uploadsession-list"),
+            data={
+                "collection": str((collection or self.collection).id),
+                "filename": "scan.tiff",
+                "mime_type": "image/tiff",
+                "labels": ["scan"],
+            },
+            format="json",
+        )
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED, resp.content)
+        return resp.json()["id"]
+
+    def _put_part(self, session_id: str, number: int, content: bytes):
+        url = reverse("uploadsession-parts", kwargs={"pk": session_id, "number": number})
+        return self.client.put(url, data=content, content_type="application/octet-stream")
+
+    def _commit(self, session_id: str):
+        return self.client.post(reverse("uploadsession-commit", kwargs={"pk": session_id}))
+
+    def test_create_session_sets_owner_to_uploader(self) -> None:
+        session = UploadSession.objects.get(id=self._start_session())
+        self.assertEqual(session.owner, self.user)
+        self.assertEqual(session.labels, ["scan"])
+
+    def test_sessions_are_private_to_their_owner(self) -> None:
+        session_id = self._start_session()
+        other = User.objects.create_user(username="other", password=self.DEFAULT_PASSWORD, full_name="Other")
+        self.client.force_authenticate(other)
+
+        detail_url = reverse("uploadsession-detail", kwargs={"pk": session_id})
+        self.assertEqual(self.client.get(detail_url).status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(self._put_part(session_id, 1, self.PARTS[0]).status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(self._commit(session_id).status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(self.client.delete(detail_url).status_code, status.HTTP_404_NOT_FOUND)
+        self.assertTrue(UploadSession.objects.filter(id=session_id).exists())
+
+    def test_create_session_rejects_collections_the_user_cannot_add_to(self) -> None:
+        other = User.objects.create_user(username="other", password=self.DEFAULT_PASSWORD, full_name="Other")
+
+        resp = self.client.post(
+            reverse("uploadsession-list"),
+            data={"collection": str(other.collections.get().id), "filename": "scan.tiff", "mime_type": "image/tiff"},
+            format="json",
+        )
+
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("collection", resp.json())
+
+    def test_upload_into_collection_shared_for_adding(self) -> None:
+        other = User.objects.create_user(username="other", password=self.DEFAULT_PASSWORD, full_name="Other")
+        shared = Collection.objects.create(owner=other, name="Inbox")
+        with self.captureOnCommitCallbacks(execute=True):
+            share_collection_with_user(shared, self.user, [Permission.VIEW, Permission.ADD])
+
+        session_id = self._start_session(shared)
+        self._put_part(session_id, 1, self.PARTS[0])
+        resp = self._commit(session_id)
+
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED, resp.content)
+        self.assertEqual(Image.objects.get(id=resp.json()["id"]).owner, other)
+
+    def test_commit_after_share_is_revoked_fails(self) -> None:
+        other = User.objects.create_user(username="other", password=self.DEFAULT_PASSWORD, full_name="Other")
+        shared = Collection.objects.create(owner=other, name="Inbox")
+        with self.captureOnCommitCallbacks(execute=True):
+            share_collection_with_user(shared, self.user, [Permission.VIEW, Permission.ADD])
+
+        session_id = self._start_session(shared)
+        self._put_part(session_id, 1, self.PARTS[0])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            revoke_collection_share_from_user(shared, self.user, [Permission.VIEW, Permission.ADD])
+
+        resp = self._commit(session_id)
+
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("collection", resp.json())
+        self.assertFalse(shared.images.exists())
+
+    def test_parts_uploaded_out_of_order_are_assembled_in_order(self) -> None:
+        session_id = self._start_session()
+
+        for number in (3, 1, 2):
+            resp = self._put_part(session_id, number, self.PARTS[number - 1])
+            self.assertEqual(resp.status_code, status.HTTP_200_OK, resp.content)
+            self.assertEqual(resp.json()["size_bytes"], len(self.PARTS[number - 1]))
+
+        with mock.patch(
+            "api.services.uploads.images.config",
+            config.model_copy(update={"UPLOAD_CHUNK_SIZE": 64}),
+        ):
+            resp = self._commit(session_id)
+
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED, resp.content)
+
+        content = b"".join(self.PARTS)
+        image = Image.objects.get(id=resp.json()["id"])
+        with get_storage().open(image.storage_name) as stored:
+            self.assertEqual(stored.read(), content)
+        self.assertEqual(image.size_bytes, len(content))
+        self.assertEqual(image.fingerprint.sha256, hashlib.sha256(content).hexdigest())
+        self.assertEqual(image.labels, ["scan"])
+        self.assertFalse(UploadSession.objects.filter(id=session_id).exists())
+        self.assertFalse((Path(self.media_root.name) / "uploads" / session_id).exists())
+
+    def test_retrieve_reports_acknowledged_parts_for_resume(self) -> None:
+        session_id = self._start_session()
+        self._put_part(session_id, 1, self.PARTS[0])
+        self._put_part(session_id, 2, self.PARTS[1])
+
+        resp = self.client.get(reverse("uploadsession-detail", kwargs={"pk": session_id}))
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual([part["number"] for part in resp.json()["parts"]], [1, 2])
+
+    def test_reuploading_part_replaces_previous_content(self) -> None:
+        session_id = self._start_session()
+        self._put_part(session_id, 1, b"stale")
+        self._put_part(session_id, 1, self.PARTS[0])
+
+        resp = self._commit(session_id)
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED, resp.content)
+        self.assertEqual(Image.objects.get(id=resp.json()["id"]).size_bytes, len(self.PARTS[0]))
+
+    def test_failed_commit_leaves_no_blob_file(self) -> None:
+        session_id = self._start_session()
+        self._put_part(session_id, 1, self.PARTS[0])
+
+        with mock.patch("api.services.uploads.images._record_fingerprint", side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                self._commit(session_id)
+
+        self.assertFalse(StoredBlob.objects.exists())
+        self.assertFalse(get_storage().exists(hashlib.sha256(self.PARTS[0]).hexdigest()))
+        self.assertTrue(UploadSession.objects.filter(id=session_id).exists())
+
+    def test_commit_with_missing_parts_fails(self) -> None:
+        session_id = self._start_session()
+        self._put_part(session_id, 1, self.PARTS[0])
+        self._put_part(session_id, 3, self.PARTS[2])
+
+        resp = self._commit(session_id)
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("parts", resp.json())
+        self.assertTrue(UploadSession.objects.filter(id=session_id).exists())
+
+    def test_part_number_out_of_range_fails(self) -> None:
+        session_id = self._start_session()
+
+        resp = self._put_part(session_id, 0, self.PARTS[0])
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_delete_discards_parts(self) -> None:
+        session_id = self._start_session()
+        self._put_part(session_id, 1, self.PARTS[0])
+
+        resp = self.client.delete(reverse("uploadsession-detail", kwargs={"pk": session_id}))
+        self.assertEqual(resp.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertFalse((Path(self.media_root.name) / "uploads" / session_id).exists())
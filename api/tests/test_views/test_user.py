@@ -34,7 +34,7 @@ class TestUserViewSet(APITestCase):
     def test_list_returns_users_ordered_by_created_desc(self) -> None:
         resp = self.client.get(self.list_url)
         self.assertEqual(resp.status_code, status.HTTP_200_OK)
-        data: List[Dict[str, Any]] = resp.json()
+        data: List[Dict[str, Any]] = resp.json()["results"]
         self.assertGreaterEqual(len(data), 2)
         first_id: UUID = UUID(data[0]["id"])
         second_id: UUID = UUID(data[1]["id"])
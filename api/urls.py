@@ -1,9 +1,10 @@
 from rest_framework import routers
-from api.views import UserViewSet, CollectionViewSet, ImageViewSet
+from api.views import UserViewSet, CollectionViewSet, ImageViewSet, UploadSessionViewSet
 
 router = routers.DefaultRouter()
 router.register(r"users", UserViewSet)
 router.register(r"collections", CollectionViewSet)
 router.register(r"images", ImageViewSet)
+router.register(r"uploads", UploadSessionViewSet)
 
 urlpatterns = router.urls
@@ -1,3 +1,4 @@
 from .user import UserViewSet
 from .collection import CollectionViewSet
 from .image import ImageViewSet
+from .upload_session import UploadSessionViewSet
@@ -1,16 +1,46 @@
+from drf_spectacular.utils import extend_schema
 from rest_framework import viewsets, filters
+from rest_framework.decorators import action
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from api.filters import LabelFilter
 from api.models.collection import Collection
 from api.serializers.collection import CollectionSerializer
+from api.serializers.image import ImageSerializer
+from api.services.permissions.enums import Permission
+from api.services.permissions.visibility import visible_collections
 
 
 class CollectionViewSet(viewsets.ModelViewSet):
     queryset = Collection.objects.all()
     serializer_class = CollectionSerializer
 
-    filter_backends = [filters.OrderingFilter]
+    filter_backends = [LabelFilter, filters.OrderingFilter]
     ordering_fields = [
         "created_at",
         "updated_at",
     ]
 
     ordering = ["-created_at"]
+
+    write_permissions = {
+        "update": Permission.CHANGE,
+        "partial_update": Permission.CHANGE,
+        "destroy": Permission.DELETE,
+    }
+
+    def get_queryset(self):
+        perm = self.write_permissions.get(self.action, Permission.VIEW)
+        return visible_collections(self.request.user, super().get_queryset(), perm).with_image_stats()
+
+    @extend_schema(responses={200: ImageSerializer(many=True)})
+    @action(detail=True, methods=["get"])
+    def images(self, request: Request, pk: str) -> Response:
+        queryset = self.get_object().images.only(*ImageSerializer.Meta.fields).order_by("-created_at")
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(ImageSerializer(page, many=True).data)
+
+        return Response(ImageSerializer(queryset, many=True).data)
@@ -1,16 +1,248 @@
-from rest_framework import viewsets, filters
+from django.db import transaction
+from django.http import HttpResponse
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import extend_schema, OpenApiParameter
+from rest_framework import viewsets, filters, status
+from rest_framework.decorators import action
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from ImageBankManager.config import config
+from api.filters import LabelFilter
 from api.models.image import Image
-from api.serializers.image import ImageSerializer
+from api.serializers.image import (
+    BulkImageDeleteSerializer,
+    BulkImageUpdateSerializer,
+    ImageSerializer,
+    ImageUploadSerializer,
+    LabelFacetQuerySerializer,
+    LabelFacetSerializer,
+    LabelOperationResultSerializer,
+    LabelOperationSerializer,
+    NearDuplicateQuerySerializer,
+    NearDuplicateSerializer,
+    SimilarImageQuerySerializer,
+    SimilarImageSerializer,
+)
+from api.services.downloads.images import serve_image
+from api.services.fingerprints.duplicates import find_near_duplicates
+from api.services.fingerprints.similarity import find_similar
+from api.services.labels.facets import get_label_facets
+from api.services.labels.operations import apply_label_operation
+from api.services.permissions.enums import Permission
+from api.services.permissions.visibility import visible_images
+from api.services.uploads.images import upload_image
 
 
 class ImageViewSet(viewsets.ModelViewSet):
     queryset = Image.objects.all()
     serializer_class = ImageSerializer
 
-    filter_backends = [filters.OrderingFilter]
+    filter_backends = [LabelFilter, filters.OrderingFilter]
     ordering_fields = [
         "created_at",
         "updated_at",
         "size_bytes",
     ]
     ordering = ["-created_at"]
+
+    # Actions that write the selected images need the matching permission on their collection, not just view.
+    write_permissions = {
+        "update": Permission.CHANGE,
+        "partial_update": Permission.CHANGE,
+        "bulk_update": Permission.CHANGE,
+        "labels": Permission.CHANGE,
+        "destroy": Permission.DELETE,
+        "bulk_destroy": Permission.DELETE,
+    }
+
+    def get_queryset(self):
+        perm = self.write_permissions.get(self.action, Permission.VIEW)
+        queryset = visible_images(self.request.user, super().get_queryset(), perm)
+
+        if self.action == "list":
+            # ImageSerializer only reads the foreign key ids, so neither relation needs to be joined.
+            return queryset.only(*ImageSerializer.Meta.fields)
+
+        if self.action in ("update", "partial_update", "bulk_update"):
+            # Image.save copies the owner from the collection.
+            return queryset.select_related("collection")
+
+        return queryset
+
+    def perform_content_negotiation(self, request: Request, force: bool = False):
+        # Downloads answer with raw image bytes, so any Accept header is acceptable.
+        return super().perform_content_negotiation(request, force=force or self.action == "download")
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter("collection", OpenApiTypes.UUID, required=True),
+            OpenApiParameter("filename", OpenApiTypes.STR, required=True),
+            OpenApiParameter("labels", OpenApiTypes.STR, many=True),
+        ],
+        request={"image/*": OpenApiTypes.BINARY},
+        responses={201: ImageSerializer},
+    )
+    @action(detail=False, methods=["post"])
+    def upload(self, request: Request) -> Response:
+        serializer = ImageUploadSerializer(data={
+            "collection": request.query_params.get("collection"),
+            "filename": request.query_params.get("filename"),
+            "mime_type": request.content_type.split(";")[0].strip(),
+            "labels": request.query_params.getlist("labels"),
+        }, context=self.get_serializer_context())
+        serializer.is_valid(raise_exception=True)
+
+        if request.stream is None:
+            return Response({"detail": "Request body is empty."}, status=status.HTTP_400_BAD_REQUEST)
+
+        upload_image(serializer, request.stream)
+
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+    @extend_schema(request=ImageSerializer(many=True), responses={201: ImageSerializer(many=True)})
+    @action(detail=False, methods=["post"], filter_backends=[], pagination_class=None)
+    def bulk(self, request: Request) -> Response:
+        serializer = ImageSerializer(
+            data=request.data,
+            many=True,
+            allow_empty=False,
+            max_length=config.BULK_MAX_SIZE,
+            context=self.get_serializer_context(),
+        )
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+    @extend_schema(request=BulkImageUpdateSerializer(many=True), responses={200: ImageSerializer(many=True)})
+    @bulk.mapping.patch
+    def bulk_update(self, request: Request) -> Response:
+        serializer = BulkImageUpdateSerializer(
+            self.get_queryset(),
+            data=request.data,
+            many=True,
+            partial=True,
+            allow_empty=False,
+            max_length=config.BULK_MAX_SIZE,
+            context=self.get_serializer_context(),
+        )
+        serializer.is_valid(raise_exception=True)
+        images = serializer.save()
+
+        return Response(ImageSerializer(images, many=True).data)
+
+    @extend_schema(request=BulkImageDeleteSerializer, responses={204: None})
+    @bulk.mapping.delete
+    def bulk_destroy(self, request: Request) -> Response:
+        serializer = BulkImageDeleteSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        # Ids the user cannot see are ignored. Deleting through the queryset keeps the per-image signals that
+        # release stored blobs.
+        with transaction.atomic():
+            self.get_queryset().filter(id__in=serializer.validated_data["ids"]).delete()
+
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+    @extend_schema(responses={
+        (200, "image/*"): OpenApiTypes.BINARY,
+        (206, "image/*"): OpenApiTypes.BINARY,
+        304: None,
+        416: None,
+    })
+    @action(detail=True, methods=["get"])
+    def download(self, request: Request, pk: str) -> HttpResponse:
+        return serve_image(request, self.get_object())
+
+    @extend_schema(
+        parameters=[NearDuplicateQuerySerializer],
+        responses={200: NearDuplicateSerializer(many=True), 409: None},
+    )
+    @action(detail=True, methods=["get"], url_path="near-duplicates")
+    def near_duplicates(self, request: Request, pk: str) -> Response:
+        query = NearDuplicateQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+
+        image = self.get_object()
+        fingerprint = getattr(image, "fingerprint", None)
+        if fingerprint is None or fingerprint.phash is None:
+            return Response(
+                {"detail": "Perceptual hash has not been computed for this image yet."},
+                status=status.HTTP_409_CONFLICT,
+            )
+
+        queryset = find_near_duplicates(self.get_queryset(), fingerprint, query.validated_data["max_distance"])
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(NearDuplicateSerializer(page, many=True).data)
+
+        return Response(NearDuplicateSerializer(queryset, many=True).data)
+
+    @extend_schema(
+        parameters=[SimilarImageQuerySerializer],
+        responses={200: SimilarImageSerializer(many=True), 409: None},
+    )
+    @action(detail=True, methods=["get"])
+    def similar(self, request: Request, pk: str) -> Response:
+        query = SimilarImageQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+
+        image = self.get_object()
+        fingerprint = getattr(image, "fingerprint", None)
+        if fingerprint is None or fingerprint.embedding is None:
+            return Response(
+                {"detail": "Embedding has not been computed for this image yet."},
+                status=status.HTTP_409_CONFLICT,
+            )
+
+        images = find_similar(
+            self.get_queryset(),
+            fingerprint,
+            query.validated_data["limit"],
+            query.validated_data["ef_search"],
+        )
+
+        return Response(SimilarImageSerializer(images, many=True).data)
+
+    @extend_schema(request=LabelOperationSerializer, responses={200: LabelOperationResultSerializer})
+    @action(detail=False, methods=["post"], pagination_class=None)
+    def labels(self, request: Request) -> Response:
+        serializer = LabelOperationSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        # Without a selector the operation would rewrite every image the user can change.
+        if not {"ids", "collection"} & serializer.validated_data.keys() and not LabelFilter().is_active(request):
+            return Response(
+                {"detail": "Select the images with ids, collection or a label filter."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        # The labels and labels_any query parameters select the images, as on the list endpoint.
+        images = self.filter_queryset(self.get_queryset())
+        if "ids" in serializer.validated_data:
+            images = images.filter(id__in=serializer.validated_data["ids"])
+        if "collection" in serializer.validated_data:
+            images = images.filter(collection_id=serializer.validated_data["collection"])
+
+        updated = apply_label_operation(
+            images,
+            serializer.validated_data["operation"],
+            serializer.validated_data["labels"],
+        )
+
+        return Response(LabelOperationResultSerializer({"updated": updated}).data)
+
+    @extend_schema(
+        parameters=[LabelFacetQuerySerializer],
+        responses={200: LabelFacetSerializer(many=True)},
+    )
+    @action(detail=False, methods=["get"], url_path="label-facets", filter_backends=[], pagination_class=None)
+    def label_facets(self, request: Request) -> Response:
+        query = LabelFacetQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+
+        facets = get_label_facets(request.user, self.get_queryset(), query.validated_data.get("collection"))
+
+        return Response(LabelFacetSerializer(facets, many=True).data)
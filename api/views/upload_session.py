@@ -0,0 +1,61 @@
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import extend_schema
+from rest_framework import mixins, permissions, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from api.models.upload_session import UploadPart, UploadSession
+from api.serializers.image import ImageSerializer
+from api.serializers.upload_session import UploadPartSerializer, UploadSessionSerializer
+from api.services.uploads.sessions import commit_upload_session, discard_upload_session, store_upload_part
+
+
+class UploadSessionViewSet(
+    mixins.CreateModelMixin,
+    mixins.RetrieveModelMixin,
+    mixins.DestroyModelMixin,
+    viewsets.GenericViewSet,
+):
+    queryset = UploadSession.objects.prefetch_related("parts")
+    serializer_class = UploadSessionSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_queryset(self):
+        # Sessions are private to the user who started them, even in a shared collection.
+        return super().get_queryset().filter(owner=self.request.user)
+
+    def perform_create(self, serializer: UploadSessionSerializer) -> None:
+        serializer.save(owner=self.request.user)
+
+    def perform_destroy(self, instance: UploadSession) -> None:
+        discard_upload_session(instance)
+
+    @extend_schema(
+        request={"application/octet-stream": OpenApiTypes.BINARY},
+        responses={200: UploadPartSerializer},
+    )
+    @action(detail=True, methods=["put"], url_path=r"parts/(?P<number>[0-9]+)")
+    def parts(self, request: Request, pk: str, number: str) -> Response:
+        session = self.get_object()
+
+        number = int(number)
+        if not 1 <= number <= UploadPart.MAX_PARTS:
+            return Response(
+                {"detail": f"Part number must be between 1 and {UploadPart.MAX_PARTS}."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        if request.stream is None:
+            return Response({"detail": "Request body is empty."}, status=status.HTTP_400_BAD_REQUEST)
+
+        part = store_upload_part(session, number, request.stream)
+
+        return Response(UploadPartSerializer(part).data)
+
+    @extend_schema(request=None, responses={201: ImageSerializer})
+    @action(detail=True, methods=["post"])
+    def commit(self, request: Request, pk: str) -> Response:
+        image = commit_upload_session(self.get_object(), self.get_serializer_context())
+
+        return Response(ImageSerializer(image).data, status=status.HTTP_201_CREATED)